@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "resume.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,6 +84,33 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    # Query cache hit/miss counters. The corpus version that cached results are
+    # keyed by is kept in the database, so it's shared by every process
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Keyword query results: kept for TIMEOUT seconds, at most MAX_ENTRIES of them
+    "query_results": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "query_results",
+        "TIMEOUT": 600,
+        "OPTIONS": {"MAX_ENTRIES": 100},
+    },
+    # Stage timings and counters. Point this at a cache shared between processes,
+    # like memcached, for the metrics endpoint to include the ingest worker's
+    "metrics": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "metrics",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -128,3 +156,80 @@ LOGIN_REDIRECT_URL: str = "/resume"
 LOGOUT_REDIRECT_URL: str = "/resume"
 
 # CSRF_FAILURE_VIEW: Literal["resume.views.csrf_failure"] = "resume.views.csrf_failure"
+
+
+# Resume scoring
+
+# Number of resumes written back per UPDATE, when saving keyword scores
+RESUME_SCORE_BATCH_SIZE: int = 500
+
+# Dotted path of the index keyword queries are searched with:
+# "resume.util.index.InvertedIndex" (postings table, any database) or
+# "resume.util.fts.FullTextIndex" (SQLite FTS5 table)
+RESUME_SEARCH_BACKEND: str = "resume.util.index.InvertedIndex"
+# Candidates per page of the results table
+RESUME_RESULTS_PAGE_SIZE: int = 50
+# BM25 parameters: term frequency saturation (k1) and length normalization (b)
+RESUME_RANKING_K1: float = 1.2
+RESUME_RANKING_B: float = 0.75
+# Cache alias that keyword query results are kept in
+RESUME_QUERY_CACHE: str = "query_results"
+
+# Processes used to score resumes in parallel. 1 scores in the request thread
+RESUME_SCORING_WORKERS: int = 1
+
+# Fewest candidate resumes worth scoring in parallel; smaller sets are scored serially
+RESUME_PARALLEL_SCORING_THRESHOLD: int = 2000
+
+# Score with NumPy arrays of each resume's token ids, instead of regular expressions.
+# Needs `pip install numpy`; run rebuild_search_index after turning it on
+RESUME_DOC_TERM_SCORING: bool = False
+
+# Most processes used to extract the text of uploaded PDFs. 1 extracts in the request thread
+RESUME_EXTRACTION_WORKERS: int = 4
+
+# Most pages read, and characters of text kept, per uploaded PDF; None for no limit.
+# Resumes cut short are flagged with Resume.text_truncated
+RESUME_EXTRACT_MAX_PAGES: int | None = 50
+RESUME_EXTRACT_MAX_CHARS: int | None = 200_000
+
+# Uploaded files the ingest worker extracts together, between progress updates
+RESUME_INGEST_BATCH_SIZE: int = 20
+# Seconds after being claimed that a job still running is taken to have lost its
+# worker, and may be claimed again. Keep it above the longest job's run time
+RESUME_INGEST_TIMEOUT: int = 3600
+
+# Days an upload batch's files and resumes are kept, before purge_uploads deletes them
+RESUME_BATCH_RETENTION_DAYS: int = 30
+# Expired batches, and trashed upload directories, purge_uploads deletes at a time
+RESUME_PURGE_CHUNK_SIZE: int = 20
+
+# Rows read from the database at a time, while streaming a CSV export
+RESUME_EXPORT_CHUNK_SIZE: int = 2000
+
+# Limits on uploaded ZIP archives of resumes: most files an archive may hold,
+# most bytes a PDF in it may decompress to, and most it may decompress to per
+# compressed byte
+RESUME_ZIP_MAX_MEMBERS: int = 1000
+RESUME_ZIP_MAX_MEMBER_SIZE: int = 20 * 1024 * 1024
+RESUME_ZIP_MAX_COMPRESSION_RATIO: int = 100
+
+# Cache alias that stage timings and counters are kept in, for the metrics endpoint
+RESUME_METRICS_CACHE: str = "metrics"
+# Upper bounds, in seconds, of the stage timing histograms' buckets
+RESUME_METRICS_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
@@ -5,7 +5,16 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import URLPattern, URLResolver, include, path
 
-from resume.views import ExportView, KeywordView, LoginView, UploadView
+from resume.views import (
+    ExportView,
+    IngestProgressView,
+    KeywordView,
+    LoginView,
+    MetricsView,
+    QueryCacheStatsView,
+    ResultsPageView,
+    UploadView,
+)
 
 urlpatterns: list[URLPattern | URLResolver] = (
     [
@@ -15,8 +24,20 @@ urlpatterns: list[URLPattern | URLResolver] = (
         path("login", LoginView.as_view(), name="login"),
         path("", UploadView.as_view(), name="home"),
         path("resume", UploadView.as_view(), name="resume"),
+        path(
+            "upload/<int:job_id>/progress",
+            IngestProgressView.as_view(),
+            name="ingest_progress",
+        ),
         path("filter", KeywordView.as_view(), name="filter"),
+        path("filter/results", ResultsPageView.as_view(), name="filter_results"),
+        path(
+            "filter/cache-stats",
+            QueryCacheStatsView.as_view(),
+            name="query_cache_stats",
+        ),
         path("export", ExportView.as_view(), name="exportcsv"),
+        path("metrics", MetricsView.as_view(), name="metrics"),
     ]
     + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
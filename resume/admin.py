@@ -1,3 +1,30 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Resume, ResumeText
+
+
+class ResumeTextInline(admin.StackedInline):
+    """A resume's text, only loaded on its own change page."""
+
+    model = ResumeText
+    fields = ["resume_text"]
+    readonly_fields = ["resume_text"]
+    can_delete = False
+
+
+@admin.register(Resume)
+class ResumeAdmin(admin.ModelAdmin):
+    """Resumes, listed from resume_resume's small columns alone."""
+
+    model = Resume
+    list_display = [
+        "name",
+        "batch",
+        "owner",
+        "unique_matches",
+        "term_count",
+        "text_truncated",
+    ]
+    list_filter = ["owner"]
+    search_fields = ["name"]
+    inlines = [ResumeTextInline]
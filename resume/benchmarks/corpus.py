@@ -0,0 +1,170 @@
+import random
+from pathlib import Path
+
+import fitz
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models.base import ModelBase
+
+from resume.models import ResumeText
+from resume.util.format import FormatUtilies
+from resume.util.index import InvertedIndex, get_search_index
+
+FT: FormatUtilies = FormatUtilies()
+
+FIRST_NAMES: list[str] = [
+    "Ada", "Alan", "Grace", "Linus", "Margaret", "Dennis", "Barbara", "Ken",
+    "Frances", "Edsger", "Radia", "Guido", "Katherine", "Donald", "Hedy", "Tim",
+]  # fmt: skip
+LAST_NAMES: list[str] = [
+    "Lovelace", "Turing", "Hopper", "Torvalds", "Hamilton", "Ritchie", "Liskov",
+    "Thompson", "Allen", "Dijkstra", "Perlman", "Rossum", "Johnson", "Knuth",
+]  # fmt: skip
+SECTIONS: list[str] = ["Summary", "Experience", "Education", "Skills", "Projects"]
+# Skills appear in resumes with Zipf-like frequencies: the first most often
+SKILLS: list[str] = [
+    "Python", "Django", "SQL", "management", "JavaScript", "C++", "C-500",
+    "Node.js", "data-science", "Kubernetes", "Docker", "Linux", "AWS", "React",
+    "PostgreSQL", "SQLite", "Rust", "Go", "Excel", "Salesforce", "nuclear",
+    "scientist", "Carlsbad", "0500", "e-mail", "résumé", "naïve", "über",
+]  # fmt: skip
+FILLER: list[str] = [
+    "the", "and", "of", "to", "in", "for", "with", "on", "team", "project",
+    "led", "built", "designed", "delivered", "improved", "customers", "reduced",
+    "costs", "by", "percent", "across", "systems", "using", "new", "large",
+    "scale", "services", "reports", "analysis", "quality", "process", "years",
+]  # fmt: skip
+PUNCTUATION: list[str] = ["", "", "", "", ",", ".", ";", ":"]
+
+
+class CorpusGenerator:
+    """Generate synthetic resume text and PDFs, reproducibly from a seed."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        words: tuple[int, int] = (150, 600),
+        skill_rate: float = 0.1,
+    ) -> None:
+        """Set the size and makeup of generated resumes.
+
+        seed: seed of the random generator, so corpora can be regenerated
+        words: least and most words per resume
+        skill_rate: share of words drawn from SKILLS rather than FILLER
+        """
+        self.random: random.Random = random.Random(seed)
+        self.words: tuple[int, int] = words
+        self.skill_rate: float = skill_rate
+        self.skill_weights: list[float] = [1 / (i + 1) for i in range(len(SKILLS))]
+
+    def make_name(self, number: int) -> str:
+        """Return a unique candidate name for the number'th resume."""
+        return "%s %s %06d" % (
+            self.random.choice(FIRST_NAMES),
+            self.random.choice(LAST_NAMES),
+            number,
+        )
+
+    def make_word(self) -> str:
+        """Return a filler word or a skill, sometimes followed by punctuation."""
+        if self.random.random() < self.skill_rate:
+            word: str = self.random.choices(SKILLS, self.skill_weights)[0]
+        else:
+            word = self.random.choice(FILLER)
+        return word + self.random.choice(PUNCTUATION)
+
+    def make_text(self, name: str) -> str:
+        """Return the text of one resume: a name, then sections of short lines."""
+        remaining: int = self.random.randint(*self.words)
+        lines: list[str] = [name]
+
+        while remaining > 0:
+            lines.append(self.random.choice(SECTIONS))
+            for _ in range(self.random.randint(2, 6)):
+                length: int = min(remaining, self.random.randint(4, 14))
+                lines.append(" ".join(self.make_word() for _ in range(length)))
+                remaining -= length
+
+        return "\n".join(lines)
+
+    def make_pdf(self, text: str) -> bytes:
+        """Return a PDF of the text, laid out a line at a time with PyMuPDF."""
+        doc: fitz.Document = fitz.open()
+        page: fitz.Page = doc.new_page()
+        y: int = 50
+
+        for line in text.split("\n"):
+            if y > 780:
+                page = doc.new_page()
+                y = 50
+            page.insert_text((50, y), line, fontsize=10)
+            y += 14
+
+        data: bytes = doc.tobytes()
+        doc.close()
+        return data
+
+    def make_uploads(self, count: int) -> list[SimpleUploadedFile]:
+        """Return count resume PDFs, as uploaded files named after the candidate."""
+        uploads: list[SimpleUploadedFile] = []
+        for number in range(count):
+            name: str = self.make_name(number)
+            uploads.append(
+                SimpleUploadedFile(
+                    f"{name}.pdf",
+                    self.make_pdf(self.make_text(name)),
+                    content_type="application/pdf",
+                )
+            )
+        return uploads
+
+    def write_pdfs(self, directory: Path, count: int) -> list[Path]:
+        """Write count resume PDFs into directory, and return their paths."""
+        directory.mkdir(parents=True, exist_ok=True)
+        paths: list[Path] = []
+        for number in range(count):
+            name: str = self.make_name(number)
+            path: Path = Path(directory, f"{name}.pdf")
+            path.write_bytes(self.make_pdf(self.make_text(name)))
+            paths.append(path)
+        return paths
+
+    def load_resumes(
+        self,
+        resume_model: ModelBase,
+        count: int,
+        batch_size: int = 1000,
+        text_model: ModelBase = ResumeText,
+    ) -> None:
+        """Insert count resumes straight into the database, and index them.
+
+        Skips the PDFs and text extraction, so large corpora load quickly.
+        The rows' files are named, but not written. The resumes belong to no
+        batch, and their ids are set by bulk_create(), before their text is.
+        """
+        index: InvertedIndex = get_search_index()
+
+        for start in range(0, count, batch_size):
+            resumes: list = []
+            texts: list = []
+            for number in range(start, min(start + batch_size, count)):
+                name: str = self.make_name(number)
+                text: str = self.make_text(name)
+                normalized_text: str = FT.normalize_text(text)
+                resume = resume_model(
+                    name=name,
+                    file=f"uploads/resume/benchmark/{number:06d}.pdf",
+                    term_count=len(index.get_terms(normalized_text)),
+                    text_version=1,
+                )
+                resumes.append(resume)
+                texts.append(
+                    text_model(
+                        resume=resume,
+                        resume_text=text,
+                        normalized_text=normalized_text,
+                    )
+                )
+            resume_model.objects.bulk_create(resumes)
+            text_model.objects.bulk_create(texts)
+            for resume_text in texts:
+                index.index_resume(resume_text.resume_id, resume_text.normalized_text)
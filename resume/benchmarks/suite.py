@@ -0,0 +1,299 @@
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from django.db import connection
+from django.db.models.base import ModelBase
+
+from resume.custom_types import BenchmarkReport, BenchmarkResult, CompressionResult
+from resume.models import ResumeText
+from resume.util.cache import QueryCache
+from resume.util.csv import CSVExporter
+from resume.util.data import DataFiltering
+from resume.util.doc_terms import DocTermScorer, np
+from resume.util.format import FormatUtilies
+from resume.util.resume import Processor
+from resume.util.tokenize import Tokenizer
+
+from .corpus import CorpusGenerator
+
+FT: FormatUtilies = FormatUtilies()
+TOKENIZER: Tokenizer = Tokenizer()
+
+DEFAULT_KEYWORDS: str = 'python django "nuclear scientist" C-500 0500 node.js résumé'
+
+
+class KeywordForm:
+    """Stand-in for a validated KeywordForm, as generate_keyword_match_data() reads it."""
+
+    def __init__(self, keywords: str) -> None:
+        self.cleaned_data: dict[str, str] = {"keywords": keywords}
+
+
+class BenchmarkSuite:
+    """Time the main stages of uploading, filtering and exporting resumes.
+
+    Each benchmark runs its stage `repeat` times and reports the fastest,
+    median and mean time of one call, in seconds. Results are tagged with the
+    size of the corpus they ran against, or None if it doesn't matter.
+    """
+
+    def __init__(
+        self,
+        resume_model: ModelBase,
+        keywords_model: ModelBase,
+        media_root: Path,
+        repeat: int = 5,
+        keywords: str = DEFAULT_KEYWORDS,
+        seed: int = 0,
+        text_model: ModelBase = ResumeText,
+    ) -> None:
+        """Resume and keywords models will be overridden by app.
+
+        media_root: scratch directory for generated PDFs
+        repeat: runs of each benchmark
+        keywords: keyword query to filter by, as typed into the form
+        seed: seed of the corpus generator
+        """
+        self.Resume: ModelBase = resume_model
+        self.Keywords: ModelBase = keywords_model
+        self.ResumeText: ModelBase = text_model
+        self.media_root: Path = media_root
+        self.repeat: int = repeat
+        self.keywords: str = keywords
+        self.corpus: CorpusGenerator = CorpusGenerator(seed)
+
+    def time_call(
+        self,
+        name: str,
+        size: int | None,
+        call: Callable[[], Any],
+        setup: Callable[[], Any] | None = None,
+        number: int = 1,
+    ) -> BenchmarkResult:
+        """Time call, run number times in a row, repeat times over.
+
+        setup runs before each repeat, and isn't timed.
+        """
+        timings: list[float] = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            start: float = time.perf_counter()
+            for _ in range(number):
+                call()
+            timings.append((time.perf_counter() - start) / number)
+
+        return {
+            "name": name,
+            "size": size,
+            "repeat": self.repeat,
+            "number": number,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+        }
+
+    def load(self, size: int) -> None:
+        """Replace every resume in the database with a corpus of size resumes."""
+        self.Resume.objects.all().delete()
+        self.corpus.load_resumes(self.Resume, size, text_model=self.ResumeText)
+
+    def bench_get_pdf_text(self, pdf_sample: int) -> BenchmarkResult:
+        """Time Processor.get_pdf_text(), per PDF, over pdf_sample generated PDFs."""
+        directory: Path = Path(self.media_root, "benchmark")
+        paths: list[Path] = self.corpus.write_pdfs(directory, pdf_sample)
+        processor: Processor = Processor(self.Resume, media_root=str(directory))
+
+        def extract_all() -> None:
+            for path in paths:
+                processor.get_pdf_text(path.name)
+
+        result: BenchmarkResult = self.time_call("get_pdf_text", None, extract_all)
+        for key in ("min", "median", "mean"):
+            result[key] /= len(paths)
+        result["number"] = len(paths)
+        return result
+
+    def bench_format_keywords(self) -> BenchmarkResult:
+        """Time FormatUtilies.format_keywords() on the benchmark's keywords."""
+        return self.time_call(
+            "format_keywords",
+            None,
+            lambda: FT.format_keywords(self.keywords),
+            number=1000,
+        )
+
+    def bench_generate_keyword_match_data(self, size: int) -> list[BenchmarkResult]:
+        """Time DataFiltering.generate_keyword_match_data(), cold and repeated.
+
+        Cold runs first clear the query cache and every stored score, so all
+        candidates are scored; repeated runs only clear the query cache, so
+        stored scores are reused.
+        """
+        form: KeywordForm = KeywordForm(self.keywords)
+        # Saved like the filter form saves it, for export_csv()'s header row
+        self.Keywords.objects.create(keywords=self.keywords)
+
+        def filter_resumes() -> None:
+            DataFiltering(self.Resume).generate_keyword_match_data(None, form)
+
+        def clear_cache() -> None:
+            QueryCache().results.clear()
+
+        def clear_scores() -> None:
+            clear_cache()
+            self.Resume.objects.update(scored_keywords="")
+
+        filter_resumes()
+        return [
+            self.time_call(
+                "generate_keyword_match_data", size, filter_resumes, clear_scores
+            ),
+            self.time_call(
+                "generate_keyword_match_data[repeat]", size, filter_resumes, clear_cache
+            ),
+        ]
+
+    def bench_score_candidates(self, size: int) -> list[BenchmarkResult]:
+        """Time scoring every resume, with regular expressions and with DocTermScorer.
+
+        Neither is given the search index's counts, so every keyword is counted
+        by the engine itself, including loading the text or token ids it reads.
+        Skipped if NumPy isn't installed.
+        """
+        if np is None:
+            return []
+
+        DocTermScorer(text_model=self.ResumeText).rebuild()
+        candidates: list = list(self.Resume.objects.filter(text__isnull=False))
+        key_words: list[str] = FT.format_keywords(self.keywords)
+        with_regex: DataFiltering = DataFiltering(
+            self.Resume, self.ResumeText, workers=1, doc_term_scoring=False
+        )
+        with_doc_terms: DataFiltering = DataFiltering(
+            self.Resume, self.ResumeText, doc_term_scoring=True
+        )
+
+        return [
+            self.time_call(
+                "score_candidates[regex]",
+                size,
+                lambda: with_regex.score_candidates(candidates, key_words, {}),
+            ),
+            self.time_call(
+                "score_candidates[doc_term]",
+                size,
+                lambda: with_doc_terms.score_candidates(candidates, key_words, {}),
+            ),
+        ]
+
+    def get_stored_texts(self) -> list[bytes]:
+        """Return every resume's text as stored, without decompressing it."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT %s FROM %s"
+                % (
+                    connection.ops.quote_name("resume_text"),
+                    connection.ops.quote_name(self.ResumeText._meta.db_table),
+                )
+            )
+            return [bytes(row[0]) for row in cursor.fetchall()]
+
+    def bench_resume_text(self, size: int) -> list[BenchmarkResult]:
+        """Time loading every resume's text, and decompressing it alone."""
+        field = self.ResumeText._meta.get_field("resume_text")
+        stored: list[bytes] = self.get_stored_texts()
+
+        def load_texts() -> None:
+            list(self.ResumeText.objects.values_list("resume_text", flat=True))
+
+        def decompress_texts() -> None:
+            for data in stored:
+                field.decompress(data)
+
+        return [
+            self.time_call("load_resume_text", size, load_texts),
+            self.time_call("decompress_resume_text", size, decompress_texts),
+        ]
+
+    def bench_normalize_text(self, size: int) -> list[BenchmarkResult]:
+        """Time normalizing every resume's text, with the Tokenizer and the old chain.
+
+        The old chain lowercases the text, then strips each word of punctuation,
+        as normalize_text() did before the Tokenizer; it doesn't fold
+        compatibility characters, so it's a lower bound on the old cost.
+        """
+        texts: list[str] = list(
+            self.ResumeText.objects.values_list("resume_text", flat=True)
+        )
+
+        def normalize_with_chain() -> None:
+            for text in texts:
+                FT.remove_punctuation(text.lower())
+
+        def normalize_with_tokenizer() -> None:
+            for text in texts:
+                TOKENIZER.normalize(text)
+
+        return [
+            self.time_call("normalize_text[chain]", size, normalize_with_chain),
+            self.time_call("normalize_text", size, normalize_with_tokenizer),
+        ]
+
+    def measure_compression(self, size: int) -> CompressionResult:
+        """Compare the size of the corpus' text with its compressed, stored size.
+
+        The normalized text is stored uncompressed, since the full-text index's
+        triggers read it in SQL, so it's counted towards the total stored per resume.
+        """
+        text_bytes: int = sum(
+            len(text.encode())
+            for text in self.ResumeText.objects.values_list("resume_text", flat=True)
+        )
+        stored_bytes: int = sum(len(data) for data in self.get_stored_texts())
+        normalized_bytes: int = sum(
+            len(text.encode())
+            for text in self.ResumeText.objects.values_list(
+                "normalized_text", flat=True
+            )
+        )
+        total_bytes: int = stored_bytes + normalized_bytes
+        return {
+            "size": size,
+            "text_bytes": text_bytes,
+            "stored_bytes": stored_bytes,
+            "ratio": text_bytes / stored_bytes if stored_bytes else 0.0,
+            "normalized_bytes": normalized_bytes,
+            "total_bytes": total_bytes,
+            "bytes_per_resume": total_bytes / size if size else 0.0,
+        }
+
+    def bench_export_csv(self, size: int) -> BenchmarkResult:
+        """Time CSVExporter.export_csv(), streaming the whole response."""
+
+        def export() -> None:
+            response = CSVExporter(self.Resume, self.Keywords).export_csv(None)
+            for _ in response.streaming_content:
+                pass
+
+        return self.time_call("export_csv", size, export)
+
+    def run(self, sizes: list[int], pdf_sample: int) -> BenchmarkReport:
+        """Run every benchmark, loading a corpus of each size for those that need one."""
+        results: list[BenchmarkResult] = [
+            self.bench_get_pdf_text(pdf_sample),
+            self.bench_format_keywords(),
+        ]
+        compression: list[CompressionResult] = []
+        for size in sizes:
+            self.load(size)
+            results.extend(self.bench_generate_keyword_match_data(size))
+            results.extend(self.bench_score_candidates(size))
+            results.append(self.bench_export_csv(size))
+            results.extend(self.bench_resume_text(size))
+            results.extend(self.bench_normalize_text(size))
+            compression.append(self.measure_compression(size))
+        return {"results": results, "compression": compression}
@@ -52,6 +52,55 @@ class FilteredData(TypedDict):
     matches_found: bool
 
 
+class RankedRow(TableRow):
+    """Table row of a candidate ranked by BM25 relevance.
+
+    relevance (float): the candidate's BM25 score for the keywords
+    """
+
+    relevance: float
+
+
+class RankedData(TypedDict):
+    """Context of results.html, in ranking mode.
+
+    key_words_with_case (list): keywords submitted to form
+    table_rows (list): the top_k most relevant candidates, best first
+    resumes_exist (bool): used by results.html
+    matches_found (bool): any candidates with keyword matches?
+    top_k (int): most candidates ranked
+    """
+
+    key_words_with_case: list[str]
+    table_rows: list[RankedRow]
+    resumes_exist: bool
+    matches_found: bool
+    top_k: int
+
+
+class ResultsPage(TypedDict):
+    """One page of the results table, as served by ResultPages.
+
+    rows (list): table data for the page's candidates
+    sort (str): "unique_matches", or the keyword rows are sorted by
+    next (str | None): cursor of the next page; None on the last page
+    """
+
+    rows: TableRowsList
+    sort: str
+    next: str | None
+
+
+class ResultsContext(FilteredData):
+    """Context of results.html: the filtered data, and its first page.
+
+    page (ResultsPage): rows rendered with the page; the rest are fetched
+        from the JSON endpoint
+    """
+
+    page: ResultsPage
+
+
 class ScoreData(TypedDict):
     """Dict containing keyword matches and unique score for each candidate.
 
@@ -63,6 +112,21 @@ class ScoreData(TypedDict):
     unique_score: int
 
 
+class QueryCacheStats(TypedDict):
+    """Query result cache counters, for monitoring.
+
+    hits (int): queries answered from the cache
+    misses (int): queries that had to be scored
+    hit_rate (float): hits / (hits + misses)
+    corpus_version (int): bumped by every upload and deletion
+    """
+
+    hits: int
+    misses: int
+    hit_rate: float
+    corpus_version: int
+
+
 class CSVRowsDict(TypedDict):
     """The row format used by the CSV Export."""
 
@@ -70,6 +134,57 @@ class CSVRowsDict(TypedDict):
     table_rows: list[list[str | int]]
 
 
+class StagedResume(TypedDict):
+    """An uploaded resume that's been stored, but not yet extracted.
+
+    name (str): candidate's name
+    file (str): stored file name
+    content_hash (str): SHA-256 hex digest of the file's contents
+    """
+
+    name: str
+    file: str
+    content_hash: str
+
+
+class UploadResult(TypedDict):
+    """Outcome of processing one uploaded resume.
+
+    name (str): candidate's name
+    file (str): stored file name
+    characters (int): length of the extracted text
+    truncated (bool): the page or character limit cut the text short
+    reused (bool): text was copied from an identical upload, not extracted
+    error (str): why extraction failed, or ""
+    """
+
+    name: str
+    file: str
+    characters: int
+    truncated: bool
+    reused: bool
+    error: str
+
+
+class IngestProgress(TypedDict):
+    """Progress of an IngestJob, returned by the upload progress endpoint.
+
+    job (int): job id
+    status (str): queued, running, or done
+    total (int): files in the job
+    done (int): files extracted and saved
+    failed (int): files whose text couldn't be extracted
+    remaining (int): files still waiting to be processed
+    """
+
+    job: int
+    status: str
+    total: int
+    done: int
+    failed: int
+    remaining: int
+
+
 class ResumeRowData(TypedDict):
     """Row of resume data used in tests.
 
@@ -192,3 +307,56 @@ class MetricsViewContext(TypedDict):
 
     user_sets: list[UserLoginSets]
     dept_sets: list[DeptMonthData]
+
+
+class BenchmarkResult(TypedDict):
+    """Timing of one benchmark, as the benchmark command reports it.
+
+    name (str): stage timed, e.g. "get_pdf_text"
+    size (int | None): resumes in the corpus; None if the stage doesn't use one
+    repeat (int): times the benchmark ran
+    number (int): calls timed together, per run
+    min (float): fastest run, in seconds per call
+    median (float): median run, in seconds per call
+    mean (float): mean run, in seconds per call
+    """
+
+    name: str
+    size: int | None
+    repeat: int
+    number: int
+    min: float
+    median: float
+    mean: float
+
+
+class CompressionResult(TypedDict):
+    """Storage of a corpus' extracted text, as the benchmark command reports it.
+
+    size (int): resumes in the corpus
+    text_bytes (int): UTF-8 bytes of the text
+    stored_bytes (int): bytes of the text as stored, compressed
+    ratio (float): text_bytes per stored byte
+    normalized_bytes (int): bytes of the normalized text, stored uncompressed
+    total_bytes (int): stored_bytes plus normalized_bytes
+    bytes_per_resume (float): total_bytes per resume
+    """
+
+    size: int
+    text_bytes: int
+    stored_bytes: int
+    ratio: float
+    normalized_bytes: int
+    total_bytes: int
+    bytes_per_resume: float
+
+
+class BenchmarkReport(TypedDict):
+    """Results of a run of the benchmark suite.
+
+    results (list[BenchmarkResult]): timings of each benchmark
+    compression (list[CompressionResult]): text storage, per corpus size
+    """
+
+    results: list[BenchmarkResult]
+    compression: list[CompressionResult]
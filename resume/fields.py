@@ -0,0 +1,77 @@
+import zlib
+from typing import Any
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Field
+
+
+class CompressedTextField(Field):
+    """Text stored zlib-compressed, in a binary column.
+
+    Values are str in Python, and compressed as they're saved. They're only
+    decompressed when the column is loaded, so querysets that don't need the
+    text should defer() it. Empty text is stored as empty bytes, so filters
+    like exclude(field="") still work; other lookups compare compressed bytes.
+    """
+
+    description: str = "Compressed text"
+
+    def __init__(self, *args: Any, level: int = 6, **kwargs: Any) -> None:
+        """level: zlib compression level, from 1 (fastest) to 9 (smallest)."""
+        self.level: int = level
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self) -> tuple[str, str, list, dict[str, Any]]:
+        """Add the compression level to the field's migration arguments."""
+        name, path, args, kwargs = super().deconstruct()
+        if self.level != 6:
+            kwargs["level"] = self.level
+        return name, path, args, kwargs
+
+    def get_internal_type(self) -> str:
+        """Store the field in the database's binary column type."""
+        return "BinaryField"
+
+    def compress(self, text: str) -> bytes:
+        """Return text as compressed UTF-8, or empty bytes if it's empty."""
+        return zlib.compress(text.encode(), self.level) if text else b""
+
+    def decompress(self, data: bytes) -> str:
+        """Return the text of compressed UTF-8."""
+        return zlib.decompress(data).decode() if data else ""
+
+    def get_placeholder(
+        self, value: Any, compiler: Any, connection: BaseDatabaseWrapper
+    ) -> str:
+        """Use the database's placeholder for binary values."""
+        return connection.ops.binary_placeholder_sql(value)
+
+    def get_prep_value(self, value: Any) -> bytes | None:
+        """Compress text for saving and querying."""
+        value = super().get_prep_value(value)
+        if value is None or isinstance(value, bytes):
+            return value
+        return self.compress(str(value))
+
+    def get_db_prep_value(
+        self, value: Any, connection: BaseDatabaseWrapper, prepared: bool = False
+    ) -> Any:
+        """Wrap compressed text in the database driver's binary type."""
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is not None:
+            return connection.Database.Binary(value)
+        return value
+
+    def from_db_value(
+        self, value: Any, expression: Any, connection: BaseDatabaseWrapper
+    ) -> str | None:
+        """Decompress text loaded from the database."""
+        if value is None:
+            return value
+        return self.decompress(bytes(value))
+
+    def to_python(self, value: Any) -> str | None:
+        """Return text, decompressing it if it's still compressed."""
+        if isinstance(value, (bytes, memoryview)):
+            return self.decompress(bytes(value))
+        return value
@@ -1,13 +1,17 @@
+from django.core.files.uploadedfile import UploadedFile
+from django.core.validators import FileExtensionValidator
 from django.forms import (
     CharField,
     ClearableFileInput,
     FileField,
     Form,
+    IntegerField,
     ModelForm,
     PasswordInput,
 )
 
 from resume.models import Resume
+from resume.util.archive import ZipArchive
 
 
 class LoginForm(Form):
@@ -17,6 +21,41 @@ class LoginForm(Form):
     password: CharField = CharField(max_length=150, widget=PasswordInput)
 
 
+class RankingForm(Form):
+    """Optional ranking mode of the keyword filter form."""
+
+    top_k: IntegerField = IntegerField(
+        required=False,
+        min_value=1,
+        max_value=1000,
+        label="Only show the most relevant candidates",
+        help_text="Leave blank to show every matching candidate, by unique score.",
+    )
+
+
+class ArchiveUploadForm(Form):
+    """ZIP archive of resumes, uploaded alongside or instead of PDFs."""
+
+    archive: FileField = FileField(
+        required=False,
+        validators=[
+            FileExtensionValidator(
+                ["zip"], "Only ZIP archives are allowed", "only_zips_allowed"
+            )
+        ],
+        widget=ClearableFileInput(attrs={"class": "form-control", "accept": ".zip"}),
+        label="Or upload a ZIP archive of PDFs",
+    )
+
+    def clean_archive(self) -> UploadedFile | None:
+        """Check the archive's size, member count, and compression limits."""
+        archive: UploadedFile | None = self.cleaned_data["archive"]
+        if archive:
+            ZipArchive().validate(archive)
+
+        return archive
+
+
 class MultipleFileInput(ClearableFileInput):
     allow_multiple_selected = True
 
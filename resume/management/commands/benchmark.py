@@ -0,0 +1,109 @@
+import json
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.test.utils import override_settings
+
+from resume.benchmarks.suite import DEFAULT_KEYWORDS, BenchmarkSuite
+from resume.custom_types import BenchmarkReport
+from resume.models import Keywords, Resume
+
+
+class Command(BaseCommand):
+    """Benchmark extraction, filtering and export against synthetic resumes."""
+
+    help = (
+        "Time get_pdf_text, generate_keyword_match_data, export_csv, "
+        "format_keywords, and loading resume text on generated corpora, measure "
+        "the text's compression, and print the results as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add corpus size, repeat, and output options."""
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[100],
+            help="Resumes per corpus, e.g. --sizes 100 10000 100000.",
+        )
+        parser.add_argument(
+            "--pdf-sample",
+            type=int,
+            default=20,
+            help="Generated PDFs to time get_pdf_text on.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs of each benchmark."
+        )
+        parser.add_argument(
+            "--keywords",
+            default=DEFAULT_KEYWORDS,
+            help="Keyword query to filter the corpora by.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the corpus generator."
+        )
+        parser.add_argument(
+            "--output", help="File to write the JSON results to, instead of stdout."
+        )
+
+    def get_commit(self) -> str | None:
+        """Return the git commit being benchmarked, if there is one."""
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run the suite in a throwaway database and media directory."""
+        old_name: str = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with tempfile.TemporaryDirectory() as media_root:
+                with override_settings(MEDIA_ROOT=media_root):
+                    suite: BenchmarkSuite = BenchmarkSuite(
+                        Resume,
+                        Keywords,
+                        Path(media_root),
+                        repeat=options["repeat"],
+                        keywords=options["keywords"],
+                        seed=options["seed"],
+                    )
+                    suite_report: BenchmarkReport = suite.run(
+                        options["sizes"], options["pdf_sample"]
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report: dict[str, Any] = {
+            "commit": self.get_commit(),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "search_backend": settings.RESUME_SEARCH_BACKEND,
+            "keywords": options["keywords"],
+            **suite_report,
+        }
+        output: str = json.dumps(report, indent=2)
+
+        if options["output"]:
+            Path(options["output"]).write_text(output + "\n")
+        else:
+            self.stdout.write(output)
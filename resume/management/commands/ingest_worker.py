@@ -0,0 +1,45 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from resume.models import IngestJob, Resume
+from resume.util.ingest import IngestQueue
+
+
+class Command(BaseCommand):
+    """Process queued resume uploads, outside of the web request."""
+
+    help = "Extract, save, and index queued resume uploads."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add --once and --interval options."""
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty, instead of waiting for new jobs.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait before checking an empty queue again.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Claim and run queued jobs until stopped."""
+        queue: IngestQueue = IngestQueue(Resume)
+
+        while True:
+            job: IngestJob | None = queue.claim_next()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            queue.run(job)
+            progress = queue.get_progress(job)
+            self.stdout.write(
+                f"Job {job.pk}: {progress['done']} done, {progress['failed']} failed"
+            )
@@ -0,0 +1,54 @@
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from resume.models import Keywords, Resume
+from resume.util.deleter import Deleter
+
+
+class Command(BaseCommand):
+    """Purge expired upload batches, and deleted uploads, in the background."""
+
+    help = (
+        "Delete upload batches older than RESUME_BATCH_RETENTION_DAYS, "
+        "and empty the trash of deleted upload directories."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add --once, --interval and --days options."""
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once nothing is left to purge, instead of sweeping again later.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300.0,
+            help="Seconds to wait before sweeping again, once nothing is left.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.RESUME_BATCH_RETENTION_DAYS,
+            help="Age, in days, after which upload batches are purged.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Purge a chunk of batches and trashed directories at a time, until stopped."""
+        deleter: Deleter = Deleter(Resume, Keywords, retention_days=options["days"])
+
+        while True:
+            batches: int = deleter.purge_expired_batches()
+            directories: int = deleter.empty_trash()
+            if batches or directories:
+                self.stdout.write(
+                    f"Purged {batches} batches, and {directories} trashed directories"
+                )
+                continue
+
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
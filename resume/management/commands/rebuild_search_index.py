@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from resume.util.doc_terms import DocTermScorer, get_doc_term_scorer
+from resume.util.index import InvertedIndex, get_search_index
+
+
+class Command(BaseCommand):
+    """Rebuild the configured search backend's index of resume text."""
+
+    help = (
+        "Re-index every resume with the backend named by RESUME_SEARCH_BACKEND, "
+        "and rebuild its token id array if RESUME_DOC_TERM_SCORING is on."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Rebuild the index, and token id arrays, from each resume's normalized text."""
+        index: InvertedIndex = get_search_index()
+        index.rebuild()
+        self.stdout.write(f"Rebuilt {type(index).__name__}")
+
+        doc_terms: DocTermScorer | None = get_doc_term_scorer()
+        if doc_terms is not None:
+            doc_terms.rebuild()
+            self.stdout.write(f"Rebuilt {type(doc_terms).__name__}")
@@ -0,0 +1,33 @@
+import time
+from collections.abc import Callable
+from contextvars import Token
+
+from django.http import HttpRequest, HttpResponse
+
+from .util.metrics import REQUEST_TIMINGS, format_server_timing
+
+
+class ServerTimingMiddleware:
+    """Attach the stage timings of each request to its Server-Timing header.
+
+    Stages timed while the response is streamed, like a CSV export's rows,
+    finish after the headers are sent, so are only recorded in the metrics.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response: Callable[[HttpRequest], HttpResponse] = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Collect the request's stage timings, then add the total time."""
+        timings: dict[str, float] = {}
+        token: Token = REQUEST_TIMINGS.set(timings)
+        start: float = time.perf_counter()
+        try:
+            response: HttpResponse = self.get_response(request)
+        finally:
+            REQUEST_TIMINGS.reset(token)
+
+        timings["total"] = time.perf_counter() - start
+        response["Server-Timing"] = format_server_timing(timings)
+
+        return response
@@ -0,0 +1,80 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:47
+
+import re
+import string
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of the index as of this migration
+TERM_PATTERN = re.compile(r"\w+")
+
+
+def count_terms(resume_text):
+    """Return term counts of lowercased, punctuation stripped resume text."""
+    words = (word.strip(string.punctuation) for word in resume_text.lower().split())
+    return Counter(TERM_PATTERN.findall(" ".join(words)))
+
+
+def index_resume(Posting, resume):
+    """Replace the postings of a resume with ones built from its current text."""
+    Posting.objects.filter(resume=resume).delete()
+    Posting.objects.bulk_create(
+        Posting(term=term, resume=resume, count=count)
+        for term, count in count_terms(resume.resume_text).items()
+    )
+
+
+def index_existing_resumes(apps, schema_editor):
+    """Build postings for resumes uploaded before the index existed."""
+    Resume = apps.get_model("resume", "Resume")
+    Posting = apps.get_model("resume", "Posting")
+
+    for resume in Resume.objects.exclude(resume_text="").iterator():
+        index_resume(Posting, resume)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Posting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=255)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "resume",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="postings",
+                        to="resume.resume",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Posting",
+                "verbose_name_plural": "Postings",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="posting",
+            constraint=models.UniqueConstraint(
+                fields=("term", "resume"), name="unique_term_per_resume"
+            ),
+        ),
+        migrations.RunPython(index_existing_resumes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:54
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_files(apps, schema_editor):
+    """Record the content hash of resumes uploaded before hashes were kept.
+
+    Their files stay where they were stored; only new uploads are stored by hash.
+    """
+    Resume = apps.get_model("resume", "Resume")
+
+    for resume in Resume.objects.exclude(file="").exclude(file__isnull=True):
+        digest = hashlib.sha256()
+        try:
+            with resume.file.open("rb") as f:
+                for chunk in f.chunks():
+                    digest.update(chunk)
+        except FileNotFoundError:
+            continue
+        Resume.objects.filter(pk=resume.pk).update(content_hash=digest.hexdigest())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0003_ingestjob_ingestfile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestfile",
+            name="content_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=64
+            ),
+        ),
+        migrations.RunPython(hash_existing_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:55
+
+import string
+
+from django.db import migrations, models
+
+
+def normalize_text(text):
+    """Lowercase text and remove punctuation, as matching did at this migration."""
+    return " ".join(word.strip(string.punctuation) for word in text.lower().split())
+
+
+def normalize_existing_text(apps, schema_editor):
+    """Fill normalized_text for resumes uploaded before it was stored."""
+    Resume = apps.get_model("resume", "Resume")
+
+    resumes = list(Resume.objects.exclude(resume_text="").only("resume_text"))
+    for resume in resumes:
+        resume.normalized_text = normalize_text(resume.resume_text)
+    Resume.objects.bulk_update(resumes, ["normalized_text"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0004_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resume",
+            name="normalized_text",
+            field=models.TextField(default=""),
+        ),
+        migrations.RunPython(normalize_existing_text, migrations.RunPython.noop),
+    ]
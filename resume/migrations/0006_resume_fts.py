@@ -0,0 +1,71 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:02
+
+from django.db import migrations
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE resume_resume_fts USING fts5(
+        normalized_text,
+        content='resume_resume',
+        content_rowid='rowid',
+        tokenize="unicode61 remove_diacritics 0 tokenchars '_'"
+    )
+    """,
+    "CREATE VIRTUAL TABLE resume_resume_fts_vocab"
+    " USING fts5vocab('resume_resume_fts', 'instance')",
+    """
+    CREATE TRIGGER resume_resume_fts_insert AFTER INSERT ON resume_resume BEGIN
+        INSERT INTO resume_resume_fts(rowid, normalized_text)
+        VALUES (new.rowid, new.normalized_text);
+    END
+    """,
+    """
+    CREATE TRIGGER resume_resume_fts_delete AFTER DELETE ON resume_resume BEGIN
+        INSERT INTO resume_resume_fts(resume_resume_fts, rowid, normalized_text)
+        VALUES ('delete', old.rowid, old.normalized_text);
+    END
+    """,
+    """
+    CREATE TRIGGER resume_resume_fts_update
+    AFTER UPDATE OF normalized_text ON resume_resume BEGIN
+        INSERT INTO resume_resume_fts(resume_resume_fts, rowid, normalized_text)
+        VALUES ('delete', old.rowid, old.normalized_text);
+        INSERT INTO resume_resume_fts(rowid, normalized_text)
+        VALUES (new.rowid, new.normalized_text);
+    END
+    """,
+    "INSERT INTO resume_resume_fts(resume_resume_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS resume_resume_fts_update",
+    "DROP TRIGGER IF EXISTS resume_resume_fts_delete",
+    "DROP TRIGGER IF EXISTS resume_resume_fts_insert",
+    "DROP TABLE IF EXISTS resume_resume_fts_vocab",
+    "DROP TABLE IF EXISTS resume_resume_fts",
+]
+
+
+def create_fts_table(apps, schema_editor):
+    """Create the FTS5 index of resume text, on SQLite only."""
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fts_table(apps, schema_editor):
+    """Drop the FTS5 index of resume text."""
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0005_normalized_text"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
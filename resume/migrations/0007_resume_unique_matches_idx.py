@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0006_resume_fts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["-unique_matches", "name"], name="resume_unique_matches_idx"
+            ),
+        ),
+    ]
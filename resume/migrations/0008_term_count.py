@@ -0,0 +1,39 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:40
+
+import re
+
+from django.db import migrations, models
+
+from resume.migrations._fts import restore_fts_triggers
+
+# Terms of the index, as of this migration
+TERM_PATTERN = re.compile(r"\w+")
+
+
+def count_existing_terms(apps, schema_editor):
+    """Fill term_count for resumes uploaded before it was stored."""
+    Resume = apps.get_model("resume", "Resume")
+
+    resumes = list(Resume.objects.exclude(normalized_text="").only("normalized_text"))
+    for resume in resumes:
+        resume.term_count = len(TERM_PATTERN.findall(resume.normalized_text))
+    Resume.objects.bulk_update(resumes, ["term_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0007_resume_unique_matches_idx"),
+    ]
+
+    operations = [
+        # Undoing AddField remakes the table too, so triggers are restored after it
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AddField(
+            model_name="resume",
+            name="term_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+        migrations.RunPython(count_existing_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:05
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of the index as of this migration
+TERM_PATTERN = re.compile(r"\w+")
+PHRASE_GAP = " "
+
+
+def get_term_positions(text):
+    """Return the positions of each term in an already lowercased string.
+
+    Terms separated by exactly one space get consecutive positions; any
+    other gap skips a position.
+    """
+    positions = {}
+    position = -1
+    end = None
+
+    for match in TERM_PATTERN.finditer(text):
+        position += 1 if end is None or text[end : match.start()] == PHRASE_GAP else 2
+        positions.setdefault(match.group(), []).append(position)
+        end = match.end()
+
+    return positions
+
+
+def index_existing_positions(apps, schema_editor):
+    """Rebuild postings with positions, for resumes indexed before they were stored."""
+    Resume = apps.get_model("resume", "Resume")
+    Posting = apps.get_model("resume", "Posting")
+
+    for resume in Resume.objects.exclude(normalized_text="").iterator():
+        Posting.objects.filter(resume=resume).delete()
+        Posting.objects.bulk_create(
+            Posting(term=term, resume=resume, count=len(positions), positions=positions)
+            for term, positions in get_term_positions(resume.normalized_text).items()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0008_term_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posting",
+            name="positions",
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(index_existing_positions, migrations.RunPython.noop),
+    ]
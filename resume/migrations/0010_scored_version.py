@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+from resume.migrations._fts import restore_fts_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0009_posting_positions"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AddField(
+            model_name="resume",
+            name="scored_keywords",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="scored_text_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="text_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+from resume.migrations._fts import restore_fts_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0010_scored_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AddField(
+            model_name="resume",
+            name="text_truncated",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:40
+
+from django.db import migrations
+
+import resume.fields
+from resume.migrations._fts import restore_fts_triggers
+
+
+def copy_text(apps, source: str, target: str) -> None:
+    """Copy every resume's text from one field to the other, 500 rows at a time."""
+    Resume = apps.get_model("resume", "Resume")
+    batch: list = []
+    for resume in Resume.objects.only("pk", source).iterator(chunk_size=500):
+        setattr(resume, target, getattr(resume, source))
+        batch.append(resume)
+        if len(batch) == 500:
+            Resume.objects.bulk_update(batch, [target])
+            batch = []
+    Resume.objects.bulk_update(batch, [target])
+
+
+def compress_text(apps, schema_editor) -> None:
+    """Compress the text of existing resumes."""
+    copy_text(apps, "plain_resume_text", "resume_text")
+
+
+def decompress_text(apps, schema_editor) -> None:
+    """Restore the text of existing resumes, uncompressed."""
+    copy_text(apps, "resume_text", "plain_resume_text")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0011_text_truncated"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.RenameField(
+            model_name="resume",
+            old_name="resume_text",
+            new_name="plain_resume_text",
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="resume_text",
+            field=resume.fields.CompressedTextField(default=""),
+        ),
+        migrations.RunPython(compress_text, decompress_text),
+        migrations.RemoveField(
+            model_name="resume",
+            name="plain_resume_text",
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+    ]
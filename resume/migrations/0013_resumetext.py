@@ -0,0 +1,131 @@
+# Generated by Django 5.0.3 on 2026-10-18 14:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import resume.fields
+from resume.migrations._fts import FTS_TABLE, VOCAB_TABLE, get_triggers_sql
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TABLE IF EXISTS {VOCAB_TABLE}",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def get_create_sql(content_table: str) -> list[str]:
+    """Return the statements creating the FTS5 index of content_table's text."""
+    return [
+        f"""
+        CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            normalized_text,
+            content='{content_table}',
+            content_rowid='rowid',
+            tokenize="unicode61 remove_diacritics 0 tokenchars '_'"
+        )
+        """,
+        f"CREATE VIRTUAL TABLE {VOCAB_TABLE} USING fts5vocab('{FTS_TABLE}', 'instance')",
+        *get_triggers_sql(content_table),
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    ]
+
+
+def move_fts_table(schema_editor, content_table: str) -> None:
+    """Recreate the FTS5 index, and its triggers, over content_table."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in DROP_SQL + get_create_sql(content_table):
+        schema_editor.execute(sql)
+
+
+def index_resume_text(apps, schema_editor) -> None:
+    """Index resume_resumetext, which the triggers keep in sync from now on."""
+    move_fts_table(schema_editor, "resume_resumetext")
+
+
+def index_resume(apps, schema_editor) -> None:
+    """Index resume_resume again, once its text is copied back."""
+    move_fts_table(schema_editor, "resume_resume")
+
+
+def copy_text(apps, schema_editor) -> None:
+    """Copy the text of existing resumes with text into ResumeText rows."""
+    Resume = apps.get_model("resume", "Resume")
+    ResumeText = apps.get_model("resume", "ResumeText")
+    resumes = (
+        Resume.objects.exclude(resume_text="")
+        .values_list("pk", "resume_text", "normalized_text")
+        .iterator(chunk_size=500)
+    )
+    batch: list = []
+    for pk, resume_text, normalized_text in resumes:
+        batch.append(
+            ResumeText(
+                resume_id=pk, resume_text=resume_text, normalized_text=normalized_text
+            )
+        )
+        if len(batch) == 500:
+            ResumeText.objects.bulk_create(batch)
+            batch = []
+    ResumeText.objects.bulk_create(batch)
+
+
+def copy_text_back(apps, schema_editor) -> None:
+    """Copy the text of ResumeText rows back into their resumes."""
+    Resume = apps.get_model("resume", "Resume")
+    ResumeText = apps.get_model("resume", "ResumeText")
+    texts = ResumeText.objects.values_list(
+        "resume_id", "resume_text", "normalized_text"
+    ).iterator(chunk_size=500)
+    batch: list = []
+    for pk, resume_text, normalized_text in texts:
+        batch.append(
+            Resume(pk=pk, resume_text=resume_text, normalized_text=normalized_text)
+        )
+        if len(batch) == 500:
+            Resume.objects.bulk_update(batch, ["resume_text", "normalized_text"])
+            batch = []
+    Resume.objects.bulk_update(batch, ["resume_text", "normalized_text"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0012_compressed_resume_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumeText",
+            fields=[
+                (
+                    "resume",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="text",
+                        serialize=False,
+                        to="resume.resume",
+                    ),
+                ),
+                ("resume_text", resume.fields.CompressedTextField(default="")),
+                ("normalized_text", models.TextField(default="")),
+            ],
+            options={
+                "verbose_name": "Resume Text",
+                "verbose_name_plural": "Resume Texts",
+            },
+        ),
+        migrations.RunPython(index_resume_text, index_resume),
+        migrations.RunPython(copy_text, copy_text_back),
+        migrations.RemoveField(
+            model_name="resume",
+            name="normalized_text",
+        ),
+        migrations.RemoveField(
+            model_name="resume",
+            name="resume_text",
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.3 on 2026-10-18 14:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0013_resumetext"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resume",
+            name="batch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="resumes",
+                to="resume.ingestjob",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ingestjob",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("staging", "Staging"),
+                    ("queued", "Queued"),
+                    ("running", "Running"),
+                    ("done", "Done"),
+                ],
+                db_index=True,
+                default="queued",
+                max_length=10,
+            ),
+        ),
+    ]
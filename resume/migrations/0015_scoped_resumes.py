@@ -0,0 +1,198 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import resume.fields
+from resume.migrations._fts import restore_fts_triggers
+
+# Resumes are keyed by name until the id is added; postings and text are
+# pointed at the id by joining on the name, which is still unique then.
+COPY_POSTING_IDS = """
+    UPDATE resume_posting SET resume_id = (
+        SELECT r.id FROM resume_resume r WHERE r.name = resume_posting.legacy_resume_id
+    )
+"""
+COPY_POSTING_NAMES = """
+    UPDATE resume_posting SET legacy_resume_id = (
+        SELECT r.name FROM resume_resume r WHERE r.id = resume_posting.resume_id
+    )
+"""
+COPY_TEXT_IDS = """
+    INSERT INTO resume_resumetext (resume_id, resume_text, normalized_text)
+    SELECT r.id, t.resume_text, t.normalized_text
+    FROM resume_legacyresumetext t JOIN resume_resume r ON r.name = t.resume_id
+"""
+COPY_TEXT_NAMES = """
+    INSERT INTO resume_legacyresumetext (resume_id, resume_text, normalized_text)
+    SELECT r.name, t.resume_text, t.normalized_text
+    FROM resume_resumetext t JOIN resume_resume r ON r.id = t.resume_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0014_upload_batches"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.RemoveIndex(
+            model_name="resume",
+            name="resume_unique_matches_idx",
+        ),
+        migrations.AddField(
+            model_name="ingestjob",
+            name="owner",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ingest_jobs",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="owner",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="resumes",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        # Keep the old references to names, explicitly, while the id is added
+        migrations.RemoveConstraint(
+            model_name="posting",
+            name="unique_term_per_resume",
+        ),
+        migrations.AlterField(
+            model_name="posting",
+            name="resume",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="resume.resume",
+                to_field="name",
+            ),
+        ),
+        migrations.RenameField(
+            model_name="posting",
+            old_name="resume",
+            new_name="legacy_resume",
+        ),
+        migrations.AlterField(
+            model_name="resumetext",
+            name="resume",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                primary_key=True,
+                related_name="+",
+                serialize=False,
+                to="resume.resume",
+                to_field="name",
+            ),
+        ),
+        migrations.RenameModel(
+            old_name="ResumeText",
+            new_name="LegacyResumeText",
+        ),
+        # Key resumes by id
+        migrations.AddField(
+            model_name="resume",
+            name="id",
+            field=models.BigAutoField(
+                auto_created=True,
+                default=None,
+                primary_key=True,
+                serialize=False,
+                verbose_name="ID",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="resume",
+            name="name",
+            field=models.CharField(
+                default="<django.db.models.fields.files.FileField>", max_length=100
+            ),
+        ),
+        # Point postings at resume ids
+        migrations.AddField(
+            model_name="posting",
+            name="resume",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="postings",
+                to="resume.resume",
+            ),
+        ),
+        migrations.RunSQL(COPY_POSTING_IDS, COPY_POSTING_NAMES),
+        migrations.RemoveField(
+            model_name="posting",
+            name="legacy_resume",
+        ),
+        migrations.AlterField(
+            model_name="posting",
+            name="resume",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="postings",
+                to="resume.resume",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="posting",
+            constraint=models.UniqueConstraint(
+                fields=("term", "resume"), name="unique_term_per_resume"
+            ),
+        ),
+        # Point resume text at resume ids
+        migrations.CreateModel(
+            name="ResumeText",
+            fields=[
+                (
+                    "resume",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="text",
+                        serialize=False,
+                        to="resume.resume",
+                    ),
+                ),
+                ("resume_text", resume.fields.CompressedTextField(default="")),
+                ("normalized_text", models.TextField(default="")),
+            ],
+            options={
+                "verbose_name": "Resume Text",
+                "verbose_name_plural": "Resume Texts",
+            },
+        ),
+        migrations.RunSQL(COPY_TEXT_IDS, COPY_TEXT_NAMES),
+        migrations.DeleteModel(
+            name="LegacyResumeText",
+        ),
+        # Scope names, and the results table's index, to the batch
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["batch", "-unique_matches", "name"],
+                name="resume_batch_matches_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="resume",
+            constraint=models.UniqueConstraint(
+                fields=("batch", "name"), name="unique_name_per_batch"
+            ),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+    ]
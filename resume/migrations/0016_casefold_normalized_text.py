@@ -0,0 +1,105 @@
+# Generated by Django 5.0.3 on 2026-10-18 16:05
+
+import re
+import string
+import unicodedata
+from collections.abc import Callable
+
+from django.db import migrations
+from django.db.models import F
+
+# Frozen copies of the tokenizer and index as of this migration
+TERM_PATTERN = re.compile(r"\w+")
+PHRASE_GAP = " "
+
+
+def strip_punctuation(text: str) -> str:
+    """Strip punctuation from either end of each word, joining words by a space."""
+    return " ".join(word.strip(string.punctuation) for word in text.split())
+
+
+def casefold_normalize(text: str) -> str:
+    """Normalize text as the Tokenizer does: NFKC casefolded, then stripped."""
+    if text.isascii():
+        return strip_punctuation(text.lower())
+    if not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+    return strip_punctuation(text.casefold())
+
+
+def lowercase_normalize(text: str) -> str:
+    """Normalize text as it was before the Tokenizer: lowercased, then stripped."""
+    return strip_punctuation(text.lower())
+
+
+def get_term_positions(text: str) -> dict[str, list[int]]:
+    """Return each term's positions in normalized text, numbered as the index does."""
+    positions: dict[str, list[int]] = {}
+    position: int = -1
+    end: int | None = None
+
+    for match in TERM_PATTERN.finditer(text):
+        position += 1 if end is None or text[end : match.start()] == PHRASE_GAP else 2
+        positions.setdefault(match.group(), []).append(position)
+        end = match.end()
+
+    return positions
+
+
+def index_resume(Posting, resume_id: int, normalized_text: str) -> None:
+    """Replace the postings of a resume with ones built from its normalized text."""
+    Posting.objects.filter(resume_id=resume_id).delete()
+    Posting.objects.bulk_create(
+        Posting(
+            term=term, resume_id=resume_id, count=len(positions), positions=positions
+        )
+        for term, positions in get_term_positions(normalized_text).items()
+    )
+
+
+def renormalize(apps, normalize: Callable[[str], str]) -> None:
+    """Re-normalize the text of resumes whose normalized text would change.
+
+    Only text outside ASCII can change. Each changed resume's term count and
+    postings are redone, and its text version bumped, so its stored scores go
+    stale; the FTS5 triggers re-index it.
+    """
+    Resume = apps.get_model("resume", "Resume")
+    ResumeText = apps.get_model("resume", "ResumeText")
+    Posting = apps.get_model("resume", "Posting")
+
+    texts = ResumeText.objects.values_list(
+        "resume_id", "resume_text", "normalized_text"
+    ).iterator(chunk_size=500)
+    for resume_id, resume_text, normalized_text in texts:
+        renormalized: str = normalize(resume_text)
+        if renormalized == normalized_text:
+            continue
+        ResumeText.objects.filter(pk=resume_id).update(normalized_text=renormalized)
+        Resume.objects.filter(pk=resume_id).update(
+            term_count=len(TERM_PATTERN.findall(renormalized)),
+            text_version=F("text_version") + 1,
+        )
+        if Posting.objects.filter(resume_id=resume_id).exists():
+            index_resume(Posting, resume_id, renormalized)
+
+
+def casefold_text(apps, schema_editor) -> None:
+    """Normalize existing text with the Tokenizer's NFKC casefolding."""
+    renormalize(apps, casefold_normalize)
+
+
+def lowercase_text(apps, schema_editor) -> None:
+    """Normalize existing text by lowercasing it again."""
+    renormalize(apps, lowercase_normalize)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0015_scoped_resumes"),
+    ]
+
+    operations = [
+        migrations.RunPython(casefold_text, lowercase_text),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.3 on 2026-10-18 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0016_casefold_normalized_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumeTokens",
+            fields=[
+                (
+                    "text",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="tokens",
+                        serialize=False,
+                        to="resume.resumetext",
+                    ),
+                ),
+                ("token_ids", models.BinaryField(default=bytes)),
+            ],
+            options={
+                "verbose_name": "Resume Tokens",
+                "verbose_name_plural": "Resume Tokens",
+            },
+        ),
+        migrations.CreateModel(
+            name="Term",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                "verbose_name": "Term",
+                "verbose_name_plural": "Terms",
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0017_doc_term_arrays"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CorpusVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Corpus Version",
+                "verbose_name_plural": "Corpus Versions",
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+"""FTS5 helpers shared by the migrations that create, move or remake the index.
+
+Migrations run against the schema of their time, so they don't import
+resume.util, whose code changes along with the current schema. These copies
+are frozen: change what a new migration needs in a new function instead.
+
+Django doesn't load modules of the migrations package whose names start with
+an underscore as migrations.
+"""
+
+import re
+
+# FTS5 table created by migration 0006_resume_fts
+FTS_TABLE: str = "resume_resume_fts"
+# fts5vocab table listing every (term, rowid, offset) of FTS_TABLE
+VOCAB_TABLE: str = "resume_resume_fts_vocab"
+
+
+def get_triggers_sql(content_table: str) -> list[str]:
+    """Return the statements creating the triggers that keep FTS_TABLE in sync."""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {content_table}
+        BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, normalized_text)
+            VALUES (new.rowid, new.normalized_text);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {content_table}
+        BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, normalized_text)
+            VALUES ('delete', old.rowid, old.normalized_text);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF normalized_text ON {content_table} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, normalized_text)
+            VALUES ('delete', old.rowid, old.normalized_text);
+            INSERT INTO {FTS_TABLE}(rowid, normalized_text)
+            VALUES (new.rowid, new.normalized_text);
+        END
+        """,
+    ]
+
+
+def restore_fts_triggers(apps, schema_editor) -> None:
+    """Recreate the FTS5 triggers, and re-index, after the content table is remade.
+
+    On SQLite, migrations that alter a table copy it into a new one, which
+    drops its triggers and renumbers its rowids. Run this migration function
+    after any operation that remakes the table FTS_TABLE indexes, which is
+    read from FTS_TABLE's own definition, so older migrations still restore
+    the triggers on resume_resume.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = %s", [FTS_TABLE])
+        row: tuple[str] | None = cursor.fetchone()
+    if row is None:
+        return
+    content_table: str = re.search(r"content='(\w+)'", row[0]).group(1)
+    for sql in get_triggers_sql(content_table):
+        schema_editor.execute(sql)
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
@@ -4,24 +4,56 @@ from typing import Any, LiteralString
 from django.conf import settings
 from django.core.validators import FileExtensionValidator
 from django.db.models import (
+    CASCADE,
+    BigIntegerField,
+    BinaryField,
+    BooleanField,
     CharField,
+    DateTimeField,
     FileField,
+    ForeignKey,
+    Index,
     IntegerField,
     JSONField,
     Model,
+    OneToOneField,
+    PositiveIntegerField,
+    TextChoices,
     TextField,
+    UniqueConstraint,
 )
 
+from .fields import CompressedTextField
+
 
 def _upload_path(
     instance: Any, filename: str, media_root: LiteralString = settings.MEDIA_ROOT
 ) -> Path:
     """Set upload path to media_root/uploads/app_name/file.
 
+    Files with a content_hash are stored by it, so identical uploads share one
+    file whatever they're named. Files of an upload batch are kept in the
+    batch's own directory, as uploads/app_name/batches/<batch id>/abcd...pdf,
+    so the whole batch can be removed at once; others are stored as
+    uploads/app_name/ab/abcd...pdf.
+
     Note: the `uploads/` prefix comes from settings.MEDIA_URL
     Production: uploads/app_name/file
     Tests: resume/tests/uploads/app_name/file
     """
+    content_hash: str = getattr(instance, "content_hash", "")
+    if content_hash and getattr(instance, "batch_id", None):
+        return Path(
+            instance.batch.get_directory(),
+            content_hash + Path(filename).suffix.lower(),
+        )
+    if content_hash:
+        return Path(
+            "uploads",
+            instance._meta.app_label,
+            content_hash[:2],
+            content_hash + Path(filename).suffix.lower(),
+        )
     return Path("uploads", instance._meta.app_label, filename)
 
 
@@ -47,13 +79,28 @@ class Keywords(Model):
 
 
 class Resume(Model):
-    """Resume Model."""
+    """Resume Model.
+
+    Resumes belong to the upload batch they were last uploaded in, and are
+    filtered, exported and deleted a batch at a time. Names are unique within
+    a batch, so re-uploading a name replaces that batch's resume only.
+    """
 
     class Meta:
         """Resume Model Meta."""
 
         verbose_name: str = "Resume"
         verbose_name_plural: str = "Resumes"
+        # Serves a batch's results table pages, in their default order
+        indexes = [
+            Index(
+                fields=["batch", "-unique_matches", "name"],
+                name="resume_batch_matches_idx",
+            )
+        ]
+        constraints = [
+            UniqueConstraint(fields=["batch", "name"], name="unique_name_per_batch")
+        ]
 
     file: FileField = FileField(
         upload_to=_upload_path,
@@ -65,11 +112,225 @@ class Resume(Model):
             )
         ],
     )
-    name = CharField(max_length=100, default=str(file), primary_key=True)
-    resume_text = TextField(default="")
+    name = CharField(max_length=100, default=str(file))
+    content_hash = CharField(max_length=64, default="", blank=True, db_index=True)
+    # Upload batch the file was last uploaded in, and is stored under
+    batch: ForeignKey = ForeignKey(
+        "IngestJob",
+        on_delete=CASCADE,
+        null=True,
+        blank=True,
+        related_name="resumes",
+    )
+    # User who uploaded the batch; None for anonymous uploads
+    owner: ForeignKey = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        null=True,
+        blank=True,
+        related_name="resumes",
+    )
+    # Set when RESUME_EXTRACT_MAX_PAGES or RESUME_EXTRACT_MAX_CHARS cut the text short
+    text_truncated = BooleanField(default=False)
+    # Length of the text's normalized_text in index terms, for BM25 ranking
+    term_count = PositiveIntegerField(default=0)
     unique_matches = IntegerField(null=True)
     keyword_matches: JSONField = JSONField(null=True)
+    # Bumped whenever the text changes, so stale scores can be told apart
+    text_version = PositiveIntegerField(default=0)
+    # FormatUtilies.hash_keywords() of the keywords, and the text_version,
+    # that unique_matches and keyword_matches were scored for
+    scored_keywords = CharField(max_length=64, default="", blank=True)
+    scored_text_version = PositiveIntegerField(default=0)
 
     def __str__(self) -> str:
         """Return model name as string."""
         return str(self.name)
+
+
+class ResumeText(Model):
+    """Extracted text of one resume, kept apart from its small columns.
+
+    Listing, exporting and paging through resumes only read resume_resume;
+    text is loaded from here when it's needed. Only resumes with text have a
+    row, so Resume.objects.filter(text__isnull=False) are the ones with text.
+    """
+
+    class Meta:
+        """ResumeText Model Meta."""
+
+        verbose_name: str = "Resume Text"
+        verbose_name_plural: str = "Resume Texts"
+
+    resume: OneToOneField = OneToOneField(
+        Resume, on_delete=CASCADE, primary_key=True, related_name="text"
+    )
+    # Extracted text, stored compressed; defer() it when it isn't needed
+    resume_text = CompressedTextField(default="")
+    # Left uncompressed, as the full-text index's triggers read it in SQL
+    normalized_text = TextField(default="")
+
+    def __str__(self) -> str:
+        """Return resume name as string."""
+        return str(self.resume_id)
+
+
+class Posting(Model):
+    """Inverted index entry: how often, and where, a term occurs in one resume's text.
+
+    positions: the term's token positions, as InvertedIndex.get_term_positions()
+    numbers them. Consecutive positions are only separated by a single space.
+    """
+
+    class Meta:
+        """Posting Model Meta."""
+
+        verbose_name: str = "Posting"
+        verbose_name_plural: str = "Postings"
+        constraints = [
+            UniqueConstraint(fields=["term", "resume"], name="unique_term_per_resume")
+        ]
+
+    term = CharField(max_length=255)
+    resume: ForeignKey = ForeignKey(Resume, on_delete=CASCADE, related_name="postings")
+    count = PositiveIntegerField(default=0)
+    positions: JSONField = JSONField(default=list)
+
+    def __str__(self) -> str:
+        """Return term and resume as string."""
+        return f"{self.term} ({self.resume_id})"
+
+
+class Term(Model):
+    """A term of the vocabulary, numbering the token ids of ResumeTokens.
+
+    Ids start at 1, since 0 marks a gap between two terms in token_ids.
+    """
+
+    class Meta:
+        """Term Model Meta."""
+
+        verbose_name: str = "Term"
+        verbose_name_plural: str = "Terms"
+
+    term = CharField(max_length=255, unique=True)
+
+    def __str__(self) -> str:
+        """Return term as string."""
+        return str(self.term)
+
+
+class ResumeTokens(Model):
+    """A resume's normalized text, as an array of Term ids, for DocTermScorer.
+
+    token_ids: the ids as little-endian 32-bit integers, in text order. Terms
+    separated by anything but a single space have a 0 between them, as
+    InvertedIndex.get_term_positions() skips a position there.
+    """
+
+    class Meta:
+        """ResumeTokens Model Meta."""
+
+        verbose_name: str = "Resume Tokens"
+        verbose_name_plural: str = "Resume Tokens"
+
+    text: OneToOneField = OneToOneField(
+        ResumeText, on_delete=CASCADE, primary_key=True, related_name="tokens"
+    )
+    token_ids = BinaryField(default=bytes)
+
+    def __str__(self) -> str:
+        """Return resume id as string."""
+        return str(self.text_id)
+
+
+class IngestJob(Model):
+    """A batch of uploaded resumes, queued for text extraction by a worker.
+
+    The batch's files are stored in its own directory, see get_directory().
+    """
+
+    class Meta:
+        """IngestJob Model Meta."""
+
+        verbose_name: str = "Ingest Job"
+        verbose_name_plural: str = "Ingest Jobs"
+
+    class Status(TextChoices):
+        """Where the job is in the queue."""
+
+        STAGING = "staging"
+        QUEUED = "queued"
+        RUNNING = "running"
+        DONE = "done"
+
+    # User who uploaded the batch; None for anonymous uploads
+    owner: ForeignKey = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        null=True,
+        blank=True,
+        related_name="ingest_jobs",
+    )
+    status = CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED, db_index=True
+    )
+    created = DateTimeField(auto_now_add=True)
+    started = DateTimeField(null=True, blank=True)
+    finished = DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """Return job id and status as string."""
+        return f"Ingest Job {self.pk} ({self.status})"
+
+    def get_directory(self) -> Path:
+        """Return the directory the batch's files are stored in, under MEDIA_ROOT."""
+        return Path("uploads", self._meta.app_label, "batches", str(self.pk))
+
+
+class IngestFile(Model):
+    """An uploaded resume file waiting in, or processed by, an IngestJob."""
+
+    class Meta:
+        """IngestFile Model Meta."""
+
+        verbose_name: str = "Ingest File"
+        verbose_name_plural: str = "Ingest Files"
+
+    class Status(TextChoices):
+        """Outcome of processing the file."""
+
+        QUEUED = "queued"
+        DONE = "done"
+        FAILED = "failed"
+
+    job: ForeignKey = ForeignKey(IngestJob, on_delete=CASCADE, related_name="files")
+    name = CharField(max_length=100)
+    file = CharField(max_length=255)
+    content_hash = CharField(max_length=64, default="", blank=True)
+    status = CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    error = TextField(default="", blank=True)
+
+    def __str__(self) -> str:
+        """Return file name as string."""
+        return str(self.file)
+
+
+class CorpusVersion(Model):
+    """Version of the resumes as a whole, bumped whenever any are added or removed.
+
+    Kept in the database, as a single row, so the ingest worker's bumps reach
+    every web process. QueryCache keys cached results by it.
+    """
+
+    class Meta:
+        """CorpusVersion Model Meta."""
+
+        verbose_name: str = "Corpus Version"
+        verbose_name_plural: str = "Corpus Versions"
+
+    version = BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        """Return version as string."""
+        return str(self.version)
@@ -1,3 +1,963 @@
-from django.test import TestCase
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .benchmarks.corpus import CorpusGenerator
+from .benchmarks.suite import BenchmarkSuite
+from .custom_types import CompressionResult, FilteredData
+from .models import (
+    CorpusVersion,
+    IngestFile,
+    IngestJob,
+    Keywords,
+    Resume,
+    ResumeText,
+)
+from .util.archive import ZipArchive
+from .util.csv import CSVExporter
+from .util.data import DataFiltering
+from .util.deleter import Deleter
+from .util.doc_terms import np
+from .util.extract import extract_pdf_text
+from .util.format import FormatUtilies
+from .util.fts import FullTextIndex
+from .util.index import InvertedIndex
+from .util.ingest import ACTIVE_BATCH_KEY, IngestQueue
+from .util.matcher import KeywordMatcher
+from .util.metrics import Metrics
+from .util.pages import ResultPages
+from .util.ranking import BM25
+from .util.resume import Processor
+from .util.tokenize import Tokenizer
+
+FT: FormatUtilies = FormatUtilies()
+TOKENIZER: Tokenizer = Tokenizer()
+
+
+def extract_or_crash(filepath: str, *limits: int | None) -> tuple[str, str, bool]:
+    """Extract a PDF's text, or kill the worker process extracting crash.pdf."""
+    if Path(filepath).name == "crash.pdf":
+        os._exit(1)
+    return extract_pdf_text(filepath, *limits)
+
+
+class ResumeTestCase(TestCase):
+    """Runs each test with its own uploads dir, and helpers to ingest and filter."""
+
+    def setUp(self) -> None:
+        self.media_root: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        for alias in ("default", "query_results", "metrics"):
+            caches[alias].clear()
+        self.queue: IngestQueue = IngestQueue(Resume, media_root=self.media_root)
+
+    def make_upload(self, name: str, text: str) -> SimpleUploadedFile:
+        """Return a PDF of text, as an uploaded file called name.pdf."""
+        return SimpleUploadedFile(
+            f"{name}.pdf",
+            CorpusGenerator().make_pdf(text),
+            content_type="application/pdf",
+        )
+
+    def enqueue(self, texts: dict[str, str]) -> IngestJob:
+        """Queue a batch of PDFs, one per {name: text}."""
+        return self.queue.enqueue(
+            [self.make_upload(name, text) for name, text in texts.items()]
+        )
+
+    def ingest(self, texts: dict[str, str]) -> IngestJob:
+        """Queue a batch of PDFs, one per {name: text}, and run it."""
+        job: IngestJob = self.enqueue(texts)
+        self.queue.run(job)
+        return job
+
+    def filter(
+        self, keywords: str, batch: IngestJob | None, filtering=None
+    ) -> FilteredData:
+        """Run a keyword query against a batch, as KeywordView does."""
+        filtering = filtering or DataFiltering(Resume, batch=batch)
+        return filtering.generate_keyword_match_data(
+            None, SimpleNamespace(cleaned_data={"keywords": keywords})
+        )
+
+    def activate(self, job: IngestJob) -> None:
+        """Make job the test client's active batch."""
+        session = self.client.session
+        session[ACTIVE_BATCH_KEY] = job.pk
+        session.save()
+
+    def make_archive(self, members: dict[str, bytes]) -> SimpleUploadedFile:
+        """Return a ZIP archive of {path: data}, as an uploaded file."""
+        buffer: io.BytesIO = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path, data in members.items():
+                archive.writestr(path, data)
+        return SimpleUploadedFile(
+            "resumes.zip", buffer.getvalue(), content_type="application/zip"
+        )
+
+    def get_rows(self, filtered_data: FilteredData) -> dict[str, dict[str, int]]:
+        """Return {candidate: kw_matches} of a query's table rows."""
+        return {
+            row["candidate"]: row["kw_matches"] for row in filtered_data["table_rows"]
+        }
+
+    def get_scores(
+        self, filtered_data: FilteredData
+    ) -> dict[str, tuple[dict[str, int], int]]:
+        """Return {candidate: (kw_matches, unique_score)} of a query's table rows."""
+        return {
+            row["candidate"]: (row["kw_matches"], row["unique_score"])
+            for row in filtered_data["table_rows"]
+        }
+
+
+class QueryCacheTests(ResumeTestCase):
+    def test_ingest_invalidates_cached_query(self) -> None:
+        job: IngestJob = self.enqueue(
+            {"ada": "Python and Django", "alan": "Rust", "grace": "Python"}
+        )
+        self.assertEqual(self.filter("python", job)["table_rows"], [])
+
+        self.queue.run(job)
+        self.assertEqual(
+            self.get_rows(self.filter("python", job)),
+            {"ada": {"python": 1}, "grace": {"python": 1}},
+        )
+
+    def test_corpus_version_is_shared_between_processes(self) -> None:
+        version: int = CorpusVersion.objects.get_or_create(pk=1)[0].version
+        self.ingest({"ada": "Python"})
+
+        # Another process's default cache never saw the worker's bump
+        caches["default"].clear()
+        self.assertEqual(CorpusVersion.objects.get().version, version + 1)
+
+    def test_cached_query_restores_scores_overwritten_by_another_process(
+        self,
+    ) -> None:
+        job: IngestJob = self.ingest({"ada": "Python Python Django", "alan": "Rust"})
+        first: DataFiltering = DataFiltering(Resume, batch=job)
+        second: DataFiltering = DataFiltering(Resume, batch=job)
+        # Each web process caches results in its own memory
+        second.cache.results = LocMemCache("second", {})
+
+        self.filter("python", job, first)
+        self.filter("rust", job, second)
+        self.assertEqual(Resume.objects.get(name="alan").keyword_matches, {"rust": 1})
+
+        self.filter("python", job, first)
+        self.assertEqual(
+            dict(Resume.objects.values_list("name", "keyword_matches")),
+            {"ada": {"python": 2}, "alan": {"python": 0}},
+        )
+
+    def test_repeat_query_is_served_from_cache(self) -> None:
+        job: IngestJob = self.ingest({"ada": "Python", "alan": "Rust"})
+        filtering: DataFiltering = DataFiltering(Resume, batch=job)
+        first: FilteredData = self.filter("python rust", job, filtering)
+
+        with mock.patch.object(filtering.index, "search") as search:
+            self.assertEqual(self.filter("python rust", job, filtering), first)
+        search.assert_not_called()
+        self.assertEqual(filtering.cache.get_stats()["hits"], 1)
+
+
+class StoredScoresTests(ResumeTestCase):
+    def test_only_replaced_resumes_are_rescored(self) -> None:
+        job: IngestJob = self.ingest({"ada": "Python", "alan": "Rust"})
+        self.filter("python rust", job)
+
+        processor: Processor = Processor(Resume, media_root=self.media_root)
+        processor.process_staged_resumes(
+            processor.stage_resumes([self.make_upload("alan", "Python Python")], job),
+            job,
+        )
+        filtering: DataFiltering = DataFiltering(Resume, batch=job)
+        with mock.patch.object(
+            filtering.scorer,
+            "score_normalized_text",
+            wraps=filtering.scorer.score_normalized_text,
+        ) as score:
+            rows = self.get_rows(self.filter("python rust", job, filtering))
+
+        self.assertEqual(
+            rows,
+            {"ada": {"python": 1, "rust": 0}, "alan": {"python": 2, "rust": 0}},
+        )
+        self.assertEqual(score.call_count, 1)
+
+
+class FullTextIndexTests(ResumeTestCase):
+    def test_punctuation_only_query_matches_nothing(self) -> None:
+        job: IngestJob = self.ingest({"ada": "Python - Django"})
+        filtering: DataFiltering = DataFiltering(Resume, batch=job)
+        filtering.index = FullTextIndex()
+
+        self.assertEqual(filtering.index.search([], filtering.get_resume_ids()), {})
+        self.assertFalse(filtering.index.get_resume_ids([]).exists())
+        self.assertFalse(self.filter("- --", job, filtering)["matches_found"])
+
+
+class IngestQueueTests(ResumeTestCase):
+    def test_run_fails_remaining_files_when_processing_raises(self) -> None:
+        job: IngestJob = self.enqueue({"ada": "Python", "alan": "Rust"})
+        with mock.patch.object(
+            Processor, "process_staged_resumes", side_effect=OSError("disk full")
+        ):
+            results = self.queue.run(job)
+
+        self.assertEqual([r["error"] for r in results], ["OSError: disk full"] * 2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, IngestJob.Status.DONE)
+        self.assertIsNotNone(job.finished)
+        self.assertEqual(
+            self.queue.get_progress(job),
+            {
+                "job": job.pk,
+                "status": "done",
+                "total": 2,
+                "done": 0,
+                "failed": 2,
+                "remaining": 0,
+            },
+        )
+
+    def test_claim_next_reclaims_stale_running_job(self) -> None:
+        job: IngestJob = self.enqueue({"ada": "Python", "alan": "Rust"})
+        self.assertEqual(self.queue.claim_next(), job)
+        self.assertIsNone(self.queue.claim_next())
+
+        # The worker was killed after processing one file
+        job.files.filter(name="ada").update(status=IngestFile.Status.DONE)
+        IngestJob.objects.filter(pk=job.pk).update(
+            started=timezone.now() - timedelta(seconds=self.queue.timeout + 1)
+        )
+        reclaimed: IngestJob | None = self.queue.claim_next()
+        self.assertEqual(reclaimed, job)
+        self.assertEqual([r["name"] for r in self.queue.run(reclaimed)], ["alan"])
+        self.assertIsNone(self.queue.claim_next())
+
+
+# There's no 404.html template yet, so 404s are rendered by the debug view
+@override_settings(DEBUG=True)
+class IngestProgressViewTests(TestCase):
+    def setUp(self) -> None:
+        self.owner = get_user_model().objects.create_user("ada", password="pw")
+        self.job: IngestJob = IngestJob.objects.create(owner=self.owner)
+        self.url: str = reverse("ingest_progress", args=[self.job.pk])
+
+    def test_owner_sees_progress(self) -> None:
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(self.url).json()["job"], self.job.pk)
+
+    def test_uploading_session_sees_progress(self) -> None:
+        anonymous_job: IngestJob = IngestJob.objects.create()
+        session = self.client.session
+        session[ACTIVE_BATCH_KEY] = anonymous_job.pk
+        session.save()
+
+        url: str = reverse("ingest_progress", args=[anonymous_job.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(Client().get(url).status_code, 404)
+
+    def test_other_users_get_404(self) -> None:
+        other = get_user_model().objects.create_user("alan", password="pw")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(Client().get(self.url).status_code, 404)
+
+
+class ZipArchiveTests(ResumeTestCase):
+    def test_pdfs_sharing_a_name_are_kept_apart(self) -> None:
+        upload: SimpleUploadedFile = self.make_archive(
+            {
+                "candidate1/resume.pdf": CorpusGenerator().make_pdf("Python"),
+                "candidate2/resume.pdf": CorpusGenerator().make_pdf("Rust"),
+                "ada.pdf": CorpusGenerator().make_pdf("Django"),
+            }
+        )
+        zip_archive: ZipArchive = ZipArchive()
+        zip_archive.validate(upload)
+        job: IngestJob = self.queue.enqueue(
+            zip_archive.iter_pdfs(upload, taken={"ada"})
+        )
+        self.queue.run(job)
+
+        self.assertEqual(
+            zip_archive.renamed,
+            {"candidate2/resume.pdf": "resume (2)", "ada.pdf": "ada (2)"},
+        )
+        self.assertEqual(
+            self.get_rows(self.filter("python rust django", job)),
+            {
+                "resume": {"python": 1, "rust": 0, "django": 0},
+                "resume (2)": {"python": 0, "rust": 1, "django": 0},
+                "ada (2)": {"python": 0, "rust": 0, "django": 1},
+            },
+        )
+
+    def test_upload_page_lists_renamed_pdfs(self) -> None:
+        pdf: bytes = CorpusGenerator().make_pdf("Python")
+        response = self.client.post(
+            reverse("resume"),
+            {
+                "archive": self.make_archive(
+                    {"candidate1/resume.pdf": pdf, "candidate2/resume.pdf": pdf}
+                )
+            },
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertContains(
+            response, "<li>candidate2/resume.pdf as resume (2)</li>", status_code=202
+        )
+
+    def encrypt(self, upload: SimpleUploadedFile) -> SimpleUploadedFile:
+        """Return an archive with its first member flagged as encrypted."""
+        data: bytearray = bytearray(upload.read())
+        # General purpose flags of the member's central directory header
+        data[data.index(b"PK\x01\x02") + 8] |= 0x1
+        return SimpleUploadedFile("resumes.zip", bytes(data))
+
+    def test_archives_over_the_limits_are_rejected(self) -> None:
+        pdf: bytes = CorpusGenerator().make_pdf("Python")
+        cases: dict[str, tuple[SimpleUploadedFile, dict[str, int]]] = {
+            "bad_zip": (SimpleUploadedFile("resumes.zip", b"not a zip"), {}),
+            "no_pdfs": (self.make_archive({"ada.pdf/": b"", "notes.txt": b""}), {}),
+            "too_many_members": (
+                self.make_archive({"ada.pdf": pdf, "notes.txt": b""}),
+                {"max_members": 1},
+            ),
+            "encrypted_member": (self.encrypt(self.make_archive({"ada.pdf": pdf})), {}),
+            "member_too_large": (
+                self.make_archive({"ada.pdf": pdf}),
+                {"max_member_size": len(pdf) - 1},
+            ),
+            "compression_ratio": (self.make_archive({"ada.pdf": bytes(100_000)}), {}),
+        }
+        for code, (upload, limits) in cases.items():
+            with self.subTest(code=code):
+                with self.assertRaises(ValidationError) as raised:
+                    ZipArchive(**limits).validate(upload)
+                self.assertEqual(raised.exception.code, code)
+
+        ZipArchive(max_members=2).validate(
+            self.make_archive({"ada.pdf": pdf, "notes.txt": b""})
+        )
+
+
+class ResultPagesTests(ResumeTestCase):
+    def test_sort_by_keyword_of_the_query(self) -> None:
+        job: IngestJob = self.ingest(
+            {"ada": "Python Python", "alan": "Python Rust", "grace": "Django"}
+        )
+        self.filter("python rust cobol", job)
+        pages: ResultPages = ResultPages(Resume, job)
+
+        self.assertEqual(
+            [row["candidate"] for row in pages.get_page(sort="rust")["rows"]],
+            ["alan", "ada"],
+        )
+        # A keyword that matched nothing still sorts
+        self.assertEqual(len(pages.get_page(sort="cobol")["rows"]), 2)
+        with self.assertRaisesMessage(ValueError, "Unknown sort column: java"):
+            pages.get_page(sort="java")
+
+    def test_sort_by_keyword_without_matches(self) -> None:
+        job: IngestJob = self.ingest({"ada": "Python"})
+        self.filter("cobol", job)
+
+        page = ResultPages(Resume, job).get_page(sort="cobol")
+        self.assertEqual((page["rows"], page["next"]), ([], None))
+
+
+class KeywordCountTests(ResumeTestCase):
+    """Checks every backend's counts against one re.finditer() per keyword."""
+
+    texts: dict[str, str] = {
+        "ada": "Senior engineer: Node.js, C-500 and C++; machine learning - "
+        "machine - learning. Python's Django",
+        "alan": "ab ab ab ab ab. Nodejs node js, C 500; e-mail: Python python PYTHON",
+        "grace": "Machine learning engineer, senior engineer; résumé naïve über",
+        "linus": "Rust, Carlsbad",
+    }
+    queries: list[str] = [
+        'python django "machine learning" node.js C-500 c++ "senior engineer" '
+        '"ab ab" e-mail résumé cobol',
+        '"machine learning engineer" "learning machine" "ab ab ab" "node js"',
+        'PYTHON "python\'s" über Rust',
+        "- --",
+        "",
+    ]
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.job: IngestJob = self.ingest(self.texts)
+
+    def get_texts(self) -> dict[str, str]:
+        """Return the normalized text of the batch's resumes, by name."""
+        return dict(
+            ResumeText.objects.filter(resume__batch=self.job).values_list(
+                "resume__name", "normalized_text"
+            )
+        )
+
+    def count_regex(self, text: str, key_words: list[str]) -> dict[str, int]:
+        """Return the count of each keyword in text, with one regex per keyword."""
+        return {
+            word: sum(
+                1
+                for _ in re.finditer(r"\b%s\b" % re.escape(TOKENIZER.fold(word)), text)
+            )
+            for word in key_words
+        }
+
+    def count_keywords(
+        self, key_words: list[str]
+    ) -> dict[str, tuple[dict[str, int], int]]:
+        """Return the scores of the batch's matching resumes, counted by regex."""
+        scores: dict[str, tuple[dict[str, int], int]] = {}
+        for name, text in self.get_texts().items():
+            counts: dict[str, int] = self.count_regex(text, key_words)
+            unique_score: int = sum(1 for count in counts.values() if count)
+            if unique_score:
+                scores[name] = (counts, unique_score)
+        return scores
+
+    def assert_counts_match_regex(self, filtering: DataFiltering) -> None:
+        """Run every query, then its stored scores, and compare to the regex."""
+        for keywords in self.queries:
+            with self.subTest(keywords=keywords):
+                filtered: FilteredData = self.filter(keywords, self.job, filtering)
+                expected = self.count_keywords(filtered["key_words_with_case"])
+                self.assertEqual(self.get_scores(filtered), expected)
+                self.assertEqual(filtered["matches_found"], bool(expected))
+
+                caches["query_results"].clear()
+                stored: FilteredData = self.filter(keywords, self.job, filtering)
+                self.assertEqual(self.get_scores(stored), expected)
+
+    def test_regex_counts(self) -> None:
+        key_words: list[str] = self.filter(self.queries[0], self.job)[
+            "key_words_with_case"
+        ]
+        self.assertEqual(
+            self.count_keywords(key_words)["ada"][0],
+            {
+                "python": 1,
+                "django": 1,
+                "machine learning": 1,
+                "node.js": 1,
+                "C-500": 1,
+                "c": 2,
+                "senior engineer": 1,
+                "ab ab": 0,
+                "e-mail": 0,
+                "résumé": 0,
+                "cobol": 0,
+            },
+        )
+        self.assertEqual(self.count_keywords(["ab ab"])["alan"], ({"ab ab": 2}, 1))
+
+    def test_keyword_matcher(self) -> None:
+        for keywords in self.queries:
+            key_words: list[str] = FT.format_keywords(keywords)
+            matcher: KeywordMatcher = KeywordMatcher(key_words)
+            for name, text in self.get_texts().items():
+                with self.subTest(keywords=keywords, name=name):
+                    self.assertEqual(
+                        matcher.count_keywords(text), self.count_regex(text, key_words)
+                    )
+
+    def test_inverted_index(self) -> None:
+        filtering: DataFiltering = DataFiltering(Resume, batch=self.job)
+        filtering.index = InvertedIndex()
+        self.assert_counts_match_regex(filtering)
+
+    def test_full_text_index(self) -> None:
+        filtering: DataFiltering = DataFiltering(Resume, batch=self.job)
+        filtering.index = FullTextIndex()
+        self.assert_counts_match_regex(filtering)
+
+    @skipIf(np is None, "NumPy isn't installed")
+    def test_doc_term_scorer(self) -> None:
+        filtering: DataFiltering = DataFiltering(
+            Resume, batch=self.job, doc_term_scoring=True
+        )
+        filtering.doc_terms.rebuild()
+        self.assert_counts_match_regex(filtering)
+
+    def test_phrase_positions(self) -> None:
+        index: InvertedIndex = InvertedIndex()
+        # A gap other than one space skips a position
+        self.assertEqual(
+            index.get_term_positions("machine learning  machine  learning"),
+            {"machine": [0, 3], "learning": [1, 5]},
+        )
+        # Matches are taken from the left, without overlapping
+        self.assertEqual(index.count_phrase(["ab", "ab"], {"ab": {0, 1, 2, 3, 4}}), 2)
+
+
+class ParallelScoringTests(ResumeTestCase):
+    def test_parallel_scores_match_serial_scores(self) -> None:
+        keywords: str = 'python django "nuclear scientist" C-500 node.js e-mail cobol'
+        serial_job: IngestJob = self.queue.enqueue(CorpusGenerator(1).make_uploads(8))
+        parallel_job: IngestJob = self.queue.enqueue(CorpusGenerator(1).make_uploads(8))
+        self.queue.run(serial_job)
+        self.queue.run(parallel_job)
+
+        serial: FilteredData = self.filter(
+            keywords, serial_job, DataFiltering(Resume, batch=serial_job, workers=1)
+        )
+        filtering: DataFiltering = DataFiltering(
+            Resume, batch=parallel_job, batch_size=3, workers=2, parallel_threshold=8
+        )
+        with mock.patch.object(
+            filtering, "score_in_parallel", wraps=filtering.score_in_parallel
+        ) as score_in_parallel:
+            parallel: FilteredData = self.filter(keywords, parallel_job, filtering)
+
+        score_in_parallel.assert_called_once()
+        self.assertTrue(serial["matches_found"])
+        self.assertEqual(
+            [
+                (r["candidate"], r["kw_matches"], r["unique_score"])
+                for r in parallel["table_rows"]
+            ],
+            [
+                (r["candidate"], r["kw_matches"], r["unique_score"])
+                for r in serial["table_rows"]
+            ],
+        )
+
+
+class ExtractionTests(ResumeTestCase):
+    def write_pdf(self, name: str, text: str) -> str:
+        """Write a PDF of text into the uploads dir, and return its file name."""
+        Path(self.media_root, f"{name}.pdf").write_bytes(
+            CorpusGenerator().make_pdf(text)
+        )
+        return f"{name}.pdf"
+
+    def test_crashed_worker_only_fails_its_own_file(self) -> None:
+        filenames: list[str] = [
+            self.write_pdf(name, text)
+            for name, text in {
+                "ada": "Python",
+                "crash": "Rust",
+                "alan": "Django",
+                "grace": "SQL",
+            }.items()
+        ]
+        processor: Processor = Processor(Resume, media_root=self.media_root, workers=2)
+        with mock.patch("resume.util.resume.extract_pdf_text", extract_or_crash):
+            results = processor.get_pdf_texts(filenames)
+
+        self.assertEqual(
+            [text.strip() for text, _, _ in results], ["Python", "", "Django", "SQL"]
+        )
+        self.assertEqual(
+            [bool(error) for _, error, _ in results], [False, True, False, False]
+        )
+        self.assertTrue(results[1][1].startswith("BrokenProcessPool"))
+
+    def test_page_and_character_limits(self) -> None:
+        # 53 lines fit on a page, so this is 3 pages long
+        text: str = "\n".join(f"line {i}" for i in range(150))
+        path: str = str(Path(self.media_root, self.write_pdf("ada", text)))
+
+        full_text, error, truncated = extract_pdf_text(path)
+        self.assertEqual(
+            (full_text.split(), error, truncated), (text.split(), "", False)
+        )
+        self.assertEqual(extract_pdf_text(path, max_pages=3), (full_text, "", False))
+
+        first_page, _, truncated = extract_pdf_text(path, max_pages=1)
+        self.assertTrue(truncated)
+        self.assertEqual(first_page.split(), text.split()[: 53 * 2])
+
+        self.assertEqual(
+            extract_pdf_text(path, max_chars=20), (full_text[:20], "", True)
+        )
+        self.assertEqual(
+            extract_pdf_text(path, max_pages=1, max_chars=len(full_text)),
+            (first_page, "", True),
+        )
+
+    def test_truncated_text_is_flagged(self) -> None:
+        processor: Processor = Processor(
+            Resume, media_root=self.media_root, max_pages=1
+        )
+        long_text: str = "\n".join(["Python"] * 53 + ["Django"])
+        results = processor.process_staged_resumes(
+            processor.stage_resumes(
+                [self.make_upload("ada", long_text), self.make_upload("alan", "Rust")]
+            )
+        )
+
+        self.assertEqual([r["truncated"] for r in results], [True, False])
+        ada: Resume = Resume.objects.select_related("text").get(name="ada")
+        self.assertTrue(ada.text_truncated)
+        self.assertEqual(ada.text.normalized_text, " ".join(["python"] * 53))
+        self.assertFalse(Resume.objects.get(name="alan").text_truncated)
+
+
+class CSVExporterTests(ResumeTestCase):
+    def test_headers_are_the_keywords_the_batch_was_scored_for(self) -> None:
+        job: IngestJob = self.ingest({"ada": "Python Django"})
+        other: IngestJob = self.ingest({"alan": "Rust"})
+        self.filter("python django", job)
+        # Another user's query, of another batch, is saved last
+        self.filter("rust", other)
+        Keywords.objects.create(keywords="rust")
+
+        self.assertEqual(
+            CSVExporter(Resume, Keywords, job).get_table_headers(),
+            ["Name", "Unique Matches", "", "python", "django"],
+        )
+
+    def test_headers_of_a_batch_never_queried(self) -> None:
+        job: IngestJob = self.ingest({"ada": "Python"})
+
+        self.assertEqual(
+            CSVExporter(Resume, Keywords, job).get_table_headers(),
+            ["Name", "Unique Matches", ""],
+        )
+
+    def test_export_streams_the_batch_rows(self) -> None:
+        job: IngestJob = self.ingest(
+            {"ada": "Python Python Django", "alan": "Rust", "grace": "Django"}
+        )
+        self.filter("python django", job)
+        self.activate(job)
+
+        response = self.client.get(reverse("exportcsv"))
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            response["Content-Disposition"],
+            "attachment; filename=candidates_keyword_scores.csv",
+        )
+        self.assertEqual(
+            b"".join(response.streaming_content).decode(),
+            "Name,Unique Matches,,python,django\r\n"
+            "ada,2,,2,1\r\n"
+            "grace,1,,0,1\r\n",
+        )
+
+    def test_export_of_a_batch_without_matches(self) -> None:
+        job: IngestJob = self.ingest({"ada": "Python"})
+        self.activate(job)
+        # Not queried yet, so there are no scores to export
+        self.assertTemplateUsed(self.client.get(reverse("exportcsv")), "export.html")
+
+        self.filter("rust", job)
+        response = self.client.get(reverse("exportcsv"))
+        self.assertEqual(
+            b"".join(response.streaming_content).decode(),
+            "Name,Unique Matches,,rust\r\n",
+        )
+
+    def test_export_of_an_empty_batch(self) -> None:
+        job: IngestJob = IngestJob.objects.create()
+        self.assertEqual(
+            list(CSVExporter(Resume, Keywords, job).stream_csv()),
+            ["Name,Unique Matches,\r\n"],
+        )
+
+        self.activate(job)
+        self.assertTemplateUsed(self.client.get(reverse("exportcsv")), "export.html")
+
+
+class RankingTests(ResumeTestCase):
+    def rank_by_full_sort(
+        self, filtering: DataFiltering, key_words: list[str]
+    ) -> list[tuple[str, float]]:
+        """Return every candidate's name and relevance, by scoring and sorting all.
+
+        Ties are ordered by primary key, as resumes with the same text are ranked.
+        """
+        indexed: dict[int, dict[str, int]] = filtering.index.search(
+            key_words, filtering.get_resume_ids()
+        )
+        resumes: list[Resume] = list(
+            Resume.objects.filter(
+                pk__in=filtering.index.get_resume_ids(
+                    key_words, filtering.get_resume_ids()
+                ),
+                text__isnull=False,
+            ).select_related("text")
+        )
+        bm25: BM25 = filtering.get_ranking_model(
+            key_words, {r.pk: r.term_count for r in resumes}, indexed
+        )
+        matcher: KeywordMatcher = KeywordMatcher(key_words)
+        ranked: list[tuple[float, int, str]] = [
+            (
+                bm25.score(
+                    matcher.count_keywords(r.text.normalized_text), r.term_count
+                ),
+                r.pk,
+                r.name,
+            )
+            for r in resumes
+        ]
+        return [
+            (name, relevance)
+            for relevance, _, name in sorted(ranked, key=lambda r: (-r[0], r[1]))
+            if relevance > 0
+        ]
+
+    def assert_top_k_matches_full_sort(
+        self, job: IngestJob, key_words: list[str]
+    ) -> None:
+        """Check rank_candidates() for every top_k against the full sort."""
+        filtering: DataFiltering = DataFiltering(Resume, batch=job)
+        expected: list[tuple[str, float]] = self.rank_by_full_sort(filtering, key_words)
+        self.assertTrue(expected)
+        for top_k in range(1, len(expected) + 2):
+            with self.subTest(top_k=top_k):
+                ranked = filtering.rank_candidates(key_words, top_k)
+                self.assertEqual(
+                    [row["candidate"] for row in ranked],
+                    [name for name, _ in expected[:top_k]],
+                )
+                for row, (_, relevance) in zip(ranked, expected):
+                    self.assertAlmostEqual(row["relevance"], relevance)
+
+    def test_top_k_matches_full_sort(self) -> None:
+        job: IngestJob = self.ingest(
+            {
+                "ada": "Python Django",
+                "alan": "Python Django",
+                "grace": "Python",
+                "linus": "Django Django Rust",
+                "barbara": "Python Python Django SQL",
+                "ken": "Rust",
+                "hedy": "Python Django",
+            }
+        )
+        self.assert_top_k_matches_full_sort(job, ["python", "django"])
+
+    def test_early_stop_keeps_the_top_k(self) -> None:
+        # node.js can't be answered by the index, so resumes with both node
+        # and js are bounded by the most it could add, however it matches
+        job: IngestJob = self.ingest(
+            {
+                "ada": "Node.js Node.js Python",
+                "alan": "node js Python Python",
+                "grace": "node, js",
+                "linus": "Python Python Python Rust",
+                "barbara": "Python",
+                "ken": "Node.js developer, Go",
+                "hedy": "Python SQL Rust Go Django",
+            }
+        )
+        key_words: list[str] = ["node.js", "python"]
+        self.assert_top_k_matches_full_sort(job, key_words)
+
+        filtering: DataFiltering = DataFiltering(Resume, batch=job)
+        with mock.patch.object(
+            filtering.scorer,
+            "score_normalized_text",
+            wraps=filtering.scorer.score_normalized_text,
+        ) as score:
+            filtering.rank_candidates(key_words, 1)
+        self.assertLess(score.call_count, 7)
+
+    def test_ranked_query_isnt_saved_as_the_scored_query(self) -> None:
+        self.activate(self.ingest({"ada": "Python Django"}))
+
+        response = self.client.post(
+            reverse("filter"), {"keywords": "python", "top_k": 5}
+        )
+        self.assertContains(response, "ada")
+        self.assertFalse(Keywords.objects.exists())
+
+        self.client.post(reverse("filter"), {"keywords": "django"})
+        self.assertEqual(
+            list(Keywords.objects.values_list("keywords", flat=True)), ["django"]
+        )
+
+
+class ContentHashTests(ResumeTestCase):
+    def test_same_file_under_another_name_reuses_file_and_text(self) -> None:
+        pdf: bytes = CorpusGenerator().make_pdf("Python Django")
+        job: IngestJob = self.queue.enqueue(
+            [SimpleUploadedFile(f"{name}.pdf", pdf) for name in ("ada", "alan")]
+        )
+        processor: Processor = Processor(Resume, media_root=self.media_root)
+
+        with mock.patch(
+            "resume.util.resume.extract_pdf_text", wraps=extract_pdf_text
+        ) as extract:
+            self.queue.run(job)
+            self.assertEqual(extract.call_count, 1)
+
+            staged = processor.stage_resumes(
+                [SimpleUploadedFile("grace.pdf", pdf)], job
+            )
+            results = processor.process_staged_resumes(staged, job)
+            self.assertEqual(extract.call_count, 1)
+
+        self.assertTrue(results[0]["reused"])
+        resumes: QuerySet = Resume.objects.filter(batch=job).select_related("text")
+        self.assertEqual({r.file.name for r in resumes}, {staged[0]["file"]})
+        self.assertEqual(
+            len(list(Path(self.media_root, job.get_directory()).iterdir())), 1
+        )
+        self.assertEqual(
+            {r.name: r.text.normalized_text for r in resumes},
+            dict.fromkeys(["ada", "alan", "grace"], "python django"),
+        )
+
+
+class MetricsTests(ResumeTestCase):
+    def test_render_prometheus_text(self) -> None:
+        metrics: Metrics = Metrics(buckets=(0.01, 0.1))
+        for seconds in (0.005, 0.05, 0.1, 2.0):
+            metrics.observe("filter", "score", seconds)
+        metrics.increment("resumes_scored", 3)
+
+        lines: list[str] = metrics.render().splitlines()
+        self.assertIn("# TYPE resume_resumes_scored_total counter", lines)
+        self.assertIn("resume_resumes_scored_total 3", lines)
+        self.assertIn("resume_files_stored_total 0", lines)
+        self.assertIn("# TYPE resume_stage_seconds histogram", lines)
+        labels: str = 'operation="filter",stage="score"'
+        self.assertEqual(
+            [line for line in lines if labels in line],
+            [
+                f'resume_stage_seconds_bucket{{{labels},le="0.01"}} 1',
+                f'resume_stage_seconds_bucket{{{labels},le="0.1"}} 3',
+                f'resume_stage_seconds_bucket{{{labels},le="+Inf"}} 4',
+                f"resume_stage_seconds_sum{{{labels}}} 2.155",
+                f"resume_stage_seconds_count{{{labels}}} 4",
+            ],
+        )
+        self.assertIn(
+            'resume_stage_seconds_bucket{operation="upload",stage="extract",le="+Inf"} 0',
+            lines,
+        )
+
+    def test_filter_response_has_server_timing(self) -> None:
+        self.activate(self.ingest({"ada": "Python Django"}))
+
+        response = self.client.post(reverse("filter"), {"keywords": "python"})
+        timings: list[str] = response["Server-Timing"].split(", ")
+        for timing in timings:
+            self.assertRegex(timing, r"^\w+;dur=\d+\.\d$")
+        self.assertTrue(timings[-1].startswith("total;"))
+        self.assertCountEqual(
+            [timing.split(";")[0] for timing in timings],
+            [
+                "filter_keywords",
+                "filter_search",
+                "filter_stored",
+                "filter_load",
+                "filter_score",
+                "filter_rows",
+                "filter_save",
+                "filter_reset",
+                "filter_render",
+                "total",
+            ],
+        )
+        self.assertIn(
+            "resume_resumes_scored_total 1",
+            self.client.get(reverse("metrics")).content.decode(),
+        )
+
+
+class CompressedTextFieldTests(ResumeTestCase):
+    def test_text_is_stored_compressed(self) -> None:
+        self.ingest({"ada": "Python Django " * 100})
+        text: ResumeText = ResumeText.objects.get(resume__name="ada")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT resume_text FROM {ResumeText._meta.db_table} "
+                "WHERE resume_id = %s",
+                [text.pk],
+            )
+            stored: bytes = bytes(cursor.fetchone()[0])
+        self.assertIn("Python Django", text.resume_text)
+        self.assertEqual(zlib.decompress(stored).decode(), text.resume_text)
+        self.assertLess(len(stored), len(text.resume_text))
+
+    def test_empty_text_is_stored_empty(self) -> None:
+        resume: Resume = Resume.objects.create(name="ada")
+        ResumeText.objects.create(resume=resume, resume_text="")
+
+        self.assertEqual(ResumeText.objects.get().resume_text, "")
+        self.assertTrue(ResumeText.objects.filter(resume_text="").exists())
+
+    def test_benchmark_reports_total_text_storage(self) -> None:
+        self.ingest({"ada": "Python Django " * 100, "grace": "Rust " * 50})
+        suite: BenchmarkSuite = BenchmarkSuite(Resume, Keywords, Path(self.media_root))
+
+        compression: CompressionResult = suite.measure_compression(2)
+        normalized_bytes: int = sum(
+            len(text.encode())
+            for text in ResumeText.objects.values_list("normalized_text", flat=True)
+        )
+        self.assertEqual(compression["normalized_bytes"], normalized_bytes)
+        self.assertEqual(
+            compression["total_bytes"],
+            compression["stored_bytes"] + normalized_bytes,
+        )
+        self.assertEqual(
+            compression["bytes_per_resume"], compression["total_bytes"] / 2
+        )
+        self.assertGreater(compression["ratio"], 1)
+
+
+class DeleterTests(ResumeTestCase):
+    def test_purge_expired_batches(self) -> None:
+        expired: IngestJob = self.ingest({"ada": "Python"})
+        running: IngestJob = self.enqueue({"alan": "Rust"})
+        IngestJob.objects.filter(pk=running.pk).update(status=IngestJob.Status.RUNNING)
+        recent: IngestJob = self.ingest({"grace": "Django"})
+        IngestJob.objects.filter(pk__in=[expired.pk, running.pk]).update(
+            created=timezone.now() - timedelta(days=31)
+        )
+        version: int = CorpusVersion.objects.get().version
+        deleter: Deleter = Deleter(
+            Resume, Keywords, media_root=self.media_root, retention_days=30
+        )
+
+        self.assertEqual(deleter.purge_expired_batches(), 1)
+        self.assertEqual(
+            set(IngestJob.objects.values_list("pk", flat=True)),
+            {running.pk, recent.pk},
+        )
+        self.assertEqual(list(Resume.objects.values_list("name", flat=True)), ["grace"])
+        self.assertFalse(Path(self.media_root, expired.get_directory()).exists())
+        self.assertTrue(Path(self.media_root, recent.get_directory()).exists())
+        self.assertEqual(CorpusVersion.objects.get().version, version + 1)
+
+        self.assertEqual(deleter.empty_trash(), 1)
+        self.assertEqual(deleter.empty_trash(), 0)
@@ -0,0 +1,174 @@
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from zipfile import BadZipFile, ZipFile, ZipInfo
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.template.defaultfilters import filesizeformat
+
+# Bytes decompressed from a member at a time
+CHUNK_SIZE: int = 64 * 1024
+
+
+class ZipArchive:
+    """Methods for checking uploaded ZIP archives, and streaming out their PDFs.
+
+    Archives are read from their central directory, and members are
+    decompressed one at a time, so neither the archive nor its contents are
+    ever unpacked whole to disk or memory.
+    """
+
+    def __init__(
+        self,
+        max_members: int = settings.RESUME_ZIP_MAX_MEMBERS,
+        max_member_size: int = settings.RESUME_ZIP_MAX_MEMBER_SIZE,
+        max_ratio: int = settings.RESUME_ZIP_MAX_COMPRESSION_RATIO,
+        spool_size: int = settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+    ) -> None:
+        """Take the archive limits, or default to the settings.
+
+        max_members: most files an archive may hold, PDF or not
+        max_member_size: most bytes a PDF may decompress to
+        max_ratio: most a PDF may decompress to, per compressed byte
+        spool_size: most bytes of a PDF kept in memory, before spilling to disk
+        """
+        self.max_members: int = max_members
+        self.max_member_size: int = max_member_size
+        self.max_ratio: int = max_ratio
+        self.spool_size: int = spool_size
+        # {path in the archive: name} of the PDFs iter_pdfs() had to rename
+        self.renamed: dict[str, str] = {}
+
+    def get_pdf_members(self, archive: ZipFile) -> list[ZipInfo]:
+        """Return the archive's PDFs, skipping folders and macOS metadata."""
+        return [
+            info
+            for info in archive.infolist()
+            if not info.is_dir()
+            and Path(info.filename).suffix.lower() == ".pdf"
+            and not info.filename.startswith("__MACOSX/")
+            and not Path(info.filename).name.startswith(".")
+        ]
+
+    def get_member_names(
+        self, members: list[ZipInfo], taken: Iterable[str] = ()
+    ) -> dict[str, str]:
+        """Return the resume name of each PDF, by its path in the archive.
+
+        PDFs are named after their file name, without its folders, so exports
+        like candidate1/resume.pdf and candidate2/resume.pdf share a name, and
+        would replace each other in the batch. A PDF whose name is already
+        taken, by an earlier member or by one of taken, gets a numbered
+        suffix, like "resume (2)".
+        """
+        used: set[str] = set(taken)
+        names: dict[str, str] = {}
+        for info in members:
+            stem: str = Path(info.filename).stem
+            name: str = stem
+            number: int = 2
+            while name in used:
+                name = f"{stem} ({number})"
+                number += 1
+            used.add(name)
+            names[info.filename] = name
+        return names
+
+    def validate(self, upload: UploadedFile) -> None:
+        """Check an uploaded archive against the limits, from its central directory.
+
+        Raises:
+            ValidationError: if the file isn't a ZIP archive, holds no PDFs or
+                too many files, or has an encrypted, oversized, or suspiciously
+                compressed PDF
+        """
+        try:
+            with ZipFile(upload) as archive:
+                members: int = sum(1 for i in archive.infolist() if not i.is_dir())
+                pdfs: list[ZipInfo] = self.get_pdf_members(archive)
+        except BadZipFile:
+            raise ValidationError("File isn't a valid ZIP archive.", code="bad_zip")
+        finally:
+            upload.seek(0)
+
+        if members > self.max_members:
+            raise ValidationError(
+                "Archives may hold at most %(max)d files; this one has %(count)d.",
+                code="too_many_members",
+                params={"max": self.max_members, "count": members},
+            )
+        if not pdfs:
+            raise ValidationError("Archive holds no PDF files.", code="no_pdfs")
+
+        for info in pdfs:
+            if info.flag_bits & 0x1:
+                raise ValidationError(
+                    "%(name)s is encrypted.",
+                    code="encrypted_member",
+                    params={"name": info.filename},
+                )
+            if info.file_size > self.max_member_size:
+                raise ValidationError(
+                    "%(name)s is larger than %(max)s.",
+                    code="member_too_large",
+                    params={
+                        "name": info.filename,
+                        "max": filesizeformat(self.max_member_size),
+                    },
+                )
+            if info.file_size > self.max_ratio * max(info.compress_size, 1):
+                raise ValidationError(
+                    "%(name)s is compressed more than %(max)d to 1.",
+                    code="compression_ratio",
+                    params={"name": info.filename, "max": self.max_ratio},
+                )
+
+    def iter_pdfs(
+        self, upload: UploadedFile, taken: Iterable[str] = ()
+    ) -> Iterator[UploadedFile]:
+        """Yield each PDF in a validated archive as an uploaded file, one at a time.
+
+        Each PDF is decompressed into a temporary file, held in memory up to
+        spool_size bytes, which is deleted once the next PDF is asked for.
+        ZipFile stops reading a member at its declared size, so no PDF can
+        decompress past the limits validate() checked.
+
+        PDFs are named by get_member_names(); the ones renamed to keep their
+        names unique are recorded in self.renamed.
+
+        Args:
+            upload (UploadedFile): archive checked by validate()
+            taken (Iterable[str]): names of the PDFs uploaded alongside it
+
+        Raises:
+            ValidationError: if a PDF's data is corrupt
+        """
+        with ZipFile(upload) as archive:
+            members: list[ZipInfo] = self.get_pdf_members(archive)
+            names: dict[str, str] = self.get_member_names(members, taken)
+            self.renamed = {
+                path: name for path, name in names.items() if name != Path(path).stem
+            }
+            for info in members:
+                with SpooledTemporaryFile(max_size=self.spool_size) as spool:
+                    try:
+                        with archive.open(info) as member:
+                            while chunk := member.read(CHUNK_SIZE):
+                                spool.write(chunk)
+                    except (BadZipFile, EOFError, OSError, zlib.error) as e:
+                        raise ValidationError(
+                            "%(name)s is corrupt: %(error)s",
+                            code="corrupt_member",
+                            params={"name": info.filename, "error": e},
+                        ) from e
+
+                    spool.seek(0)
+                    yield UploadedFile(
+                        spool,
+                        name=names[info.filename] + ".pdf",
+                        content_type="application/pdf",
+                        size=info.file_size,
+                    )
@@ -0,0 +1,89 @@
+import time
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db.models import F
+from django.db.models.base import ModelBase
+
+from resume.models import CorpusVersion
+
+from ..custom_types import FilteredData, QueryCacheStats
+from .format import FormatUtilies
+
+FT: FormatUtilies = FormatUtilies()
+
+HITS_KEY: str = "resume:query_cache_hits"
+MISSES_KEY: str = "resume:query_cache_misses"
+
+
+class QueryCache:
+    """Cache of keyword query results, invalidated whenever the resumes change.
+
+    Results live in the `alias` cache, whose TIMEOUT and MAX_ENTRIES evict
+    them, and hit/miss counters in the default cache, with no timeout.
+
+    The corpus version is kept in the database, so the ingest worker's and
+    every web process's bumps invalidate results cached by any process.
+
+    Results are kept per scope, e.g. an upload batch, so queries of one batch
+    never see another's.
+    """
+
+    def __init__(
+        self,
+        alias: str = settings.RESUME_QUERY_CACHE,
+        scope: str = "",
+        version_model: ModelBase = CorpusVersion,
+    ) -> None:
+        """scope: key of the resumes queried, e.g. their upload batch's id."""
+        self.results: BaseCache = caches[alias]
+        self.state: BaseCache = caches["default"]
+        self.scope: str = scope
+        self.CorpusVersion: ModelBase = version_model
+
+    def get_corpus_version(self) -> int:
+        """Return the corpus version, starting it at the current time if unset.
+
+        Starting from the time, rather than 0, means a recreated database can't
+        restart at a number that results still cached were stored under.
+        """
+        version, _ = self.CorpusVersion.objects.get_or_create(
+            pk=1, defaults={"version": time.time_ns()}
+        )
+        return version.version
+
+    def bump_corpus_version(self) -> None:
+        """Invalidate every cached result, after resumes are added or removed."""
+        self.get_corpus_version()
+        self.CorpusVersion.objects.filter(pk=1).update(version=F("version") + 1)
+
+    def make_key(self, key_words: list[str]) -> str:
+        """Return the cache key for FormatUtilies.format_keywords() output."""
+        digest: str = FT.hash_keywords(key_words)
+        return f"resume:query:{self.get_corpus_version()}:{self.scope}:{digest}"
+
+    def count(self, counter_key: str) -> None:
+        """Increment a hit/miss counter."""
+        self.state.add(counter_key, 0, None)
+        self.state.incr(counter_key)
+
+    def get(self, key: str) -> FilteredData | None:
+        """Return the cached result for key, counting the hit or miss."""
+        data: FilteredData | None = self.results.get(key)
+        self.count(MISSES_KEY if data is None else HITS_KEY)
+        return data
+
+    def set(self, key: str, data: FilteredData) -> None:
+        """Cache a query's result."""
+        self.results.set(key, data)
+
+    def get_stats(self) -> QueryCacheStats:
+        """Return hit/miss counts and the corpus version, for monitoring."""
+        hits: int = self.state.get(HITS_KEY, 0)
+        misses: int = self.state.get(MISSES_KEY, 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "corpus_version": self.get_corpus_version(),
+        }
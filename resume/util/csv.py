@@ -1,36 +1,113 @@
 import csv
+from collections.abc import Iterable, Iterator
 
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models.query import ValuesIterable, ValuesListIterable
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, StreamingHttpResponse
+
+from resume.models import IngestJob
 
 from ..custom_types import CSVRow, CSVRowsDict
 from .format import FormatUtilies
+from .metrics import Metrics, StageTimer
+from .pages import ResultPages
 
 FT: FormatUtilies = FormatUtilies()
 
 
+class EchoBuffer:
+    """File-like object whose write() returns the line, for csv.writer to stream."""
+
+    def write(self, value: str) -> str:
+        """Return the formatted CSV line instead of storing it."""
+        return value
+
+
 class CSVExporter(LoginRequiredMixin):
     """Methods for formatting and exporting a CSV file."""
 
-    def __init__(self, resume_model, keywords_model) -> None:
+    def __init__(
+        self,
+        resume_model,
+        keywords_model,
+        batch: IngestJob | None = None,
+        chunk_size: int = settings.RESUME_EXPORT_CHUNK_SIZE,
+    ) -> None:
+        """batch: upload batch whose resumes are exported; None for the resumes
+            uploaded outside of any batch
+        chunk_size: rows fetched from the database at a time, when exporting.
+        """
         self.Resume = resume_model
         self.Keywords = keywords_model
+        self.batch: IngestJob | None = batch
+        self.chunk_size: int = chunk_size
+        self.metrics: Metrics = Metrics()
+
+    def export_csv(self, request: HttpRequest) -> StreamingHttpResponse:
+        """Export all entries from resume_uploadfile db table to a .csv file.
 
-    def export_csv(self, request: HttpRequest) -> HttpResponse:
-        """Export all entries from resume_uploadfile db table to a .csv file."""
-        response: HttpResponse = HttpResponse()
+        Rows are streamed as they're read from the database, so memory use
+        doesn't grow with the number of candidates.
+        """
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            self.stream_csv(), content_type="text/csv"
+        )
         response["Content-Disposition"] = (
             "attachment; filename=candidates_keyword_scores.csv"
         )
-        writer: csv._writer = csv.writer(response)
-        csv_data: CSVRowsDict = self.prepare_csv()
-        writer.writerow(csv_data["table_headers"])
-        for row in csv_data["table_rows"]:
-            writer.writerow(row)
 
         return response
 
+    def stream_csv(self) -> Iterator[str]:
+        """Yield the formatted lines of the CSV file, timing the "export" metrics.
+
+        The stages are recorded once the last line is sent, or the client
+        disconnects.
+        """
+        writer: csv._writer = csv.writer(EchoBuffer())
+        rows: int = -1  # Not counting the header row
+
+        with StageTimer("export", self.metrics) as timer:
+            for row in self.iter_csv(timer):
+                with timer.stage("write"):
+                    line: str = writer.writerow(row)
+                rows += 1
+                yield line
+
+        self.metrics.increment("csv_rows_exported", max(rows, 0))
+
+    def iter_csv(self, timer: StageTimer) -> Iterator[CSVRow]:
+        """Yield the CSV header row, then a row per candidate with matches.
+
+        timer: times reading the headers, and reading and formatting the rows
+        """
+        with timer.stage("headers"):
+            table_headers: list[str] = self.get_table_headers()
+        yield table_headers
+
+        cands: Iterator[tuple[str, int, dict[str, int]]] = (
+            self.Resume.objects.filter(batch=self.batch, unique_matches__gt=0)
+            .values_list("name", "unique_matches", "keyword_matches")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        yield from timer.iterate("query", self.iter_query_set_as_csv_rows(cands))
+
+    def get_table_headers(self) -> list[str]:
+        """Return the CSV header row, using the keywords the batch was scored for.
+
+        The rows hold the batch's stored scores, so their columns are named
+        from those scores, rather than from the last query, which may have
+        been another batch's, or a ranked one that stored no scores.
+        """
+        keyword_headers_list: list[str] = ResultPages(
+            self.Resume, self.batch
+        ).get_keywords()
+
+        table_headers: list[str] = ["Name", "Unique Matches", ""]
+        table_headers.extend(keyword_headers_list)
+        return table_headers
+
     def format_kw_headers_as_list(self, kw_headers: str) -> list[str]:
         """Convert a string of keywords into a cleaned-up list for the CSV Header row."""
         headers_list: list[str] = FT.format_keywords(kw_headers)
@@ -41,7 +118,12 @@ class CSVExporter(LoginRequiredMixin):
 
         CSVRow: "cand_name, unique_match, '', <individual scores>"
         """
-        rows: list[CSVRow] = []
+        return list(self.iter_query_set_as_csv_rows(cands))
+
+    def iter_query_set_as_csv_rows(
+        self, cands: Iterable[tuple[str, int, dict[str, int]]]
+    ) -> Iterator[CSVRow]:
+        """Yield a CSVRow for each candidate with matches, as cands is consumed."""
         for cand in cands:
             name: str = cand[0]
             unique_matches: int = cand[1]
@@ -56,8 +138,7 @@ class CSVExporter(LoginRequiredMixin):
 
                 csv_row.extend(scores)
                 if unique_matches:
-                    rows.append(csv_row)
-        return rows
+                    yield csv_row
 
     def prepare_csv(self) -> CSVRowsDict:
         """Format QuerySet results for CSV export.
@@ -79,18 +160,10 @@ class CSVExporter(LoginRequiredMixin):
                 table_rows (list[str | int]): Rows with
                 candidate name, unique matches, and keyword counts
         """
-        cands: ValuesListIterable = self.Resume.objects.values_list(
-            "name", "unique_matches", "keyword_matches"
-        )
-        keyword_headers: tuple[str] | None = self.Keywords.objects.values_list(
-            "keywords"
-        ).last()
-        keyword_headers_list: list[str] = self.format_kw_headers_as_list(
-            keyword_headers[0]
-        )
-
-        table_headers: list[str] = ["Name", "Unique Matches", ""]
-        table_headers.extend(keyword_headers_list)
+        cands: ValuesListIterable = self.Resume.objects.filter(
+            batch=self.batch
+        ).values_list("name", "unique_matches", "keyword_matches")
+        table_headers: list[str] = self.get_table_headers()
         table_rows: list[CSVRow] = self.format_query_set_as_csv_row_list(cands)
 
         return {"table_headers": table_headers, "table_rows": table_rows}
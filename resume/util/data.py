@@ -1,20 +1,36 @@
-import re
+import heapq
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
 from django.db.models.base import ModelBase
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 
+from resume.models import IngestJob
 from resume.models import Resume as ResumeType
+from resume.models import ResumeText
 
 from ..custom_types import (
     FilteredData,
     PopulatedTable,
+    RankedData,
+    RankedRow,
     ScoreData,
     TableRow,
     TableRowsList,
 )
+from .cache import QueryCache
+from .doc_terms import DocTermScorer, get_doc_term_scorer
 from .format import FormatUtilies
+from .index import InvertedIndex, get_search_index
+from .metrics import Metrics, StageTimer
+from .ranking import BM25
+from .scoring import ResumeScorer, ScoreJob, score_chunk
 
 FT: FormatUtilies = FormatUtilies()
 
@@ -22,63 +38,72 @@ FT: FormatUtilies = FormatUtilies()
 class DataFiltering(LoginRequiredMixin):
     """Methods for filtering, processing, and formatting keyword data."""
 
-    def __init__(self, resume_model: ModelBase) -> None:
-        """Resume model will be overridden by app."""
-        self.Resume: ModelBase = resume_model
-
-    def get_exact_match_word_count(self, word: str, str_to_search: str) -> int:
-        """Get count of exact-matched lowercase word, via re.finditer.
-
-        NOTE: While this will prevent 'htm' from matching 'html', it doesn't
-        work against input like 'C-500' matching '500'.
+    def __init__(
+        self,
+        resume_model: ModelBase,
+        text_model: ModelBase = ResumeText,
+        batch: IngestJob | None = None,
+        batch_size: int = settings.RESUME_SCORE_BATCH_SIZE,
+        workers: int = settings.RESUME_SCORING_WORKERS,
+        parallel_threshold: int = settings.RESUME_PARALLEL_SCORING_THRESHOLD,
+        doc_term_scoring: bool = settings.RESUME_DOC_TERM_SCORING,
+        k1: float = settings.RESUME_RANKING_K1,
+        b: float = settings.RESUME_RANKING_B,
+    ) -> None:
+        """Resume model will be overridden by app.
+
+        batch: upload batch whose resumes are filtered and ranked; None for
+            the resumes uploaded outside of any batch
+        batch_size: number of resumes per UPDATE, when saving scores, and per
+            SELECT, when loading text to score or rank
+        workers: number of processes to score with; 1 scores serially
+        parallel_threshold: fewest candidates worth starting the workers for
+        doc_term_scoring: score candidates with DocTermScorer, a batch at a time
+        k1, b: BM25 parameters, for ranking mode
         """
-        word_lower: str = word.lower()
-        return sum(
-            1
-            for _ in re.finditer(
-                r"\b%s\b" % re.escape(word_lower), str_to_search, flags=re.IGNORECASE
-            )
-        )
-
-    def calculate_word_counts(self, resume: str, key_words: list[str]) -> ScoreData:
-        """Calculate keyword counts and total unique matches for each resume.
-
-        Args:
-            resume (str): lowercase text of resume.
-            key_words (list[str]): list of keywords to filter by.
-
-        Returns:
-            ScoreData (dict): kw_counts, unique_matches
-        """
-        unique_words: list[str] = []
-        kw_counts: dict[str, int] = {}
-        resume_text: str = FT.remove_punctuation(resume)
-
-        for word in key_words:
-            kw_counts[word] = self.get_exact_match_word_count(word, resume_text)
-            if kw_counts[word] > 0 and word not in unique_words:
-                unique_words.append(word)
-
-        return {
-            "kw_counts": kw_counts,
-            "unique_score": len(unique_words),
-        }
-
-    def get_scores(self, candidate: ResumeType, key_words: list[str]) -> ScoreData:
+        self.Resume: ModelBase = resume_model
+        self.ResumeText: ModelBase = text_model
+        self.batch: IngestJob | None = batch
+        self.batch_size: int = batch_size
+        self.workers: int = workers
+        self.parallel_threshold: int = parallel_threshold
+        self.k1: float = k1
+        self.b: float = b
+        self.index: InvertedIndex = get_search_index()
+        self.scorer: ResumeScorer = ResumeScorer()
+        self.doc_terms: DocTermScorer | None = get_doc_term_scorer(doc_term_scoring)
+        self.cache: QueryCache = QueryCache(scope=str(batch.pk) if batch else "")
+        self.metrics: Metrics = Metrics()
+
+    def get_resumes(self) -> QuerySet[ResumeType]:
+        """Return the resumes of the batch, which are the only ones searched."""
+        return self.Resume.objects.filter(batch=self.batch)
+
+    def get_resume_ids(self) -> QuerySet:
+        """Return a subquery of the ids of the batch's resumes, for the index."""
+        return self.get_resumes().values("pk")
+
+    def get_scores(
+        self,
+        normalized_text: str,
+        key_words: list[str],
+        indexed_counts: dict[str, int] | None = None,
+    ) -> ScoreData:
         """Calculate candidate's keyword scores.
 
         Args:
-            candidate (Resume): Resume object from QuerySet
+            normalized_text (str): candidate's ResumeText.normalized_text
             key_words (list[str]): POSTed keywords to calculate scores for
+            indexed_counts (dict[str, int]): counts already answered by the index
 
         Returns:
             ScoreData (dict): kw_counts, unique_matches
         """
-        resume_lowercase: str = candidate.resume_text.lower()
-
         score_data: ScoreData = {}  # type: ignore
-        if resume_lowercase:
-            counts: ScoreData = self.calculate_word_counts(resume_lowercase, key_words)
+        if normalized_text:
+            counts: ScoreData = self.scorer.score_normalized_text(
+                normalized_text, key_words, indexed_counts
+            )
 
             kw_counts: dict[str, int] = counts["kw_counts"]
             unique_score: int = counts["unique_score"]
@@ -91,23 +116,35 @@ class DataFiltering(LoginRequiredMixin):
         return score_data
 
     def generate_table_row(
-        self, candidate: ResumeType, key_words: list[str]
+        self,
+        candidate: ResumeType,
+        key_words: list[str],
+        indexed_counts: dict[str, int] | None = None,
+        keyword_scores: ScoreData | None = None,
     ) -> TableRow:
         """Return table_row to be appended to table_rows list.
 
+        The scores are set on candidate, but not saved; see save_scores().
+
         Args:
             candidate (Resume): resume object
             key_words (list[str]): keywords to calculate scores for
+            indexed_counts (dict[str, int]): counts already answered by the index
+            keyword_scores (ScoreData): scores already calculated for candidate
 
         Returns:
             TableRow: candidate, candidate_url, kw_matches, unique_score
         """
         candidate_name: str = candidate.name
         candidate_url: str = candidate.file.url
-        keyword_scores: ScoreData = self.get_scores(candidate, key_words)
+        if keyword_scores is None:
+            keyword_scores = self.get_scores(
+                self.get_normalized_texts([candidate.pk]).get(candidate.pk, ""),
+                key_words,
+                indexed_counts,
+            )
         candidate.unique_matches = keyword_scores["unique_score"]
         candidate.keyword_matches = keyword_scores["kw_counts"]
-        candidate.save()
 
         table_row: TableRow = {
             "candidate": candidate_name,
@@ -117,30 +154,273 @@ class DataFiltering(LoginRequiredMixin):
         }
         return table_row
 
+    def get_fresh_filter(self, key_words: list[str]) -> Q:
+        """Return a filter for resumes whose stored scores are for these keywords.
+
+        Scores go stale when the keywords differ, or the text was replaced since.
+        """
+        return Q(
+            scored_keywords=FT.hash_keywords(key_words),
+            scored_text_version=F("text_version"),
+        )
+
+    def has_fresh_scores(self, key_words: list[str]) -> bool:
+        """Return True if the stored scores of every resume are for these keywords."""
+        return (
+            not self.get_resumes()
+            .filter(text__isnull=False)
+            .exclude(self.get_fresh_filter(key_words))
+            .exists()
+        )
+
+    def get_stored_table_rows(
+        self, key_words: list[str], matched_ids: QuerySet
+    ) -> TableRowsList:
+        """Return table rows from the stored scores of fresh, matching resumes."""
+        fresh: QuerySet[ResumeType] = (
+            self.get_resumes()
+            .filter(self.get_fresh_filter(key_words))
+            .filter(pk__in=matched_ids, unique_matches__gt=0, text__isnull=False)
+            .only("name", "file", "unique_matches", "keyword_matches")
+        )
+        return [
+            {
+                "candidate": resume.name,
+                "candidate_url": resume.file.url,
+                "kw_matches": resume.keyword_matches,
+                "unique_score": resume.unique_matches,
+            }
+            for resume in fresh
+        ]
+
     def populate_table_rows(
-        self, all_resumes: QuerySet[ResumeType], key_words: list[str]
+        self,
+        all_resumes: QuerySet[ResumeType],
+        key_words: list[str],
+        indexed_matches: dict[int, dict[str, int]] | None = None,
     ) -> PopulatedTable:
         """Return list of table_rows for  generate_keyword_match_data() and results.html.
 
+        Each scored candidate is marked as scored for key_words and its current
+        text_version, so a repeat query can reuse its scores. Loading, scoring,
+        building rows, and saving are timed as stages of the "filter" metrics.
+
         Args:
-            all_resumes (QuerySet[Resume]): All resumes in database
+            all_resumes (QuerySet[Resume]): resumes with text to score
             key_words (list[str]): keywords to calculate scores for
+            indexed_matches (dict): search index counts, by resume id
 
         Returns:
             PopulatedTable (dict): table_rows, matches_found
         """
         table_rows: list[TableRow] = []
-        matching_candidates: bool = False
+        scored: list[ResumeType] = []
+        indexed_matches = indexed_matches or {}
+        keywords_hash: str = FT.hash_keywords(key_words)
+
+        with StageTimer("filter", self.metrics) as timer:
+            with timer.stage("load"):
+                candidates: list[ResumeType] = list(all_resumes)
+            with timer.stage("score"):
+                all_scores: dict[int, ScoreData] = self.score_candidates(
+                    candidates, key_words, indexed_matches, timer
+                )
+
+            with timer.stage("rows"):
+                for candidate in candidates:
+                    table_row: TableRow = self.generate_table_row(
+                        candidate, key_words, keyword_scores=all_scores[candidate.pk]
+                    )
+                    candidate.scored_keywords = keywords_hash
+                    candidate.scored_text_version = candidate.text_version
+                    scored.append(candidate)
+
+                    if table_row["unique_score"] > 0:
+                        table_rows.append(table_row)
+
+            with timer.stage("save"):
+                self.save_scores(scored)
+
+        self.metrics.increment("resumes_scored", len(scored))
+
+        return {"table_rows": table_rows, "matches_found": bool(table_rows)}
+
+    def get_normalized_texts(self, pks: list[int]) -> dict[int, str]:
+        """Return the normalized text of resumes with text, by primary key."""
+        if not pks:
+            return {}
+        return dict(
+            self.ResumeText.objects.filter(pk__in=pks).values_list(
+                "pk", "normalized_text"
+            )
+        )
+
+    def iter_score_jobs(
+        self,
+        candidates: list[ResumeType],
+        key_words: list[str],
+        indexed_matches: dict[int, dict[str, int]],
+    ) -> Iterator[list[ScoreJob]]:
+        """Yield the candidates' scoring jobs, batch_size candidates at a time.
+
+        Text is loaded one batch per SELECT, and only for candidates with
+        keywords the index couldn't answer; the rest are scored without it.
+        """
+        for start in range(0, len(candidates), self.batch_size):
+            batch: list[ResumeType] = candidates[start : start + self.batch_size]
+            texts: dict[int, str] = self.get_normalized_texts(
+                [
+                    c.pk
+                    for c in batch
+                    if len(indexed_matches.get(c.pk, {})) < len(key_words)
+                ]
+            )
+            yield [
+                (c.pk, texts.get(c.pk, ""), indexed_matches.get(c.pk)) for c in batch
+            ]
+
+    def score_candidates(
+        self,
+        candidates: list[ResumeType],
+        key_words: list[str],
+        indexed_matches: dict[int, dict[str, int]],
+        timer: StageTimer | None = None,
+    ) -> dict[int, ScoreData]:
+        """Return each candidate's scores, by primary key.
+
+        With document-term scoring, each batch_size candidates are scored at
+        once, from their token id arrays. Otherwise, scores in worker processes
+        when more than one worker is configured and there are at least
+        parallel_threshold candidates, and serially if not. Either way, text is
+        loaded a batch at a time, as it's scored, and timed as the "load" stage
+        of timer, if given.
+        """
+        if self.doc_terms is not None:
+            return self.score_doc_terms(candidates, key_words, indexed_matches)
+
+        job_batches: Iterable[list[ScoreJob]] = self.iter_score_jobs(
+            candidates, key_words, indexed_matches
+        )
+        if timer is not None:
+            job_batches = timer.iterate("load", job_batches)
+
+        if self.workers > 1 and len(candidates) >= self.parallel_threshold:
+            return self.score_in_parallel(job_batches, key_words)
+
+        return {
+            pk: self.scorer.score_normalized_text(text, key_words, indexed_counts)
+            for jobs in job_batches
+            for pk, text, indexed_counts in jobs
+        }
+
+    def score_doc_terms(
+        self,
+        candidates: list[ResumeType],
+        key_words: list[str],
+        indexed_matches: dict[int, dict[str, int]],
+    ) -> dict[int, ScoreData]:
+        """Score candidates with DocTermScorer, batch_size candidates at a time."""
+        scores: dict[int, ScoreData] = {}
+        for start in range(0, len(candidates), self.batch_size):
+            scores.update(
+                self.doc_terms.score_resumes(
+                    [c.pk for c in candidates[start : start + self.batch_size]],
+                    key_words,
+                    indexed_matches,
+                )
+            )
+        return scores
+
+    def score_in_parallel(
+        self, job_batches: Iterable[list[ScoreJob]], key_words: list[str]
+    ) -> dict[int, ScoreData]:
+        """Score batches of resumes across a process pool, merging results in order.
+
+        At most 2 batches per worker are queued at once, and the next batch is
+        only loaded once the oldest is scored, so only a few batches of text
+        are held in memory.
+        """
+        scores: dict[int, ScoreData] = {}
+        pending: deque[Future] = deque()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for jobs in job_batches:
+                if len(pending) == self.workers * 2:
+                    scores.update(pending.popleft().result())
+                pending.append(executor.submit(score_chunk, jobs, key_words))
+            while pending:
+                scores.update(pending.popleft().result())
+
+        return scores
 
-        for candidate in all_resumes:
-            if candidate.resume_text:
-                table_row: TableRow = self.generate_table_row(candidate, key_words)
-                matching_candidates = True if table_row["unique_score"] > 0 else False
+    def save_scores(self, candidates: list[ResumeType]) -> None:
+        """Write scored candidates' score columns back, batch_size rows per UPDATE.
 
-                if table_row["unique_score"] > 0:
-                    table_rows.append(table_row)
+        Only the scores, and what they were scored for, are written;
+        bulk_update() runs every batch in a single transaction.
+        """
+        self.Resume.objects.bulk_update(
+            candidates,
+            [
+                "unique_matches",
+                "keyword_matches",
+                "scored_keywords",
+                "scored_text_version",
+            ],
+            batch_size=self.batch_size,
+        )
 
-        return {"table_rows": table_rows, "matches_found": matching_candidates}
+    def reset_unmatched_scores(
+        self, key_words: list[str], matched_ids: QuerySet
+    ) -> None:
+        """Zero the stored scores of resumes that contain none of the keywords.
+
+        These are the rows the index lets populate_table_rows() skip; their
+        scores are set to what scoring them would have produced. Rows already
+        scored for these keywords are left alone.
+        """
+        self.get_resumes().filter(text__isnull=False).exclude(
+            pk__in=matched_ids
+        ).exclude(self.get_fresh_filter(key_words)).update(
+            unique_matches=0,
+            keyword_matches=dict.fromkeys(key_words, 0),
+            scored_keywords=FT.hash_keywords(key_words),
+            scored_text_version=F("text_version"),
+        )
+
+    def restore_scores(self, filtered_data: FilteredData) -> None:
+        """Save a cached result's scores, as scoring its query would have.
+
+        Every resume with text in the batch is zeroed, then the matching rows,
+        found by their names, are written.
+        """
+        key_words: list[str] = filtered_data["key_words_with_case"]
+        rows: dict[str, TableRow] = {
+            row["candidate"]: row for row in filtered_data["table_rows"]
+        }
+        matched: list[ResumeType] = [
+            self.Resume(
+                pk=pk,
+                unique_matches=rows[name]["unique_score"],
+                keyword_matches=rows[name]["kw_matches"],
+            )
+            for pk, name in self.get_resumes()
+            .filter(name__in=rows)
+            .values_list("pk", "name")
+        ]
+
+        with transaction.atomic():
+            self.get_resumes().filter(text__isnull=False).update(
+                unique_matches=0,
+                keyword_matches=dict.fromkeys(key_words, 0),
+                scored_keywords=FT.hash_keywords(key_words),
+                scored_text_version=F("text_version"),
+            )
+            self.Resume.objects.bulk_update(
+                matched,
+                ["unique_matches", "keyword_matches"],
+                batch_size=self.batch_size,
+            )
 
     def generate_keyword_match_data(
         self, request: HttpRequest, keyword_form_obj
@@ -151,24 +431,198 @@ class DataFiltering(LoginRequiredMixin):
             request (HttpRequest): user request.
             keyword_form_obj (KeywordForm): POSTED form data.
 
+        Results are cached per batch and keyword set, until resumes are uploaded
+        or deleted.
+        Otherwise, only resumes not yet scored for these keywords, or whose text
+        changed since, are scored; the rest reuse their stored scores.
+
         Returns:
             FilteredData (dict): key_words, table_rows, resumes_exist, matches_found
         """
-        kw_input: list[str] = FT.format_keywords(
-            keyword_form_obj.cleaned_data["keywords"]
+        with StageTimer("filter", self.metrics) as timer:
+            with timer.stage("keywords"):
+                kw_input: list[str] = FT.format_keywords(
+                    keyword_form_obj.cleaned_data["keywords"]
+                )
+
+            cache_key: str = self.cache.make_key(kw_input)
+            cached: FilteredData | None = self.cache.get(cache_key)
+            if cached is not None:
+                # Another query, maybe run by another process, may have
+                # overwritten the stored scores since
+                if not self.has_fresh_scores(kw_input):
+                    with timer.stage("restore"):
+                        self.restore_scores(cached)
+                return cached
+
+            resumes_exist: bool = self.get_resumes().exists()
+
+            # Only resumes containing a queried term, and without fresh scores,
+            # are loaded and scored
+            with timer.stage("search"):
+                indexed_matches: dict[int, dict[str, int]] = self.index.search(
+                    kw_input, self.get_resume_ids()
+                )
+            matched_ids: QuerySet = self.index.get_resume_ids(
+                kw_input, self.get_resume_ids()
+            )
+            candidates: QuerySet[self.Resume] = self.Resume.objects.filter(
+                pk__in=matched_ids, text__isnull=False
+            ).exclude(self.get_fresh_filter(kw_input))
+
+            with transaction.atomic():
+                with timer.stage("stored"):
+                    stored_rows: TableRowsList = self.get_stored_table_rows(
+                        kw_input, matched_ids
+                    )
+                match_data: PopulatedTable = self.populate_table_rows(
+                    candidates, kw_input, indexed_matches
+                )
+                with timer.stage("reset"):
+                    self.reset_unmatched_scores(kw_input, matched_ids)
+
+        table_rows: TableRowsList = stored_rows + match_data["table_rows"]
+        candidate_matches_found: bool = bool(table_rows)
+
+        filtered_data: FilteredData = {
+            "key_words_with_case": kw_input,
+            "table_rows": table_rows,
+            "resumes_exist": resumes_exist,
+            "matches_found": candidate_matches_found,
+        }
+        self.cache.set(cache_key, filtered_data)
+
+        return filtered_data
+
+    def get_ranking_model(
+        self,
+        key_words: list[str],
+        lengths: dict[int, int],
+        indexed_matches: dict[int, dict[str, int]],
+    ) -> BM25:
+        """Return a BM25 model of the keywords, over the batch's resumes with text.
+
+        Document frequencies of single-term keywords are exact. Those of phrases
+        count every candidate the index couldn't rule out, so are upper bounds.
+        """
+        stats: dict[str, float] = (
+            self.get_resumes()
+            .filter(text__isnull=False)
+            .aggregate(doc_count=Count("pk"), avg_length=Avg("term_count"))
+        )
+        doc_freqs: dict[str, int] = {
+            word: sum(
+                1 for pk in lengths if indexed_matches.get(pk, {}).get(word, 1) > 0
+            )
+            for word in key_words
+        }
+        return BM25(
+            doc_freqs, stats["doc_count"], stats["avg_length"] or 0.0, self.k1, self.b
+        )
+
+    def rank_candidates(self, key_words: list[str], top_k: int) -> list[RankedRow]:
+        """Return the top_k candidates most relevant to the keywords, best first.
+
+        Each candidate's score is bounded from above by its indexed counts, plus
+        the most its unresolved keywords could add. Candidates are scored in
+        order of that bound, keeping the best top_k in a heap; once the next
+        bound can't beat the worst kept score, the rest are skipped. Text is
+        only loaded for candidates with unresolved keywords, batch_size at a time.
+
+        Returns:
+            list[RankedRow]: candidate, candidate_url, kw_matches, unique_score,
+                relevance
+        """
+        indexed_matches: dict[int, dict[str, int]] = self.index.search(
+            key_words, self.get_resume_ids()
+        )
+        lengths: dict[int, int] = dict(
+            self.Resume.objects.filter(
+                pk__in=self.index.get_resume_ids(key_words, self.get_resume_ids()),
+                text__isnull=False,
+            ).values_list("pk", "term_count")
+        )
+        bm25: BM25 = self.get_ranking_model(key_words, lengths, indexed_matches)
+
+        bounds: dict[int, float] = {}
+        for pk, length in lengths.items():
+            known: dict[str, int] = indexed_matches.get(pk, {})
+            bounds[pk] = bm25.score(known, length) + sum(
+                bm25.upper_bound(word) for word in key_words if word not in known
+            )
+
+        order: list[int] = sorted(lengths, key=lambda pk: (-bounds[pk], pk))
+        # Min-heap of (relevance, -position, pk, scores), so the worst is at [0]
+        heap: list[tuple[float, int, int, ScoreData]] = []
+        texts: dict[int, str] = {}
+
+        for position, pk in enumerate(order):
+            if len(heap) == top_k and bounds[pk] <= heap[0][0]:
+                break
+
+            known = indexed_matches.get(pk, {})
+            if pk not in texts and any(word not in known for word in key_words):
+                texts = self.get_normalized_texts(
+                    [
+                        p
+                        for p in order[position : position + self.batch_size]
+                        if len(indexed_matches.get(p, {})) < len(key_words)
+                    ]
+                )
+
+            scores: ScoreData = self.scorer.score_normalized_text(
+                texts.get(pk, ""), key_words, known
+            )
+            relevance: float = bm25.score(scores["kw_counts"], lengths[pk])
+            if relevance <= 0:
+                continue
+
+            item: tuple[float, int, int, ScoreData] = (relevance, -position, pk, scores)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        ranked: list[tuple[float, int, int, ScoreData]] = sorted(heap, reverse=True)
+        files: dict[int, ResumeType] = self.Resume.objects.only("name", "file").in_bulk(
+            [pk for _, _, pk, _ in ranked]
         )
+        return [
+            {
+                "candidate": files[pk].name,
+                "candidate_url": files[pk].file.url,
+                "kw_matches": scores["kw_counts"],
+                "unique_score": scores["unique_score"],
+                "relevance": relevance,
+            }
+            for relevance, _, pk, scores in ranked
+        ]
 
-        all_resumes: QuerySet[self.Resume] = self.Resume.objects.all()
-        resumes_exist: bool = True if all_resumes else False
+    def generate_ranked_match_data(
+        self, request: HttpRequest, keyword_form_obj, top_k: int
+    ) -> RankedData:
+        """Return the top_k candidates by BM25 relevance, for results.html.
 
-        match_data: PopulatedTable = self.populate_table_rows(all_resumes, kw_input)
+        Unlike generate_keyword_match_data(), stored scores are left unchanged.
 
-        table_rows: TableRowsList = match_data["table_rows"]
-        candidate_matches_found: bool = match_data["matches_found"]
+        Args:
+            request (HttpRequest): user request.
+            keyword_form_obj (KeywordForm): POSTED form data.
+            top_k (int): most candidates to return
+
+        Returns:
+            RankedData (dict): key_words, table_rows, resumes_exist, matches_found,
+                top_k
+        """
+        kw_input: list[str] = FT.format_keywords(
+            keyword_form_obj.cleaned_data["keywords"]
+        )
+        table_rows: list[RankedRow] = self.rank_candidates(kw_input, top_k)
 
         return {
             "key_words_with_case": kw_input,
             "table_rows": table_rows,
-            "resumes_exist": resumes_exist,
-            "matches_found": candidate_matches_found,
+            "resumes_exist": self.get_resumes().exists(),
+            "matches_found": bool(table_rows),
+            "top_k": top_k,
         }
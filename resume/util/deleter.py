@@ -1,32 +1,119 @@
+import shutil
+from datetime import datetime, timedelta
 from pathlib import Path
+from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.db.models.base import ModelBase
+from django.utils import timezone
+
+from resume.models import IngestJob, ResumeText
+
+from .cache import QueryCache
+from .index import InvertedIndex, get_search_index
 
 
 class Deleter(LoginRequiredMixin):
     """Contains helper methods for deleting files and database info."""
 
     def __init__(
-        self, resume_model, keywords_model, media_root: Path = settings.MEDIA_ROOT
+        self,
+        resume_model,
+        keywords_model,
+        media_root: Path = settings.MEDIA_ROOT,
+        text_model: ModelBase = ResumeText,
+        job_model: ModelBase = IngestJob,
+        retention_days: int = settings.RESUME_BATCH_RETENTION_DAYS,
+        chunk_size: int = settings.RESUME_PURGE_CHUNK_SIZE,
     ) -> None:
         """Take custom uploads dir, or default to /uploads.
 
         Purpose: prevent unit tests from affecting the main uploads directory
+
+        retention_days: age after which upload batches are purged
+        chunk_size: most batches, or trashed directories, purged per call
         """
+        self.media_root: Path = Path(media_root)
         self.uploads_path: Path = Path(media_root, "uploads")
+        # Directories moved out of uploads_path, waiting to be deleted
+        self.trash_path: Path = Path(media_root, "trash")
         self.Resume = resume_model
         self.Keywords = keywords_model
+        self.ResumeText: ModelBase = text_model
+        self.IngestJob: ModelBase = job_model
+        self.retention_days: int = retention_days
+        self.chunk_size: int = chunk_size
+        self.index: InvertedIndex = get_search_index()
+        self.cache: QueryCache = QueryCache()
+
+    def move_to_trash(self, path: Path) -> None:
+        """Move a directory into the trash, for empty_trash() to delete.
+
+        A rename takes the same time however many files the directory holds.
+        """
+        if path.exists():
+            self.trash_path.mkdir(parents=True, exist_ok=True)
+            path.rename(Path(self.trash_path, uuid4().hex))
+
+    def empty_trash(self) -> int:
+        """Delete up to chunk_size trashed directories, and return how many."""
+        if not self.trash_path.exists():
+            return 0
+        trashed: list[Path] = sorted(self.trash_path.iterdir())[: self.chunk_size]
+        for path in trashed:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        return len(trashed)
 
     def delete_all_uploads(self) -> None:
-        """Delete all files in uploads directory, after keywords are filtered."""
-        up_glob = self.uploads_path.glob("**/*")
-        for f in up_glob:
-            f.unlink() if f.is_file else None
+        """Move the uploads directory into the trash, after keywords are filtered."""
+        self.move_to_trash(self.uploads_path)
+
+    def delete_batch(self, batch: IngestJob) -> None:
+        """Delete an upload batch: its directory, its resumes, and its job.
+
+        The directory is moved into the trash, and the resumes are removed in
+        one delete, along with their text and postings.
+        """
+        self.move_to_trash(Path(self.media_root, batch.get_directory()))
+        with transaction.atomic():
+            deleted, _ = self.Resume.objects.filter(batch=batch).delete()
+            batch.delete()
+        if deleted:
+            self.cache.bump_corpus_version()
+
+    def purge_expired_batches(self) -> int:
+        """Delete up to chunk_size batches older than retention_days, oldest first.
+
+        Batches still being extracted are skipped, until their worker is done
+        with their files.
+
+        Returns:
+            int: number of batches purged
+        """
+        cutoff: datetime = timezone.now() - timedelta(days=self.retention_days)
+        expired: list[IngestJob] = list(
+            self.IngestJob.objects.filter(created__lt=cutoff)
+            .exclude(status=self.IngestJob.Status.RUNNING)
+            .order_by("created", "pk")[: self.chunk_size]
+        )
+        for batch in expired:
+            self.delete_batch(batch)
+        return len(expired)
 
     def delete_resume_text_from_db(self) -> None:
-        """Delete all data in resume_text column of resume_resume db table."""
-        self.Resume.objects.all().values("resume_text").update(resume_text="")
+        """Delete every row of the resume_resumetext db table.
+
+        The index is cleared along with it, since it was built from that text.
+        """
+        self.ResumeText.objects.all().delete()
+        self.Resume.objects.update(term_count=0, text_truncated=False)
+        self.index.clear()
+        self.cache.bump_corpus_version()
 
     def delete_keyword_queries_from_db(self) -> None:
         """Delete keywords rows in database."""
@@ -42,3 +129,4 @@ class Deleter(LoginRequiredMixin):
         self.delete_all_uploads()
         self.delete_keyword_queries_from_db()
         self.Resume.objects.all().delete()
+        self.cache.bump_corpus_version()
@@ -0,0 +1,297 @@
+"""Keyword scoring from NumPy arrays of resumes' token ids.
+
+NumPy is optional; DocTermScorer raises ImproperlyConfigured without it.
+"""
+
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.base import ModelBase
+from django.db.models.query import QuerySet
+
+from resume.models import ResumeText, ResumeTokens, Term
+
+from ..custom_types import ScoreData
+from .index import InvertedIndex
+from .scoring import ResumeScorer
+from .tokenize import Tokenizer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TOKENIZER: Tokenizer = Tokenizer()
+
+# Token id between two terms that a phrase can't span: a gap other than a
+# single space, or the end of a resume
+GAP_ID: int = 0
+# Id of a keyword term missing from the vocabulary, which no token matches
+MISSING_ID: int = -1
+# Stored dtype of ResumeTokens.token_ids
+TOKEN_DTYPE: str = "<i4"
+# Most terms looked up, or texts read, per query
+CHUNK_SIZE: int = 500
+
+
+class DocTermScorer:
+    """Methods for counting keywords in a batch of resumes at once, with NumPy.
+
+    Each resume's normalized text is stored as an array of Term ids. Scoring
+    concatenates a batch's arrays into one, then counts every single-term
+    keyword with one isin() and bincount(), and each phrase of space separated
+    terms by comparing shifted slices. The counts form a resumes x keywords
+    matrix, whose non-zero count per row is the unique score.
+
+    Keywords with inner punctuation, or without word characters, can't be
+    told apart as token ids; like the index, they're left to the regular
+    expressions of ResumeScorer, as are resumes without a token array yet.
+    """
+
+    def __init__(
+        self,
+        text_model: ModelBase = ResumeText,
+        tokens_model: ModelBase = ResumeTokens,
+        term_model: ModelBase = Term,
+    ) -> None:
+        if np is None:
+            raise ImproperlyConfigured(
+                "DocTermScorer requires NumPy; install it with `pip install numpy`."
+            )
+        self.ResumeText: ModelBase = text_model
+        self.ResumeTokens: ModelBase = tokens_model
+        self.Term: ModelBase = term_model
+        self.index: InvertedIndex = InvertedIndex()
+        self.scorer: ResumeScorer = ResumeScorer()
+
+    def get_term_ids(
+        self, terms: Iterable[str], create: bool = False
+    ) -> dict[str, int]:
+        """Return the vocabulary ids of terms, adding the missing ones if create."""
+        terms = list(dict.fromkeys(terms))
+        term_ids: dict[str, int] = {}
+        for start in range(0, len(terms), CHUNK_SIZE):
+            chunk: list[str] = terms[start : start + CHUNK_SIZE]
+            if create:
+                self.Term.objects.bulk_create(
+                    [self.Term(term=term) for term in chunk], ignore_conflicts=True
+                )
+            term_ids.update(
+                self.Term.objects.filter(term__in=chunk).values_list("term", "pk")
+            )
+        return term_ids
+
+    def get_token_ids(self, normalized_text: str) -> bytes:
+        """Return the stored token id array of normalized text."""
+        positions: dict[str, list[int]] = self.index.get_term_positions(normalized_text)
+        term_ids: dict[str, int] = self.get_term_ids(positions, create=True)
+        token_ids = np.full(
+            max((p[-1] for p in positions.values()), default=-1) + 1,
+            GAP_ID,
+            dtype=TOKEN_DTYPE,
+        )
+        for term, term_positions in positions.items():
+            token_ids[term_positions] = term_ids[term]
+        return token_ids.tobytes()
+
+    def index_resume(self, resume_id: int, normalized_text: str) -> None:
+        """Replace the token id array of a resume with text."""
+        self.ResumeTokens.objects.update_or_create(
+            text_id=resume_id,
+            defaults={"token_ids": self.get_token_ids(normalized_text)},
+        )
+
+    def clear(self) -> None:
+        """Delete every token id array, and the vocabulary."""
+        self.ResumeTokens.objects.all().delete()
+        self.Term.objects.all().delete()
+
+    def rebuild(self) -> None:
+        """Rebuild the token id array of every resume with text."""
+        self.clear()
+        texts: QuerySet = self.ResumeText.objects.exclude(
+            normalized_text=""
+        ).values_list("resume_id", "normalized_text")
+        for resume_id, normalized_text in texts.iterator(chunk_size=CHUNK_SIZE):
+            self.index_resume(resume_id, normalized_text)
+
+    def get_keyword_ids(self, key_words: list[str]) -> dict[str, list[int]]:
+        """Map each keyword that token ids can count to the ids of its terms.
+
+        Terms missing from the vocabulary get MISSING_ID, so count 0.
+        """
+        kw_terms: dict[str, list[str]] = {
+            word: terms
+            for word, terms in self.index.get_keyword_terms(key_words).items()
+            if terms == [TOKENIZER.fold(word)] or self.index.is_phrase(word, terms)
+        }
+        term_ids: dict[str, int] = self.get_term_ids(
+            term for terms in kw_terms.values() for term in terms
+        )
+        return {
+            word: [term_ids.get(term, MISSING_ID) for term in terms]
+            for word, terms in kw_terms.items()
+        }
+
+    def count_phrase(
+        self,
+        stream: "np.ndarray",
+        docs: "np.ndarray",
+        phrase_ids: list[int],
+        doc_count: int,
+    ) -> "np.ndarray":
+        """Count a phrase's non-overlapping matches in each resume of a stream."""
+        length: int = len(stream) - len(phrase_ids) + 1
+        if length <= 0:
+            return np.zeros(doc_count, dtype=np.int64)
+        matches = stream[:length] == phrase_ids[0]
+        for offset, term_id in enumerate(phrase_ids[1:], 1):
+            matches &= stream[offset : offset + length] == term_id
+        starts = np.flatnonzero(matches)
+
+        # A phrase whose end can start it again, like "ab ab", may match over
+        # itself; matches are then taken from the left, as re.finditer() would
+        overlaps: bool = any(
+            phrase_ids[-size:] == phrase_ids[:size]
+            for size in range(1, len(phrase_ids))
+        )
+        if overlaps and len(starts):
+            kept: list[int] = []
+            next_start: int = 0
+            for start in starts.tolist():
+                if start >= next_start:
+                    kept.append(start)
+                    next_start = start + len(phrase_ids)
+            starts = np.array(kept, dtype=np.intp)
+
+        return np.bincount(docs[starts], minlength=doc_count)
+
+    def count_keywords(
+        self, arrays: list[bytes], keyword_ids: dict[str, list[int]]
+    ) -> "np.ndarray":
+        """Return a resumes x keywords matrix of counts, in keyword_ids' order.
+
+        The arrays are joined into one stream, each followed by GAP_ID, so no
+        phrase spans two resumes.
+        """
+        token_arrays: list[np.ndarray] = [
+            np.frombuffer(a, dtype=TOKEN_DTYPE) for a in arrays
+        ]
+        gap = np.array([GAP_ID], dtype=TOKEN_DTYPE)
+        stream = np.concatenate([part for t in token_arrays for part in (t, gap)])
+        docs = np.repeat(
+            np.arange(len(token_arrays)), [len(t) + 1 for t in token_arrays]
+        )
+        counts = np.zeros((len(token_arrays), len(keyword_ids)), dtype=np.int64)
+
+        # Every single-term keyword at once: tokens matching one of the terms
+        # are binned by (resume, term)
+        single_ids = np.unique(
+            [ids[0] for ids in keyword_ids.values() if len(ids) == 1]
+        ).astype(TOKEN_DTYPE)
+        hits = np.flatnonzero(np.isin(stream, single_ids))
+        term_counts = np.bincount(
+            docs[hits] * len(single_ids) + np.searchsorted(single_ids, stream[hits]),
+            minlength=len(token_arrays) * len(single_ids),
+        ).reshape(len(token_arrays), len(single_ids))
+
+        for column, ids in enumerate(keyword_ids.values()):
+            if len(ids) == 1:
+                counts[:, column] = term_counts[:, np.searchsorted(single_ids, ids[0])]
+            else:
+                counts[:, column] = self.count_phrase(
+                    stream, docs, ids, len(token_arrays)
+                )
+
+        return counts
+
+    def get_token_arrays(self, pks: list[int]) -> dict[int, bytes]:
+        """Return the stored token id arrays of resumes, by primary key."""
+        return {
+            pk: bytes(token_ids)
+            for pk, token_ids in self.ResumeTokens.objects.filter(
+                pk__in=pks
+            ).values_list("pk", "token_ids")
+        }
+
+    def get_normalized_texts(self, pks: list[int]) -> dict[int, str]:
+        """Return the normalized text of resumes with text, by primary key."""
+        texts: dict[int, str] = {}
+        for start in range(0, len(pks), CHUNK_SIZE):
+            texts.update(
+                self.ResumeText.objects.filter(
+                    pk__in=pks[start : start + CHUNK_SIZE]
+                ).values_list("pk", "normalized_text")
+            )
+        return texts
+
+    def score_resumes(
+        self,
+        pks: list[int],
+        key_words: list[str],
+        indexed_matches: dict[int, dict[str, int]] | None = None,
+    ) -> dict[int, ScoreData]:
+        """Return the keyword scores of resumes, by primary key.
+
+        Args:
+            pks (list[int]): ids of resumes with text to score
+            key_words (list[str]): keywords to count
+            indexed_matches (dict): search index counts, by resume id; only
+                used for keywords token ids can't count
+
+        Returns:
+            dict: {resume id: ScoreData}, as ResumeScorer would score them
+        """
+        indexed_matches = indexed_matches or {}
+        key_words = list(dict.fromkeys(key_words))
+        keyword_ids: dict[str, list[int]] = self.get_keyword_ids(key_words)
+        arrays: dict[int, bytes] = self.get_token_arrays(pks)
+        tokenized: list[int] = [pk for pk in pks if pk in arrays]
+
+        counts = np.zeros((len(pks), len(key_words)), dtype=np.int64)
+        rows: dict[int, int] = {pk: row for row, pk in enumerate(pks)}
+        columns: list[int] = [key_words.index(word) for word in keyword_ids]
+        if tokenized and keyword_ids:
+            counts[np.ix_([rows[pk] for pk in tokenized], columns)] = (
+                self.count_keywords([arrays[pk] for pk in tokenized], keyword_ids)
+            )
+
+        # Keywords token ids can't count, and resumes without token ids, are
+        # counted from text, as ResumeScorer counts them
+        rest: list[str] = [word for word in key_words if word not in keyword_ids]
+        text_words: dict[int, list[str]] = {
+            pk: rest if pk in arrays else key_words for pk in pks
+        }
+        texts: dict[int, str] = self.get_normalized_texts(
+            [
+                pk
+                for pk, words in text_words.items()
+                if any(word not in indexed_matches.get(pk, {}) for word in words)
+            ]
+        )
+        for pk, words in text_words.items():
+            if not words:
+                continue
+            text_counts: dict[str, int] = self.scorer.score_normalized_text(
+                texts.get(pk, ""), words, indexed_matches.get(pk)
+            )["kw_counts"]
+            counts[rows[pk], [key_words.index(word) for word in words]] = [
+                text_counts[word] for word in words
+            ]
+
+        unique_scores = np.count_nonzero(counts, axis=1)
+        return {
+            pk: {
+                "kw_counts": dict(zip(key_words, counts[row].tolist())),
+                "unique_score": int(unique_scores[row]),
+            }
+            for pk, row in rows.items()
+        }
+
+
+def get_doc_term_scorer(
+    enabled: bool = settings.RESUME_DOC_TERM_SCORING,
+) -> DocTermScorer | None:
+    """Return a DocTermScorer if document-term scoring is enabled, else None."""
+    return DocTermScorer() if enabled else None
@@ -0,0 +1,53 @@
+"""PDF text extraction.
+
+This module doesn't import Django, so worker processes can import
+extract_pdf_text() without setting up the app registry.
+"""
+
+import fitz
+from fitz import EmptyFileError, FileDataError
+
+
+def extract_pdf_text(
+    filepath: str, max_pages: int | None = None, max_chars: int | None = None
+) -> tuple[str, str, bool]:
+    """Extract text from resume PDF via PyMuPDF and fitz, a page at a time.
+
+    Pages are only loaded until max_pages pages, or max_chars characters, have
+    been read; None means no limit. Each page's text is collected in a list
+    and joined once, rather than appended to a growing string.
+
+    Returns:
+        tuple[str, str, bool]: the text read, an error message if the file
+            couldn't be read ("" otherwise), and whether a limit cut the
+            text short
+    """
+    pages: list[str] = []
+    chars: int = 0
+    truncated: bool = False
+    error: str = ""
+    try:
+        with fitz.open(filepath) as doc:
+            page_count: int = doc.page_count
+            if max_pages is not None and page_count > max_pages:
+                page_count = max_pages
+                truncated = True
+
+            for number in range(page_count):
+                page_text: str = doc.load_page(number).get_text()
+                if max_chars is not None and chars + len(page_text) > max_chars:
+                    pages.append(page_text[: max_chars - chars])
+                    truncated = True
+                    break
+                pages.append(page_text)
+                chars += len(page_text)
+    except EmptyFileError:
+        error = "EmptyFileError"
+    except ValueError:
+        error = "ValueError"
+    except FileDataError:
+        error = "FileDataError: file isn't a valid PDF"
+    except (FileNotFoundError, fitz.FileNotFoundError):
+        error = "FileNotFound Error"
+
+    return "".join(pages), error, truncated
@@ -1,5 +1,10 @@
+import hashlib
+import json
 import shlex
-import string
+
+from .tokenize import Tokenizer
+
+TOKENIZER: Tokenizer = Tokenizer()
 
 
 class FormatUtilies:
@@ -12,7 +17,11 @@ class FormatUtilies:
     # TODO: Merge with remove_punctuation_list
     def remove_punctuation(self, orig: str) -> str:
         """Remove punctuation from string (helper for remove_punctuation_list())."""
-        return " ".join(word.strip(string.punctuation) for word in orig.split())
+        return TOKENIZER.strip_punctuation(orig)
+
+    def normalize_text(self, text: str) -> str:
+        """Fold case and remove punctuation, as keyword matching expects."""
+        return TOKENIZER.normalize(text)
 
     def remove_punctuation_list(self, og_list: list[str]) -> list[str]:
         """Remove punctuation from all strings in list, for better matching."""
@@ -36,8 +45,16 @@ class FormatUtilies:
         [no_dups.append(x) for x in og_list if x not in no_dups]
         return no_dups
 
+    def hash_keywords(self, key_words: list[str]) -> str:
+        """Return a digest identifying a list of formatted keywords, and their order."""
+        return hashlib.sha256(json.dumps(key_words).encode()).hexdigest()
+
     def format_keywords(self, kw_str: str) -> list[str]:
-        """Format keywords properly for database & CSV."""
+        """Format keywords properly for database & CSV.
+
+        Punctuation is stripped as the Tokenizer strips it from resume text,
+        but case is kept, for display; matching folds it.
+        """
         kw_list: list[str] = self.split_keywords(kw_str)
         kw_formatted = self.remove_punctuation_list(kw_list)
         kw_formatted = self.remove_empty_str_from_list(kw_formatted)
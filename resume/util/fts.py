@@ -0,0 +1,191 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models.base import ModelBase
+from django.db.models.expressions import RawSQL
+from django.db.models.query import QuerySet
+
+from resume.models import Resume, ResumeText
+
+from .index import InvertedIndex
+from .tokenize import Tokenizer
+
+# Created by migration 0006_resume_fts, and kept in sync with the
+# normalized_text of resume_resumetext by the triggers of migration
+# 0013_resumetext
+FTS_TABLE: str = "resume_resume_fts"
+# fts5vocab table listing every (term, rowid, offset) of FTS_TABLE
+VOCAB_TABLE: str = "resume_resume_fts_vocab"
+
+TOKENIZER: Tokenizer = Tokenizer()
+
+
+class FullTextIndex(InvertedIndex):
+    """Search backend answering keyword queries from an SQLite FTS5 table.
+
+    The table indexes each resume's normalized text, tokenized into the same
+    runs of word characters as InvertedIndex's terms. Single-term keywords are
+    counted from the fts5vocab table; phrases are matched with FTS5 phrase
+    queries, and only counted from text in the resumes that contain them.
+
+    The triggers index resume text as it is saved, so index_resume() has
+    nothing to do. Rows are tied to resume_resumetext's rowid, which VACUUM
+    may renumber; run rebuild() after one.
+    """
+
+    def __init__(
+        self, resume_model: ModelBase = Resume, text_model: ModelBase = ResumeText
+    ) -> None:
+        if connection.vendor != "sqlite":
+            raise ImproperlyConfigured("FullTextIndex requires an SQLite database.")
+        self.Resume: ModelBase = resume_model
+        self.ResumeText: ModelBase = text_model
+
+    def index_resume(self, resume_id: int, normalized_text: str) -> None:
+        """Do nothing, since the triggers index resume text as it is saved."""
+
+    def clear(self) -> None:
+        """Delete every entry in the full-text index."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('delete-all')")
+
+    def rebuild(self) -> None:
+        """Re-index every resume's normalized text."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+
+    def quote(self, word: str) -> str:
+        """Return a keyword as an FTS5 string, matched as a phrase of its terms."""
+        return '"%s"' % TOKENIZER.fold(word).replace('"', '""')
+
+    def get_match_query(self, key_words: list[str]) -> str:
+        """Return an FTS5 query matching resumes containing any of the keywords."""
+        return " OR ".join(self.quote(word) for word in key_words)
+
+    def get_matching_ids(self, match_query: str) -> RawSQL:
+        """Return a subquery of ids of resumes matching an FTS5 query."""
+        return RawSQL(
+            f"SELECT t.{self.ResumeText._meta.pk.column} FROM {FTS_TABLE} f "
+            f"JOIN {self.ResumeText._meta.db_table} t ON t.rowid = f.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s",
+            [match_query],
+        )
+
+    def get_resumes(self, resume_ids: QuerySet | None = None) -> QuerySet:
+        """Return the resumes with text in resume_ids, or every resume with text."""
+        resumes: QuerySet = self.Resume.objects.filter(text__isnull=False)
+        if resume_ids is not None:
+            resumes = resumes.filter(pk__in=resume_ids)
+        return resumes
+
+    def get_resume_ids(
+        self, key_words: list[str], resume_ids: QuerySet | None = None
+    ) -> QuerySet:
+        """Return a subquery of ids of resumes containing any of the keywords.
+
+        A keyword without any word characters can't be looked up by term, so its
+        presence makes every resume with text a candidate. No keywords at all,
+        as when the query was only punctuation, match no resumes.
+
+        Args:
+            key_words (list[str]): keywords to look up
+            resume_ids (QuerySet): subquery of the ids of the resumes to search,
+                e.g. an upload batch's; None searches every resume
+        """
+        if not key_words:
+            return self.Resume.objects.none().values("pk")
+
+        kw_terms: dict[str, list[str]] = self.get_keyword_terms(key_words)
+        resumes: QuerySet = self.get_resumes(resume_ids)
+
+        if all(kw_terms.values()):
+            resumes = resumes.filter(
+                pk__in=self.get_matching_ids(self.get_match_query(key_words))
+            )
+
+        return resumes.values("pk")
+
+    def get_term_counts(
+        self, terms: set[str], resume_ids: QuerySet | None = None
+    ) -> dict[int, dict[str, int]]:
+        """Return {resume id: {term: count}}, for resumes containing any of terms."""
+        resume_terms: dict[int, dict[str, int]] = {}
+        if not terms:
+            return resume_terms
+
+        pk_column: str = self.ResumeText._meta.pk.column
+        sql: str = (
+            f"SELECT t.{pk_column}, v.term, COUNT(*) "
+            f"FROM {VOCAB_TABLE} v "
+            f"JOIN {self.ResumeText._meta.db_table} t ON t.rowid = v.doc "
+            f"WHERE v.term IN ({', '.join(['%s'] * len(terms))}) "
+        )
+        params: list = list(terms)
+        if resume_ids is not None:
+            ids_sql, ids_params = resume_ids.query.sql_with_params()
+            sql += f"AND t.{pk_column} IN ({ids_sql}) "
+            params.extend(ids_params)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql + "GROUP BY v.doc, v.term", params)
+            for resume_id, term, count in cursor.fetchall():
+                resume_terms.setdefault(resume_id, {})[term] = count
+
+        return resume_terms
+
+    def search(
+        self, key_words: list[str], resume_ids: QuerySet | None = None
+    ) -> dict[int, dict[str, int]]:
+        """Return the keyword counts FTS5 can answer, per candidate resume.
+
+        Single-term keywords are counted from the vocabulary table. Phrases, and
+        keywords with inner punctuation, are resolved to 0 when the resume has
+        no FTS5 phrase match for them, and are otherwise left out, to be counted
+        from text.
+
+        FTS5 matches against the whole table, so a scoped search still pays for
+        every resume's matches, and only then filters them to resume_ids.
+
+        Args:
+            key_words (list[str]): keywords to count
+            resume_ids (QuerySet): subquery of the ids of the resumes to search,
+                e.g. an upload batch's; None searches every resume
+
+        Returns:
+            dict: {resume id: {keyword: count}} for every resume containing at
+                least one of the queried terms.
+        """
+        if not key_words:
+            return {}
+
+        kw_terms: dict[str, list[str]] = self.get_keyword_terms(key_words)
+        single_terms: set[str] = {
+            terms[0]
+            for word, terms in kw_terms.items()
+            if terms == [TOKENIZER.fold(word)]
+        }
+        resume_terms: dict[int, dict[str, int]] = self.get_term_counts(
+            single_terms, resume_ids
+        )
+
+        phrase_matches: dict[str, set[int]] = {}
+        for word, terms in kw_terms.items():
+            if terms and terms != [TOKENIZER.fold(word)]:
+                phrase_matches[word] = set(
+                    self.get_resumes(resume_ids)
+                    .filter(pk__in=self.get_matching_ids(self.quote(word)))
+                    .values_list("pk", flat=True)
+                )
+                for resume_id in phrase_matches[word]:
+                    resume_terms.setdefault(resume_id, {})
+
+        indexed_counts: dict[int, dict[str, int]] = {}
+        for resume_id, term_counts in resume_terms.items():
+            counts: dict[str, int] = {}
+            for word, terms in kw_terms.items():
+                if terms == [TOKENIZER.fold(word)]:
+                    counts[word] = term_counts.get(terms[0], 0)
+                elif word in phrase_matches and resume_id not in phrase_matches[word]:
+                    counts[word] = 0
+            indexed_counts[resume_id] = counts
+
+        return indexed_counts
@@ -0,0 +1,234 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db.models.base import ModelBase
+from django.db.models.query import QuerySet
+from django.utils.module_loading import import_string
+
+from resume.models import Posting, ResumeText
+
+from .tokenize import TERM_PATTERN, Tokenizer
+
+TOKENIZER: Tokenizer = Tokenizer()
+
+# Text between two terms that a phrase of space separated terms can span
+PHRASE_GAP: str = " "
+
+
+class InvertedIndex:
+    """Methods for building and querying the term -> postings index.
+
+    Terms are the runs of word characters in a resume's casefolded, punctuation
+    stripped text, so a single-term keyword's posting count is exactly the
+    number of `\\bkeyword\\b` matches DataFiltering would find by scanning.
+
+    Postings also hold the terms' positions, which answer phrases of space
+    separated terms, like "nuclear scientist", without scanning the text.
+    """
+
+    def __init__(
+        self, posting_model: ModelBase = Posting, text_model: ModelBase = ResumeText
+    ) -> None:
+        self.Posting: ModelBase = posting_model
+        self.ResumeText: ModelBase = text_model
+
+    def get_terms(self, text: str) -> list[str]:
+        """Return the terms in an already normalized string."""
+        return TOKENIZER.get_terms(text)
+
+    def get_term_positions(self, text: str) -> dict[str, list[int]]:
+        """Return the positions of each term in an already normalized string.
+
+        Terms separated by exactly one space get consecutive positions; any
+        other gap skips a position, so that a phrase only matches where its
+        terms are consecutive.
+        """
+        positions: dict[str, list[int]] = {}
+        position: int = -1
+        end: int | None = None
+
+        for match in TERM_PATTERN.finditer(text):
+            position += (
+                1 if end is None or text[end : match.start()] == PHRASE_GAP else 2
+            )
+            positions.setdefault(match.group(), []).append(position)
+            end = match.end()
+
+        return positions
+
+    def count_terms(self, resume_text: str) -> Counter[str]:
+        """Return term counts for raw resume text, normalized like at query time."""
+        return Counter(TOKENIZER.tokenize(resume_text))
+
+    def index_resume(self, resume_id: int, normalized_text: str) -> None:
+        """Replace the postings of a resume with ones built from its normalized text."""
+        self.Posting.objects.filter(resume_id=resume_id).delete()
+        self.Posting.objects.bulk_create(
+            self.Posting(
+                term=term,
+                resume_id=resume_id,
+                count=len(positions),
+                positions=positions,
+            )
+            for term, positions in self.get_term_positions(normalized_text).items()
+        )
+
+    def clear(self) -> None:
+        """Delete every posting in the index."""
+        self.Posting.objects.all().delete()
+
+    def rebuild(self) -> None:
+        """Rebuild the postings of every resume from its normalized text."""
+        self.clear()
+        texts: QuerySet = self.ResumeText.objects.exclude(
+            normalized_text=""
+        ).values_list("resume_id", "normalized_text")
+        for resume_id, normalized_text in texts.iterator():
+            self.index_resume(resume_id, normalized_text)
+
+    def get_keyword_terms(self, key_words: list[str]) -> dict[str, list[str]]:
+        """Map each keyword to the terms it is made of."""
+        return {word: self.get_terms(TOKENIZER.fold(word)) for word in key_words}
+
+    def is_phrase(self, word: str, terms: list[str]) -> bool:
+        """Return True if a keyword is several terms separated by single spaces."""
+        return len(terms) > 1 and TOKENIZER.fold(word) == PHRASE_GAP.join(terms)
+
+    def count_phrase(
+        self, terms: list[str], term_positions: dict[str, set[int]]
+    ) -> int:
+        """Count a phrase's non-overlapping matches, from its terms' positions.
+
+        Matches are taken from the left, as re.finditer() would find them.
+        """
+        count: int = 0
+        next_start: int = 0
+
+        for start in sorted(term_positions.get(terms[0], ())):
+            if start >= next_start and all(
+                start + i in term_positions.get(term, ())
+                for i, term in enumerate(terms)
+            ):
+                count += 1
+                next_start = start + len(terms)
+
+        return count
+
+    def get_postings(self, resume_ids: QuerySet | None = None) -> QuerySet:
+        """Return the postings of the resumes in resume_ids, or of every resume."""
+        if resume_ids is None:
+            return self.Posting.objects.all()
+        return self.Posting.objects.filter(resume_id__in=resume_ids)
+
+    def get_phrase_counts(
+        self, phrases: dict[str, list[str]], resume_ids: QuerySet | None = None
+    ) -> dict[int, dict[str, int]]:
+        """Return {resume id: {phrase: count}}, for resumes with all of a phrase's terms."""
+        if not phrases:
+            return {}
+
+        resume_positions: dict[int, dict[str, set[int]]] = {}
+
+        postings: QuerySet = (
+            self.get_postings(resume_ids)
+            .filter(term__in={term for terms in phrases.values() for term in terms})
+            .values_list("resume_id", "term", "positions")
+        )
+
+        for resume_id, term, positions in postings.iterator():
+            resume_positions.setdefault(resume_id, {})[term] = set(positions)
+
+        return {
+            resume_id: {
+                word: self.count_phrase(terms, term_positions)
+                for word, terms in phrases.items()
+                if all(term in term_positions for term in terms)
+            }
+            for resume_id, term_positions in resume_positions.items()
+        }
+
+    def get_resume_ids(
+        self, key_words: list[str], resume_ids: QuerySet | None = None
+    ) -> QuerySet:
+        """Return a subquery of ids of resumes containing any of the keywords' terms.
+
+        A keyword without any word characters can't be looked up by term, so its
+        presence makes every indexed resume a candidate.
+
+        Args:
+            key_words (list[str]): keywords to look up
+            resume_ids (QuerySet): subquery of the ids of the resumes to search,
+                e.g. an upload batch's; None searches every resume
+        """
+        kw_terms: dict[str, list[str]] = self.get_keyword_terms(key_words)
+        postings: QuerySet = self.get_postings(resume_ids)
+
+        if all(kw_terms.values()):
+            terms: set[str] = {term for terms in kw_terms.values() for term in terms}
+            postings = postings.filter(term__in=terms)
+
+        return postings.values("resume_id")
+
+    def search(
+        self, key_words: list[str], resume_ids: QuerySet | None = None
+    ) -> dict[int, dict[str, int]]:
+        """Return the keyword counts the index can answer, per candidate resume.
+
+        Single-term keywords are answered from the posting counts, and phrases of
+        space separated terms from the posting positions. Keywords with inner
+        punctuation are resolved to 0 when the resume lacks one of their terms,
+        and are otherwise left out, to be counted from text.
+
+        Args:
+            key_words (list[str]): keywords to count
+            resume_ids (QuerySet): subquery of the ids of the resumes to search,
+                e.g. an upload batch's; None searches every resume
+
+        Returns:
+            dict: {resume id: {keyword: count}} for every resume containing at
+                least one of the queried terms.
+        """
+        kw_terms: dict[str, list[str]] = self.get_keyword_terms(key_words)
+        resume_terms: dict[int, dict[str, int]] = {}
+        postings: QuerySet = (
+            self.get_postings(resume_ids)
+            .filter(term__in={term for terms in kw_terms.values() for term in terms})
+            .values_list("resume_id", "term", "count")
+        )
+
+        for resume_id, term, count in postings.iterator():
+            resume_terms.setdefault(resume_id, {})[term] = count
+
+        phrase_counts: dict[int, dict[str, int]] = self.get_phrase_counts(
+            {
+                word: terms
+                for word, terms in kw_terms.items()
+                if self.is_phrase(word, terms)
+            },
+            resume_ids,
+        )
+
+        if not all(kw_terms.values()):
+            for resume_id in self.get_resume_ids(key_words, resume_ids).values_list(
+                "resume_id", flat=True
+            ):
+                resume_terms.setdefault(resume_id, {})
+
+        indexed_counts: dict[int, dict[str, int]] = {}
+        for resume_id, term_counts in resume_terms.items():
+            counts: dict[str, int] = {}
+            for word, terms in kw_terms.items():
+                if terms == [TOKENIZER.fold(word)]:
+                    counts[word] = term_counts.get(terms[0], 0)
+                elif not all(term in term_counts for term in terms):
+                    counts[word] = 0
+                elif self.is_phrase(word, terms):
+                    counts[word] = phrase_counts[resume_id][word]
+            indexed_counts[resume_id] = counts
+
+        return indexed_counts
+
+
+def get_search_index(backend: str = settings.RESUME_SEARCH_BACKEND) -> InvertedIndex:
+    """Return an instance of the search backend named by its dotted path."""
+    return import_string(backend)()
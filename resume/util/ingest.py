@@ -0,0 +1,218 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AbstractBaseUser
+from django.core.files.uploadedfile import UploadedFile
+from django.db.models import Count, Q
+from django.db.models.base import ModelBase
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+
+from resume.models import IngestFile, IngestJob, Keywords
+
+from ..custom_types import IngestProgress, StagedResume, UploadResult
+from .deleter import Deleter
+from .resume import Processor
+
+# Session key holding the id of the upload batch the user is working with
+ACTIVE_BATCH_KEY: str = "resume_batch"
+
+
+class IngestQueue:
+    """Methods for queueing uploads, and processing them outside the request."""
+
+    def __init__(
+        self,
+        resume_model: ModelBase,
+        job_model: ModelBase = IngestJob,
+        file_model: ModelBase = IngestFile,
+        batch_size: int = settings.RESUME_INGEST_BATCH_SIZE,
+        timeout: int = settings.RESUME_INGEST_TIMEOUT,
+        media_root: Path = settings.MEDIA_ROOT,
+    ) -> None:
+        """Resume model will be overridden by app.
+
+        batch_size: files extracted together, between progress updates
+        timeout: seconds after which a running job's worker is taken to be
+            gone, and the job may be claimed again
+        media_root: uploads dir the files are stored under, e.g. a test's own
+        """
+        self.Resume: ModelBase = resume_model
+        self.IngestJob: ModelBase = job_model
+        self.IngestFile: ModelBase = file_model
+        self.batch_size: int = batch_size
+        self.timeout: int = timeout
+        self.media_root: Path = media_root
+
+    def enqueue(
+        self, files: Iterable[UploadedFile], owner: AbstractBaseUser | None = None
+    ) -> IngestJob:
+        """Store uploaded PDFs in a new job's batch directory, and queue the job.
+
+        The job is only queued once every file is stored. If a file fails to
+        stream, out of an archive, the job and its directory are deleted, so
+        nothing is queued.
+
+        Args:
+            files (Iterable[UploadedFile]): uploaded PDFs
+            owner (AbstractBaseUser): user the batch, and its resumes, belong
+                to; None for an anonymous upload
+        """
+        job: IngestJob = self.IngestJob.objects.create(
+            status=self.IngestJob.Status.STAGING, owner=owner
+        )
+        try:
+            staged: list[StagedResume] = Processor(
+                self.Resume, media_root=self.media_root
+            ).stage_resumes(files, batch=job)
+        except Exception:
+            Deleter(
+                self.Resume,
+                Keywords,
+                media_root=self.media_root,
+                job_model=self.IngestJob,
+            ).delete_batch(job)
+            raise
+
+        self.IngestFile.objects.bulk_create(
+            self.IngestFile(
+                job=job, name=s["name"], file=s["file"], content_hash=s["content_hash"]
+            )
+            for s in staged
+        )
+        job.status = self.IngestJob.Status.QUEUED
+        job.save(update_fields=["status"])
+        return job
+
+    def activate(self, request: HttpRequest, job: IngestJob) -> None:
+        """Make job the batch the session's filtering, results, and export use."""
+        request.session[ACTIVE_BATCH_KEY] = job.pk
+
+    def get_visible_jobs(self, request: HttpRequest) -> QuerySet:
+        """Return the jobs a request may see: its session's batch, and its user's."""
+        visible: Q = Q(pk=request.session.get(ACTIVE_BATCH_KEY))
+        if request.user.is_authenticated:
+            visible |= Q(owner=request.user)
+        return self.IngestJob.objects.filter(visible)
+
+    def get_active_batch(self, request: HttpRequest) -> IngestJob | None:
+        """Return the batch the session uploaded last, if it still exists.
+
+        A signed-in user without one in this session gets their latest batch.
+        Otherwise, None selects the resumes uploaded outside of any batch.
+        """
+        batch_id: int | None = request.session.get(ACTIVE_BATCH_KEY)
+        if batch_id is not None:
+            batch: IngestJob | None = self.IngestJob.objects.filter(pk=batch_id).first()
+            if batch is not None:
+                return batch
+
+        if request.user.is_authenticated:
+            return (
+                self.IngestJob.objects.filter(owner=request.user)
+                .order_by("created", "pk")
+                .last()
+            )
+        return None
+
+    def claim_next(self) -> IngestJob | None:
+        """Mark the oldest queued job as running, and return it.
+
+        A job that has been running for longer than timeout, because its
+        worker was killed, is claimed again; only its files still queued are
+        processed. The job is only claimed if it's still claimable, so two
+        workers can't both claim it.
+        """
+        stale: datetime = timezone.now() - timedelta(seconds=self.timeout)
+        claimable = self.IngestJob.objects.filter(
+            Q(status=self.IngestJob.Status.QUEUED)
+            | Q(status=self.IngestJob.Status.RUNNING, started__lt=stale)
+        )
+        for job in claimable.order_by("created", "pk")[:5]:
+            claimed: int = claimable.filter(pk=job.pk).update(
+                status=self.IngestJob.Status.RUNNING, started=timezone.now()
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+        return None
+
+    def run(self, job: IngestJob) -> list[UploadResult]:
+        """Extract, save, and index a job's files, batch_size files at a time.
+
+        If processing raises, e.g. on a database or disk error, the files not
+        processed yet are failed with the error, and the job is still closed.
+        """
+        processor: Processor = Processor(self.Resume, media_root=self.media_root)
+        results: list[UploadResult] = []
+        pending = job.files.filter(status=self.IngestFile.Status.QUEUED).order_by("pk")
+
+        try:
+            while batch := list(pending[: self.batch_size]):
+                batch_results: list[UploadResult] = processor.process_staged_resumes(
+                    [
+                        {
+                            "name": f.name,
+                            "file": f.file,
+                            "content_hash": f.content_hash,
+                        }
+                        for f in batch
+                    ],
+                    batch=job,
+                )
+                for ingest_file, result in zip(batch, batch_results):
+                    ingest_file.error = result["error"]
+                    ingest_file.status = (
+                        self.IngestFile.Status.FAILED
+                        if result["error"]
+                        else self.IngestFile.Status.DONE
+                    )
+                self.IngestFile.objects.bulk_update(batch, ["status", "error"])
+                results.extend(batch_results)
+        except Exception as e:
+            results.extend(self.fail_pending(job, f"{type(e).__name__}: {e}"))
+            # Some of the failed batch's resumes may have been saved already
+            processor.cache.bump_corpus_version()
+
+        job.status = self.IngestJob.Status.DONE
+        job.finished = timezone.now()
+        job.save(update_fields=["status", "finished"])
+
+        return results
+
+    def fail_pending(self, job: IngestJob, error: str) -> list[UploadResult]:
+        """Mark a job's files still queued as failed with error, and return them."""
+        pending = job.files.filter(status=self.IngestFile.Status.QUEUED)
+        failed: list[UploadResult] = [
+            {
+                "name": f.name,
+                "file": f.file,
+                "characters": 0,
+                "truncated": False,
+                "reused": False,
+                "error": error,
+            }
+            for f in pending.order_by("pk")
+        ]
+        pending.update(status=self.IngestFile.Status.FAILED, error=error)
+        return failed
+
+    def get_progress(self, job: IngestJob) -> IngestProgress:
+        """Count a job's files by outcome."""
+        counts: dict[str, int] = job.files.aggregate(
+            total=Count("pk"),
+            done=Count("pk", filter=Q(status=self.IngestFile.Status.DONE)),
+            failed=Count("pk", filter=Q(status=self.IngestFile.Status.FAILED)),
+        )
+        return {
+            "job": job.pk,
+            "status": job.status,
+            "total": counts["total"],
+            "done": counts["done"],
+            "failed": counts["failed"],
+            "remaining": counts["total"] - counts["done"] - counts["failed"],
+        }
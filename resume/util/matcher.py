@@ -0,0 +1,81 @@
+import re
+
+from .tokenize import TERM_PATTERN, Tokenizer
+
+TOKENIZER: Tokenizer = Tokenizer()
+
+
+class KeywordMatcher:
+    """Count every keyword of a query in one pass over a resume's text.
+
+    Gives the same counts as running `\\bkeyword\\b` through re.finditer() once
+    per keyword, but is compiled once per query and reused for every resume.
+
+    Single-word keywords are combined into one `\\b(?:(word1)|(word2))\\b`
+    alternation. Phrases, and keywords with inner punctuation, may overlap each
+    other and the single words, so the pass only flags the positions where one
+    could start, and each is then checked with its own anchored pattern.
+    """
+
+    def __init__(self, key_words: list[str]) -> None:
+        """Compile the patterns for the keywords of a query."""
+        self.key_words: list[str] = key_words
+        # A keyword that is a single run of word characters can only match a
+        # whole `\w+` run of the text, so it can share one alternation.
+        patterns: list[str] = list(
+            dict.fromkeys(TOKENIZER.fold(word) for word in key_words)
+        )
+        self.terms: list[str] = [p for p in patterns if TERM_PATTERN.fullmatch(p)]
+        self.phrases: list[str] = [p for p in patterns if p not in self.terms]
+
+        alternatives: list[str] = []
+        if self.phrases:
+            alternatives.append(
+                "(?=%s)" % "|".join(re.escape(phrase) for phrase in self.phrases)
+            )
+        if self.terms:
+            alternatives.append(
+                r"\b(?:%s)\b"
+                % "|".join("(%s)" % re.escape(term) for term in self.terms)
+            )
+
+        self.pattern: re.Pattern[str] | None = (
+            re.compile("|".join(alternatives), flags=re.IGNORECASE)
+            if alternatives
+            else None
+        )
+        self.phrase_patterns: list[re.Pattern[str]] = [
+            re.compile(r"\b%s\b" % re.escape(phrase), flags=re.IGNORECASE)
+            for phrase in self.phrases
+        ]
+
+    def count_patterns(self, text: str) -> dict[str, int]:
+        """Return the number of matches of each folded keyword in text."""
+        counts: dict[str, int] = dict.fromkeys(self.terms + self.phrases, 0)
+        if self.pattern is None:
+            return counts
+
+        # Per phrase, where its next match may begin, so matches of the same
+        # phrase don't overlap, as with re.finditer()
+        phrase_resume_at: list[int] = [0] * len(self.phrases)
+
+        for match in self.pattern.finditer(text):
+            if match.lastindex:
+                counts[self.terms[match.lastindex - 1]] += 1
+                continue
+
+            start: int = match.start()
+            for i, phrase_pattern in enumerate(self.phrase_patterns):
+                if start < phrase_resume_at[i]:
+                    continue
+                phrase_match: re.Match[str] | None = phrase_pattern.match(text, start)
+                if phrase_match:
+                    counts[self.phrases[i]] += 1
+                    phrase_resume_at[i] = phrase_match.end()
+
+        return counts
+
+    def count_keywords(self, text: str) -> dict[str, int]:
+        """Return the match count of each keyword, keyed as given to the matcher."""
+        counts: dict[str, int] = self.count_patterns(text)
+        return {word: counts[TOKENIZER.fold(word)] for word in self.key_words}
@@ -0,0 +1,218 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+KEY_PREFIX: str = "resume:metrics"
+
+# The stages timed in each operation; only these are exported
+STAGES: dict[str, tuple[str, ...]] = {
+    # Processor.stage_resumes() and process_staged_resumes()
+    "upload": ("store", "lookup", "extract", "normalize", "save", "index"),
+    # DataFiltering.generate_keyword_match_data() and populate_table_rows(),
+    # and KeywordView's rendering of the results
+    "filter": (
+        "keywords",
+        "restore",
+        "search",
+        "stored",
+        "load",
+        "score",
+        "rows",
+        "save",
+        "reset",
+        "render",
+    ),
+    # CSVExporter.export_csv(), as the response is streamed
+    "export": ("headers", "query", "write"),
+}
+
+COUNTERS: dict[str, str] = {
+    "files_stored": "Uploaded PDFs stored.",
+    "resumes_processed": "Stored PDFs whose text was extracted or reused, and saved.",
+    "extraction_errors": "Stored PDFs whose text couldn't be extracted.",
+    "resumes_scored": "Resumes scored against a keyword query.",
+    "csv_rows_exported": "Candidate rows written to CSV exports.",
+}
+
+# Stage timings of the request being handled, for its Server-Timing header
+REQUEST_TIMINGS: ContextVar[dict[str, float] | None] = ContextVar(
+    "REQUEST_TIMINGS", default=None
+)
+
+
+class Metrics:
+    """Counters and stage timing histograms, exported in Prometheus text format.
+
+    Values live in the `alias` cache, with no timeout, so every process
+    recording into the same cache backend adds to the same series. Timings
+    are summed in whole microseconds, since caches only increment integers.
+    """
+
+    def __init__(
+        self,
+        alias: str = settings.RESUME_METRICS_CACHE,
+        buckets: tuple[float, ...] = settings.RESUME_METRICS_BUCKETS,
+    ) -> None:
+        self.cache: BaseCache = caches[alias]
+        self.buckets: tuple[float, ...] = buckets
+
+    def add(self, key: str, delta: int) -> None:
+        """Increment a value in the cache, starting it at 0 if unset."""
+        self.cache.add(key, 0, None)
+        self.cache.incr(key, delta)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        """Add value to one of COUNTERS."""
+        if value:
+            self.add(f"{KEY_PREFIX}:counter:{counter}", value)
+
+    def get_stage_key(self, operation: str, stage: str) -> str:
+        """Return the prefix of a stage histogram's cache keys."""
+        return f"{KEY_PREFIX}:stage:{operation}:{stage}"
+
+    def observe(self, operation: str, stage: str, seconds: float) -> None:
+        """Record one timing of a stage in its histogram.
+
+        Only the bucket the timing falls in is incremented; render() sums the
+        buckets into Prometheus' cumulative ones.
+        """
+        key: str = self.get_stage_key(operation, stage)
+        self.add(f"{key}:{bisect_left(self.buckets, seconds)}", 1)
+        self.add(f"{key}:sum", round(seconds * 1_000_000))
+
+    def format_labels(self, **labels: str) -> str:
+        """Return labels as a Prometheus label set."""
+        return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+    def render(self) -> str:
+        """Return every counter and stage histogram in Prometheus text format."""
+        stage_keys: list[str] = [
+            self.get_stage_key(operation, stage)
+            for operation, stages in STAGES.items()
+            for stage in stages
+        ]
+        values: dict[str, Any] = self.cache.get_many(
+            [f"{KEY_PREFIX}:counter:{counter}" for counter in COUNTERS]
+            + [
+                f"{key}:{suffix}"
+                for key in stage_keys
+                for suffix in [*range(len(self.buckets) + 1), "sum"]
+            ]
+        )
+        lines: list[str] = []
+
+        for counter, help_text in COUNTERS.items():
+            name: str = f"resume_{counter}_total"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {values.get(f'{KEY_PREFIX}:counter:{counter}', 0)}")
+
+        lines.append(
+            "# HELP resume_stage_seconds Time spent in each stage of uploading, "
+            "filtering and exporting resumes."
+        )
+        lines.append("# TYPE resume_stage_seconds histogram")
+        for operation, stages in STAGES.items():
+            for stage in stages:
+                key: str = self.get_stage_key(operation, stage)
+                labels: str = self.format_labels(operation=operation, stage=stage)
+                count: int = 0
+                for i, bound in enumerate([*self.buckets, "+Inf"]):
+                    count += values.get(f"{key}:{i}", 0)
+                    lines.append(
+                        f'resume_stage_seconds_bucket{{{labels},le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f"resume_stage_seconds_sum{{{labels}}} "
+                    f"{values.get(f'{key}:sum', 0) / 1_000_000}"
+                )
+                lines.append(f"resume_stage_seconds_count{{{labels}}} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """Time the stages of one upload, filter or export, then record them.
+
+    A stage may be timed several times, e.g. once per resume; its times are
+    summed, and recorded as one observation when the timer exits. Time spent
+    in a stage nested inside another only counts towards the inner one. Use
+    it as a context manager:
+
+        with StageTimer("filter") as timer:
+            with timer.stage("score"):
+                ...
+    """
+
+    def __init__(self, operation: str, metrics: Metrics | None = None) -> None:
+        """operation: key of STAGES whose stages are being timed."""
+        self.operation: str = operation
+        self.metrics: Metrics = metrics or Metrics()
+        self.timings: dict[str, float] = {}
+        # Stages being timed, innermost last, and when the innermost last resumed
+        self.active: list[str] = []
+        self.resumed: float = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.record()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time spent in the with block to the stage's total.
+
+        The enclosing stage, if any, is paused until the block exits.
+        """
+        self.pause()
+        self.active.append(name)
+        try:
+            yield
+        finally:
+            self.pause()
+            self.active.pop()
+
+    def pause(self) -> None:
+        """Add the innermost stage's time since it last resumed to its total."""
+        now: float = time.perf_counter()
+        if self.active:
+            name: str = self.active[-1]
+            self.timings[name] = self.timings.get(name, 0.0) + now - self.resumed
+        self.resumed = now
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from iterable, timing only the fetching of each item as the stage."""
+        iterator: Iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item: Any = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def record(self) -> None:
+        """Observe each stage's total, and add it to the request's Server-Timing."""
+        request_timings: dict[str, float] | None = REQUEST_TIMINGS.get()
+
+        for stage, seconds in self.timings.items():
+            self.metrics.observe(self.operation, stage, seconds)
+            if request_timings is not None:
+                name: str = f"{self.operation}_{stage}"
+                request_timings[name] = request_timings.get(name, 0.0) + seconds
+
+        self.timings = {}
+
+
+def format_server_timing(timings: dict[str, float]) -> str:
+    """Return timings, in seconds, as a Server-Timing header value in milliseconds."""
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+    )
@@ -0,0 +1,160 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import F, Func, IntegerField, Q, Value
+from django.db.models.base import ModelBase
+from django.db.models.query import QuerySet
+
+from resume.models import IngestJob
+from resume.models import Resume as ResumeType
+
+from ..custom_types import ResultsPage, TableRow
+
+# Column rows are sorted by, unless a keyword is given instead
+DEFAULT_SORT: str = "unique_matches"
+
+
+class KeywordCount(Func):
+    """A keyword's count in keyword_matches.
+
+    The JSON path is quoted, since KeyTransform reads keywords made of digits,
+    like "0500", as array indexes.
+    """
+
+    function: str = "JSON_EXTRACT"
+    output_field: IntegerField = IntegerField()
+
+    def __init__(self, keyword: str) -> None:
+        super().__init__(F("keyword_matches"), Value("$." + json.dumps(keyword)))
+
+
+class ResultPages:
+    """Methods for serving stored keyword scores a page at a time.
+
+    Pages are fetched by keyset pagination: each page ends with a cursor
+    holding its last row's sort value and name, and the next page starts
+    after that row. Unlike an OFFSET, this costs the same for every page.
+    """
+
+    def __init__(
+        self,
+        resume_model: ModelBase,
+        batch: IngestJob | None = None,
+        page_size: int = settings.RESUME_RESULTS_PAGE_SIZE,
+    ) -> None:
+        """Resume model will be overridden by app.
+
+        batch: upload batch whose resumes are paged; None for the resumes
+            uploaded outside of any batch
+        page_size: rows per page
+        """
+        self.Resume: ModelBase = resume_model
+        self.batch: IngestJob | None = batch
+        self.page_size: int = page_size
+
+    def encode_cursor(self, value: int, name: str) -> str:
+        """Return an opaque cursor for the row with this sort value and name."""
+        return base64.urlsafe_b64encode(json.dumps([value, name]).encode()).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[int, str]:
+        """Return the sort value and name held in a cursor.
+
+        Raises:
+            ValueError: the cursor wasn't made by encode_cursor()
+        """
+        try:
+            value, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+        if not isinstance(value, int) or not isinstance(name, str):
+            raise ValueError("Invalid cursor")
+        return value, name
+
+    def get_keywords(self) -> list[str]:
+        """Return the keywords of the batch's last query, from its stored scores.
+
+        Every resume with text is scored for a query, including the ones it
+        doesn't match, so any scored resume holds all of its keywords.
+        """
+        scores: dict[str, int] | None = (
+            self.Resume.objects.filter(batch=self.batch, text__isnull=False)
+            .exclude(scored_keywords="")
+            .values_list("keyword_matches", flat=True)
+            .first()
+        )
+        return list(scores or {})
+
+    def get_matches(self, sort: str) -> QuerySet:
+        """Return the batch's scored resumes with a match, annotated with their sort value.
+
+        Raises:
+            ValueError: sort is neither unique_matches nor a keyword of the query
+        """
+        matches: QuerySet = self.Resume.objects.filter(
+            batch=self.batch, unique_matches__gt=0, text__isnull=False
+        )
+        if sort == DEFAULT_SORT:
+            return matches.annotate(sort_value=F("unique_matches"))
+
+        if sort not in self.get_keywords():
+            raise ValueError(f"Unknown sort column: {sort}")
+        return matches.annotate(sort_value=KeywordCount(sort)).filter(
+            sort_value__isnull=False
+        )
+
+    def get_page(
+        self,
+        sort: str = DEFAULT_SORT,
+        after: str | None = None,
+        descending: bool = True,
+    ) -> ResultsPage:
+        """Return a page of matching candidates, sorted by sort, then by name.
+
+        Args:
+            sort (str): "unique_matches", or a keyword of the stored scores
+            after (str): cursor of the previous page; None for the first page
+            descending (bool): highest sort values first
+
+        Returns:
+            ResultsPage (dict): rows, sort, next cursor (None on the last page)
+        """
+        matches: QuerySet = self.get_matches(sort)
+
+        if after is not None:
+            value, name = self.decode_cursor(after)
+            beyond: str = "sort_value__lt" if descending else "sort_value__gt"
+            matches = matches.filter(
+                Q(**{beyond: value}) | Q(sort_value=value, name__gt=name)
+            )
+
+        sort_value: F = F("sort_value")
+        rows: list[ResumeType] = list(
+            matches.order_by(
+                sort_value.desc() if descending else sort_value.asc(), "name"
+            ).only("name", "file", "unique_matches", "keyword_matches")[
+                : self.page_size + 1
+            ]
+        )
+        has_next: bool = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        table_rows: list[TableRow] = [
+            {
+                "candidate": row.name,
+                "candidate_url": row.file.url,
+                "kw_matches": row.keyword_matches,
+                "unique_score": row.unique_matches,
+            }
+            for row in rows
+        ]
+        return {
+            "rows": table_rows,
+            "sort": sort,
+            "next": (
+                self.encode_cursor(rows[-1].sort_value, rows[-1].name)
+                if has_next
+                else None
+            ),
+        }
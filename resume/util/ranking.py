@@ -0,0 +1,57 @@
+"""BM25 relevance of resumes to a keyword query.
+
+Like scoring.py, this module doesn't import Django.
+"""
+
+import math
+
+
+class BM25:
+    """Okapi BM25 scores, with each keyword of a query treated as one term.
+
+    A keyword's term frequency is its match count in a resume, as counted for
+    the results table, and its document frequency the number of resumes it
+    matches. Document lengths are counted in terms, like the index's.
+    """
+
+    def __init__(
+        self,
+        doc_freqs: dict[str, int],
+        doc_count: int,
+        avg_length: float,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        """Compute each keyword's IDF.
+
+        Args:
+            doc_freqs (dict[str, int]): resumes matching each keyword
+            doc_count (int): resumes with text
+            avg_length (float): mean length of those resumes, in terms
+            k1 (float): how quickly repeated matches stop adding to the score
+            b (float): how much a resume's length scales its term frequencies
+        """
+        self.k1: float = k1
+        self.b: float = b
+        self.avg_length: float = avg_length or 1.0
+        self.idf: dict[str, float] = {
+            word: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            for word, df in doc_freqs.items()
+        }
+
+    def score_keyword(self, word: str, count: int, length: int) -> float:
+        """Return one keyword's contribution to a resume's score."""
+        if count <= 0:
+            return 0.0
+        norm: float = self.k1 * (1 - self.b + self.b * length / self.avg_length)
+        return self.idf[word] * count * (self.k1 + 1) / (count + norm)
+
+    def score(self, kw_counts: dict[str, int], length: int) -> float:
+        """Return a resume's score, from its count of each keyword."""
+        return sum(
+            self.score_keyword(word, count, length) for word, count in kw_counts.items()
+        )
+
+    def upper_bound(self, word: str) -> float:
+        """Return the most a keyword can add to a score, however often it matches."""
+        return self.idf[word] * (self.k1 + 1)
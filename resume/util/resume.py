@@ -1,56 +1,303 @@
+import hashlib
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Any
 
-import fitz
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.files.uploadedfile import UploadedFile
-from fitz import EmptyFileError, FileDataError
+from django.db.models import F
+from django.db.models.base import ModelBase
+
+from resume.models import IngestJob, ResumeText
+
+from ..custom_types import StagedResume, UploadResult
+from .cache import QueryCache
+from .doc_terms import DocTermScorer, get_doc_term_scorer
+from .extract import extract_pdf_text
+from .index import InvertedIndex, get_search_index
+from .metrics import Metrics, StageTimer
+from .tokenize import Tokenizer
+
+TOKENIZER: Tokenizer = Tokenizer()
 
 
 class Processor(LoginRequiredMixin):
     """Methods for processing uploaded resumes."""
 
-    def __init__(self, resume_model, media_root: str = settings.MEDIA_ROOT):
+    def __init__(
+        self,
+        resume_model,
+        media_root: str = settings.MEDIA_ROOT,
+        workers: int = settings.RESUME_EXTRACTION_WORKERS,
+        max_pages: int | None = settings.RESUME_EXTRACT_MAX_PAGES,
+        max_chars: int | None = settings.RESUME_EXTRACT_MAX_CHARS,
+        text_model: ModelBase = ResumeText,
+    ):
+        """Take custom uploads dir, or default to settings.MEDIA_ROOT.
+
+        workers: most processes to extract PDF text with; 1 extracts serially
+        max_pages, max_chars: most pages read, and characters kept, per PDF;
+            None for no limit
+        """
         self.Resume = resume_model
         self.media_root: str = media_root
+        self.workers: int = workers
+        self.max_pages: int | None = max_pages
+        self.max_chars: int | None = max_chars
+        self.ResumeText: ModelBase = text_model
+        self.index: InvertedIndex = get_search_index()
+        self.doc_terms: DocTermScorer | None = get_doc_term_scorer()
+        self.cache: QueryCache = QueryCache()
+        self.metrics: Metrics = Metrics()
 
     def get_pdf_text(self, filename: Path | str) -> str:
         """Extract text from resume PDF via PyMuPDF and fitz."""
-        pdf_text: str = ""
-        filepath: Path = Path(self.media_root, filename)
-        try:
-            doc: fitz.Document = fitz.open(filepath)
-            for page in doc.pages():
-                pdf_text += page.get_text()
-            doc.close()
-        except EmptyFileError:
-            print("EmptyFileError")
-        except ValueError:
-            print("ValueError")
-        except FileDataError:
-            print("FileDataError: file isn't a valid PDF")
-        except FileNotFoundError:
-            print("FileNotFound Error")
+        pdf_text: str
+        error: str
+        pdf_text, error, _ = extract_pdf_text(
+            str(Path(self.media_root, filename)), self.max_pages, self.max_chars
+        )
+        if error:
+            print(error)
 
         return pdf_text
 
-    def upload_and_process_resumes(self, files: list[UploadedFile]) -> None:
-        """Save the name and text of uploaded files to the database."""
-        for f in files:
-            file_ext: str = Path(str(f)).suffix
-
-            # Don't process non-pdf files that Django's form validation missed
-            if file_ext == ".pdf":
-                name: str = Path(str(f)).stem
-                resume: self.Resume
-                created: bool
-                resume, created = self.Resume.objects.update_or_create(
-                    name=name,
-                    defaults={
-                        "file": f,
-                        "keyword_matches": {},
-                        "unique_matches": None,
-                    },
+    def get_pdf_texts(self, filenames: list[str]) -> list[tuple[str, str, bool]]:
+        """Extract text from several PDFs, across up to self.workers processes.
+
+        A file that fails, even by crashing its worker, only fails its own
+        extraction. A crashed worker breaks its pool, failing every file still
+        in it, so those files are extracted again, each in a new pool of its
+        own; only the file that crashed its worker fails again.
+
+        Returns:
+            list[tuple[str, str, bool]]: text, error message, and whether the
+                text was truncated, for each file, in order
+        """
+        paths: list[str] = [str(Path(self.media_root, f)) for f in filenames]
+        workers: int = min(self.workers, len(paths))
+
+        if workers <= 1:
+            return [
+                self.get_extraction_result(
+                    extract_pdf_text, path, self.max_pages, self.max_chars
+                )
+                for path in paths
+            ]
+
+        results: list[tuple[str, str, bool]]
+        broken: list[int]
+        results, broken = self.extract_in_pool(paths, workers)
+        for i in broken:
+            results[i] = self.extract_in_pool([paths[i]], 1)[0][0]
+        return results
+
+    def extract_in_pool(
+        self, paths: list[str], workers: int
+    ) -> tuple[list[tuple[str, str, bool]], list[int]]:
+        """Extract text from PDFs across a new pool of worker processes.
+
+        Returns:
+            tuple: each file's extraction result, in order, and the indexes of
+                the files failed by a crashed worker breaking the pool
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures: list[Future] = [
+                executor.submit(extract_pdf_text, path, self.max_pages, self.max_chars)
+                for path in paths
+            ]
+            results: list[tuple[str, str, bool]] = [
+                self.get_extraction_result(future.result) for future in futures
+            ]
+        broken: list[int] = [
+            i
+            for i, future in enumerate(futures)
+            if isinstance(future.exception(), BrokenProcessPool)
+        ]
+        return results, broken
+
+    def get_extraction_result(self, extract, *args) -> tuple[str, str, bool]:
+        """Call an extraction, turning an unexpected exception into its error."""
+        try:
+            return extract(*args)
+        except Exception as e:
+            return "", f"{type(e).__name__}: {e}", False
+
+    def get_content_hash(self, f: UploadedFile) -> str:
+        """Return the SHA-256 hex digest of an uploaded file, read in chunks."""
+        digest = hashlib.sha256()
+        for chunk in f.chunks():
+            digest.update(chunk)
+        f.seek(0)
+
+        return digest.hexdigest()
+
+    def stage_resumes(
+        self, files: Iterable[UploadedFile], batch: IngestJob | None = None
+    ) -> list[StagedResume]:
+        """Store uploaded PDFs by content hash, without creating database rows yet.
+
+        A file whose contents are already stored isn't written again. Files are
+        consumed one at a time, so they can be streamed out of an archive.
+
+        Args:
+            files (Iterable[UploadedFile]): uploaded PDFs
+            batch (IngestJob): upload batch whose directory the files are
+                stored in, if any
+
+        Returns:
+            list[StagedResume]: name, stored file name, and content hash, per PDF
+        """
+        staged: list[StagedResume] = []
+        with StageTimer("upload", self.metrics) as timer, timer.stage("store"):
+            for f in files:
+                file_ext: str = Path(str(f)).suffix
+
+                # Don't process non-pdf files that Django's form validation missed
+                if file_ext == ".pdf":
+                    name: str = Path(str(f)).stem
+                    content_hash: str = self.get_content_hash(f)
+                    resume: self.Resume = self.Resume(
+                        name=name, content_hash=content_hash, batch=batch
+                    )
+                    filename: str = resume.file.field.generate_filename(resume, str(f))
+
+                    if not resume.file.storage.exists(filename):
+                        resume.file.save(str(f), f, save=False)
+                        filename = resume.file.name
+
+                    staged.append(
+                        {"name": name, "file": filename, "content_hash": content_hash}
+                    )
+
+        self.metrics.increment("files_stored", len(staged))
+
+        return staged
+
+    def get_known_texts(self, content_hashes: set[str]) -> dict[str, tuple[str, bool]]:
+        """Return already-extracted text, and its truncation, of identical uploads."""
+        return {
+            content_hash: (resume_text, text_truncated)
+            for content_hash, resume_text, text_truncated in self.ResumeText.objects.filter(
+                resume__content_hash__in=content_hashes
+            ).values_list(
+                "resume__content_hash", "resume_text", "resume__text_truncated"
+            )
+        }
+
+    def save_text(self, resume, resume_text: str, normalized_text: str) -> None:
+        """Save a resume's text to its ResumeText row, or delete the row if empty."""
+        if resume_text:
+            self.ResumeText.objects.update_or_create(
+                resume=resume,
+                defaults={
+                    "resume_text": resume_text,
+                    "normalized_text": normalized_text,
+                },
+            )
+        else:
+            self.ResumeText.objects.filter(resume=resume).delete()
+
+    def process_staged_resumes(
+        self, staged: list[StagedResume], batch: IngestJob | None = None
+    ) -> list[UploadResult]:
+        """Extract the text of stored PDFs in parallel, then save and index it.
+
+        Extraction is skipped for files whose contents were uploaded before,
+        and is run once for identical files within staged. A file replaces the
+        resume of the same name in its batch, and is owned by the batch's
+        owner. Each stage is timed for the "upload" metrics.
+
+        Args:
+            staged (list[StagedResume]): name, stored file name, and content hash
+            batch (IngestJob): upload batch the files were stored for, if any
+
+        Returns:
+            list[UploadResult]: name, file, characters, truncated, reused, and
+                error per PDF
+        """
+        results: list[UploadResult] = []
+        with StageTimer("upload", self.metrics) as timer:
+            with timer.stage("lookup"):
+                known_texts: dict[str, tuple[str, bool]] = self.get_known_texts(
+                    {s["content_hash"] for s in staged}
+                )
+            to_extract: dict[str, str] = {
+                s["content_hash"]: s["file"]
+                for s in staged
+                if s["content_hash"] not in known_texts
+            }
+            with timer.stage("extract"):
+                extracted: dict[str, tuple[str, str, bool]] = dict(
+                    zip(to_extract, self.get_pdf_texts(list(to_extract.values())))
                 )
-                resume.resume_text = self.get_pdf_text(resume.file.name)
-                resume.save()
+
+            for s in staged:
+                reused: bool = s["content_hash"] in known_texts
+                pdf_text: str
+                error: str = ""
+                truncated: bool
+                if reused:
+                    pdf_text, truncated = known_texts[s["content_hash"]]
+                else:
+                    pdf_text, error, truncated = extracted[s["content_hash"]]
+                with timer.stage("normalize"):
+                    normalized_text: str = TOKENIZER.normalize(pdf_text)
+                    term_count: int = len(TOKENIZER.get_terms(normalized_text))
+                fields: dict[str, Any] = {
+                    "file": s["file"],
+                    "content_hash": s["content_hash"],
+                    "owner_id": batch.owner_id if batch else None,
+                    "term_count": term_count,
+                    "text_truncated": truncated,
+                    "keyword_matches": {},
+                    "unique_matches": None,
+                }
+                with timer.stage("save"):
+                    resume, created = self.Resume.objects.update_or_create(
+                        name=s["name"],
+                        batch=batch,
+                        defaults={**fields, "text_version": F("text_version") + 1},
+                        create_defaults={**fields, "text_version": 1},
+                    )
+                    self.save_text(resume, pdf_text, normalized_text)
+                with timer.stage("index"):
+                    self.index.index_resume(resume.pk, normalized_text)
+                    if self.doc_terms is not None and pdf_text:
+                        self.doc_terms.index_resume(resume.pk, normalized_text)
+                results.append(
+                    {
+                        "name": s["name"],
+                        "file": s["file"],
+                        "characters": len(pdf_text),
+                        "truncated": truncated,
+                        "reused": reused,
+                        "error": error,
+                    }
+                )
+
+        self.metrics.increment("resumes_processed", len(results))
+        self.metrics.increment(
+            "extraction_errors", sum(1 for r in results if r["error"])
+        )
+
+        if staged:
+            self.cache.bump_corpus_version()
+
+        return results
+
+    def upload_and_process_resumes(
+        self, files: list[UploadedFile]
+    ) -> list[UploadResult]:
+        """Save the name and text of uploaded files to the database, and index the text.
+
+        Files are stored first, then their text is extracted in parallel, and
+        only then are the database rows written.
+
+        Returns:
+            list[UploadResult]: name, file, characters, and error for each PDF
+        """
+        return self.process_staged_resumes(self.stage_resumes(files))
@@ -0,0 +1,83 @@
+"""Keyword scoring of resume text.
+
+This module doesn't import Django, so worker processes can import
+score_chunk() without setting up the app registry.
+"""
+
+from typing import TYPE_CHECKING, TypeAlias
+
+from .matcher import KeywordMatcher
+
+if TYPE_CHECKING:
+    from ..custom_types import ScoreData
+
+# (resume primary key, normalized text, counts already answered by the index)
+ScoreJob: TypeAlias = tuple[int, str, dict[str, int] | None]
+
+
+class ResumeScorer:
+    """Methods for calculating keyword scores from a resume's text."""
+
+    def __init__(self) -> None:
+        self.matchers: dict[tuple[str, ...], KeywordMatcher] = {}
+
+    def get_matcher(self, key_words: list[str]) -> KeywordMatcher:
+        """Return the KeywordMatcher for key_words, compiling it on first use.
+
+        Matchers are kept for the lifetime of the scorer, so a query compiles
+        its patterns once rather than once per resume.
+        """
+        key: tuple[str, ...] = tuple(key_words)
+        if key not in self.matchers:
+            self.matchers[key] = KeywordMatcher(key_words)
+        return self.matchers[key]
+
+    def score_normalized_text(
+        self,
+        normalized_text: str,
+        key_words: list[str],
+        indexed_counts: dict[str, int] | None = None,
+    ) -> "ScoreData":
+        """Calculate keyword counts and total unique matches, from normalized text.
+
+        Args:
+            normalized_text (str): resume text, as FormatUtilies.normalize_text()
+                returns it. Stored at upload, so it isn't redone for each query.
+            key_words (list[str]): list of keywords to filter by.
+            indexed_counts (dict[str, int]): counts already answered by the index
+
+        Returns:
+            ScoreData (dict): kw_counts, unique_matches
+        """
+        unique_words: list[str] = []
+        kw_counts: dict[str, int] = {}
+        indexed_counts = indexed_counts or {}
+        unresolved: list[str] = [w for w in key_words if w not in indexed_counts]
+        text_counts: dict[str, int] = {}
+
+        if unresolved:
+            text_counts = self.get_matcher(unresolved).count_keywords(normalized_text)
+
+        for word in key_words:
+            if word in indexed_counts:
+                kw_counts[word] = indexed_counts[word]
+            else:
+                kw_counts[word] = text_counts[word]
+            if kw_counts[word] > 0 and word not in unique_words:
+                unique_words.append(word)
+
+        return {
+            "kw_counts": kw_counts,
+            "unique_score": len(unique_words),
+        }
+
+
+def score_chunk(
+    chunk: list[ScoreJob], key_words: list[str]
+) -> list[tuple[int, "ScoreData"]]:
+    """Score a chunk of resumes in a worker process, keeping the chunk's order."""
+    scorer: ResumeScorer = ResumeScorer()
+    return [
+        (pk, scorer.score_normalized_text(text, key_words, indexed_counts))
+        for pk, text, indexed_counts in chunk
+    ]
@@ -0,0 +1,60 @@
+"""Normalization and tokenization of resume text and keywords.
+
+Resume text is normalized once, at upload, and keywords on every query; both
+go through Tokenizer, so they're folded and stripped the same way.
+
+This module doesn't import Django, so worker processes can import it without
+setting up the app registry.
+"""
+
+import re
+import string
+import unicodedata
+
+# Punctuation stripped from either end of each whitespace separated word
+PUNCTUATION: str = string.punctuation
+
+# Runs of word characters, i.e. the spans delimited by the `\b` anchors that
+# keywords are matched with, and the terms of the search index.
+TERM_PATTERN: re.Pattern[str] = re.compile(r"\w+")
+
+
+class Tokenizer:
+    """Methods for normalizing text into the form keywords are matched against.
+
+    Normalizing folds case, and compatibility characters like ligatures and
+    full-width letters, with NFKC casefolding, then strips punctuation from
+    either end of each word. The text's terms are its runs of word characters.
+
+    Folding is done once, over the whole text, rather than per word. ASCII
+    text, which NFKC leaves as is, and whose casefolding is lowercasing,
+    skips straight to lower().
+    """
+
+    def fold(self, text: str) -> str:
+        """Return text NFKC normalized and casefolded, as keywords are compared."""
+        if text.isascii():
+            return text.lower()
+        if not unicodedata.is_normalized("NFKC", text):
+            text = unicodedata.normalize("NFKC", text)
+        return text.casefold()
+
+    def strip_punctuation(self, text: str) -> str:
+        """Strip punctuation from either end of each word, joining words by a space.
+
+        A word made only of punctuation leaves an empty word, so the words on
+        either side of it are two spaces apart, and don't match as a phrase.
+        """
+        return " ".join(word.strip(PUNCTUATION) for word in text.split())
+
+    def normalize(self, text: str) -> str:
+        """Return text folded, and stripped of punctuation, for keyword matching."""
+        return self.strip_punctuation(self.fold(text))
+
+    def get_terms(self, normalized_text: str) -> list[str]:
+        """Return the terms of already normalized text, in order."""
+        return TERM_PATTERN.findall(normalized_text)
+
+    def tokenize(self, text: str) -> list[str]:
+        """Return the terms of raw text, normalized like resume text at upload."""
+        return self.get_terms(self.normalize(text))
@@ -1,27 +1,48 @@
+from itertools import chain
+from pathlib import Path
 from typing import Any, LiteralString
 
 from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import AbstractBaseUser
+from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 from django.db.models import Q
 from django.db.models.query import QuerySet
 from django.forms.models import ModelFormMetaclass
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
-from django.shortcuts import redirect, render
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils.translation import gettext as _
 from django.utils.version import get_docs_version
 from django.views import View
 
-from .custom_types import FilteredData
-from .forms import LoginForm, UploadFileForm
-from .models import Keywords, Resume
+from .custom_types import (
+    FilteredData,
+    IngestProgress,
+    QueryCacheStats,
+    RankedData,
+    ResultsContext,
+    ResultsPage,
+)
+from .forms import ArchiveUploadForm, LoginForm, RankingForm, UploadFileForm
+from .models import IngestJob, Keywords, Resume
+from .util.archive import ZipArchive
+from .util.cache import QueryCache
 from .util.csv import CSVExporter
 from .util.data import DataFiltering
 from .util.deleter import Deleter
 from .util.form_util import FormFactory
 from .util.format import FormatUtilies
-from .util.resume import Processor
+from .util.ingest import IngestQueue
+from .util.metrics import Metrics, StageTimer
+from .util.pages import ResultPages
 
 FT: FormatUtilies = FormatUtilies()
 
@@ -42,29 +63,104 @@ class UploadView(View):
         # form: ModelFormMetaclass = FormFactory(self.resume_model).create_upload_form()
         # context: dict[str, ModelFormMetaclass] = {"form": form}
         form = UploadFileForm()
-        context = {"form": form}
+        context = {"form": form, "archive_form": ArchiveUploadForm()}
         # context = {}
 
         return render(request, "upload.html", context)
 
     def post(self, request: HttpRequest) -> HttpResponse:
-        """Post the data from the upload file form."""
+        """Post the data from the upload file form.
+
+        The files are stored and queued for the ingest worker, and the response
+        returns straight away with the job's id and progress URL. The PDFs in
+        a ZIP archive are streamed out of it one at a time, and queued with
+        the rest; ones renamed to keep the batch's names unique are listed.
+        The job's batch becomes the one the session filters.
+        """
         # form_class = self.get_form_class()
         # form = self.get_form(form_class)
         form = UploadFileForm(request.POST, request.FILES)
+        archive_form: ArchiveUploadForm = ArchiveUploadForm(request.POST, request.FILES)
         files: list[UploadedFile] = request.FILES.getlist("file")
 
+        if not archive_form.is_valid():
+            context = {"form": form, "archive_form": archive_form}
+            return render(request, "upload.html", context)
+
         if form.is_valid():
-            Processor(self.resume_model).upload_and_process_resumes(files)
+            archive: UploadedFile | None = archive_form.cleaned_data["archive"]
+            zip_archive: ZipArchive = ZipArchive()
+            names: set[str] = {Path(str(f)).stem for f in files}
+            queue: IngestQueue = IngestQueue(self.resume_model)
+            try:
+                job: IngestJob = queue.enqueue(
+                    chain(
+                        files,
+                        zip_archive.iter_pdfs(archive, names) if archive else [],
+                    ),
+                    owner=request.user if request.user.is_authenticated else None,
+                )
+            except ValidationError as e:
+                archive_form.add_error("archive", e)
+                context = {"form": form, "archive_form": archive_form}
+                return render(request, "upload.html", context)
+            queue.activate(request, job)
 
         else:
             context: dict[str, ModelFormMetaclass] = {
                 "form": form,
+                "archive_form": archive_form,
                 "message": "Only PDF files are accepted. Please upload in PDF format.",
             }
             return render(request, "upload.html", context)
 
-        return HttpResponseRedirect("filter")
+        context = {
+            "form": UploadFileForm(),
+            "archive_form": ArchiveUploadForm(),
+            "job": job,
+            "progress_url": reverse("ingest_progress", args=[job.pk]),
+            "renamed": zip_archive.renamed,
+        }
+        return render(request, "upload.html", context, status=202)
+
+
+class IngestProgressView(View):
+    """Report an upload job's progress as JSON."""
+
+    def __init__(self) -> None:
+        self.resume_model: Resume = Resume
+
+    def get(self, request: HttpRequest, job_id: int) -> JsonResponse:
+        """Return counts of the job's files done, failed, and remaining.
+
+        Only the session's own batch, and the signed-in user's batches, are
+        reported; any other job is a 404.
+        """
+        queue: IngestQueue = IngestQueue(self.resume_model)
+        job: IngestJob = get_object_or_404(queue.get_visible_jobs(request), pk=job_id)
+        progress: IngestProgress = queue.get_progress(job)
+
+        return JsonResponse(progress)
+
+
+class QueryCacheStatsView(View):
+    """Report the keyword query cache's hit and miss counts as JSON."""
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """Return hits, misses, hit rate, and the current corpus version."""
+        stats: QueryCacheStats = QueryCache().get_stats()
+
+        return JsonResponse(stats)
+
+
+class MetricsView(View):
+    """Export stage timings and counters for Prometheus to scrape."""
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """Return every counter and stage histogram in Prometheus text format."""
+        return HttpResponse(
+            Metrics().render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
 
 
 class KeywordView(View):
@@ -79,7 +175,10 @@ class KeywordView(View):
         form: ModelFormMetaclass = FormFactory(
             self.keywords_model
         ).create_keywords_form()
-        context: dict[str, ModelFormMetaclass] = {"form": form}
+        context: dict[str, ModelFormMetaclass | RankingForm] = {
+            "form": form,
+            "ranking_form": RankingForm(),
+        }
 
         return render(request, "filter.html", context=context)
 
@@ -89,13 +188,73 @@ class KeywordView(View):
             self.keywords_model
         ).create_keywords_form()
         self.form = form(request.POST)
+        ranking_form: RankingForm = RankingForm(request.POST)
+
+        if not ranking_form.is_valid():
+            return render(
+                request,
+                "filter.html",
+                context={"form": self.form, "ranking_form": ranking_form},
+            )
 
         if self.form.is_valid():
+            batch: IngestJob | None = IngestQueue(self.resume_model).get_active_batch(
+                request
+            )
+            data: DataFiltering = DataFiltering(self.resume_model, batch=batch)
+            top_k: int | None = ranking_form.cleaned_data["top_k"]
+            if top_k:
+                ranked: RankedData = data.generate_ranked_match_data(
+                    request, self.form, top_k
+                )
+                return self.render_results(request, ranked)
+
+            # Saved only when scored, since ranking leaves the stored scores as
+            # they were
             self.form.save()
-            data: DataFiltering = DataFiltering(self.resume_model)
-            context: FilteredData = data.generate_keyword_match_data(request, self.form)
+            filtered: FilteredData = data.generate_keyword_match_data(
+                request, self.form
+            )
+            context: ResultsContext = {
+                **filtered,
+                "page": ResultPages(self.resume_model, batch).get_page(),
+            }
 
-        return render(request, "results.html", context=context)
+        return self.render_results(request, context)
+
+    def render_results(
+        self, request: HttpRequest, context: RankedData | ResultsContext
+    ) -> HttpResponse:
+        """Render results.html, timed as the "render" stage of the filter metrics."""
+        with StageTimer("filter") as timer, timer.stage("render"):
+            return render(request, "results.html", context=context)
+
+
+class ResultsPageView(View):
+    """Serve pages of the results table as JSON, for the table to load lazily."""
+
+    def __init__(self) -> None:
+        self.resume_model: Resume = Resume
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """Return the page after the `after` cursor, sorted by `sort`.
+
+        `order=asc` sorts lowest first. Bad sort columns and cursors get a 400.
+        Only the session's active batch is paged.
+        """
+        batch: IngestJob | None = IngestQueue(self.resume_model).get_active_batch(
+            request
+        )
+        try:
+            page: ResultsPage = ResultPages(self.resume_model, batch).get_page(
+                sort=request.GET.get("sort", "unique_matches"),
+                after=request.GET.get("after"),
+                descending=request.GET.get("order", "desc") != "asc",
+            )
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        return JsonResponse(page)
 
 
 class DeleteView(View):
@@ -106,10 +265,15 @@ class DeleteView(View):
         self.keywords_model: Keywords = Keywords
 
     def get(self, request: HttpRequest) -> HttpResponse:
-        """Call delete_all_resumes_and_queries_nuclear() if user navigates to /deleteall."""
-        Deleter(
-            self.resume_model, self.keywords_model
-        ).delete_all_resumes_and_queries_nuclear()
+        """Delete the session's active batch, if user navigates to /deleteall.
+
+        Other users' batches are left alone.
+        """
+        batch: IngestJob | None = IngestQueue(self.resume_model).get_active_batch(
+            request
+        )
+        if batch is not None:
+            Deleter(self.resume_model, self.keywords_model).delete_batch(batch)
 
         return render(request, "delete_all.html")
 
@@ -121,22 +285,26 @@ class ExportView(View):
         self.resume_model: Resume = Resume
         self.keywords_model: Keywords = Keywords
 
-    def get(self, request: HttpRequest) -> HttpResponse:
-        """Render Export page. If rows exist in db, call export_csv()."""
+    def get(self, request: HttpRequest) -> HttpResponse | StreamingHttpResponse:
+        """Render Export page. If the active batch has rows, call export_csv()."""
         context: dict[str, bool] = {"resumes_exist": False}
+        batch: IngestJob | None = IngestQueue(self.resume_model).get_active_batch(
+            request
+        )
+        resumes: QuerySet[Resume] = self.resume_model.objects.filter(batch=batch)
 
-        if not self.resume_model.objects.all():
+        if not resumes.exists():
             return render(request, "export.html", context)
 
-        rows_with_matches: QuerySet[Resume] = self.resume_model.objects.exclude(
+        rows_with_matches: QuerySet[Resume] = resumes.exclude(
             Q(keyword_matches__isnull=True) | Q(keyword_matches__iexact="{}")
         )
 
-        if rows_with_matches:
+        if rows_with_matches.exists():
             context = {"resumes_exist": True}
-            return CSVExporter(self.resume_model, self.keywords_model).export_csv(
-                request
-            )
+            return CSVExporter(
+                self.resume_model, self.keywords_model, batch
+            ).export_csv(request)
 
         return render(request, "export.html", context)
 
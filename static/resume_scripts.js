@@ -7,3 +7,117 @@ document.getElementById("delete_warn").addEventListener("click", () => {
     window.location.href = "deleteall";
   }
 });
+
+const ingestProgress = document.getElementById("ingest-progress");
+
+if (ingestProgress) {
+  const pollIngestProgress = () => {
+    fetch(ingestProgress.dataset.progressUrl)
+      .then((response) => response.json())
+      .then((progress) => {
+        ingestProgress.querySelector(".ingest-status").textContent =
+          `${progress.done} done, ${progress.failed} failed, ` +
+          `${progress.remaining} remaining.`;
+
+        if (progress.remaining > 0) {
+          setTimeout(pollIngestProgress, 2000);
+        } else {
+          ingestProgress.querySelector(".ingest-done").classList.remove("d-none");
+        }
+      });
+  };
+
+  pollIngestProgress();
+}
+
+const resultsTable = document.getElementById("results-table");
+
+if (resultsTable) {
+  const resultsMore = document.getElementById("results-more");
+  const keywords = Array.from(
+    resultsTable.querySelectorAll("thead .results-sort"),
+    (button) => button.dataset.sort
+  ).slice(1);
+
+  const renderRow = (row) => {
+    const tr = document.createElement("tr");
+    const nameCell = tr.insertCell();
+    const link = document.createElement("a");
+    link.href = row.candidate_url;
+    link.target = "_blank";
+    link.textContent = row.candidate;
+    nameCell.append(link);
+    tr.insertCell().textContent = row.unique_score;
+    keywords.forEach((keyword) => {
+      const count = row.kw_matches[keyword];
+      tr.insertCell().textContent = count > 0 ? count : "";
+    });
+    return tr;
+  };
+
+  let loading = null;
+  let loadingController = null;
+
+  // Fetch the page after the table's cursor, or the first page if replacing.
+  // Replacing cancels a load in flight, so a new sort is never dropped, and
+  // the old sort's page is never shown over it.
+  const loadResults = (replace) => {
+    if (loading && !replace) {
+      return loading;
+    }
+    if (loadingController) {
+      loadingController.abort();
+    }
+    const controller = new AbortController();
+    const params = new URLSearchParams({ sort: resultsTable.dataset.sort });
+    if (!replace && resultsTable.dataset.next) {
+      params.set("after", resultsTable.dataset.next);
+    }
+
+    loadingController = controller;
+    loading = fetch(`${resultsTable.dataset.resultsUrl}?${params}`, {
+      signal: controller.signal,
+    })
+      .then((response) => response.json())
+      .then((page) => {
+        if (controller.signal.aborted) {
+          return;
+        }
+        const tbody = resultsTable.tBodies[0];
+        if (replace) {
+          tbody.replaceChildren();
+        }
+        tbody.append(...page.rows.map(renderRow));
+        resultsTable.dataset.next = page.next || "";
+        resultsMore.classList.toggle("d-none", !page.next);
+      })
+      .catch((error) => {
+        if (error.name !== "AbortError") {
+          throw error;
+        }
+      })
+      .finally(() => {
+        if (loadingController === controller) {
+          loading = null;
+          loadingController = null;
+        }
+      });
+    return loading;
+  };
+
+  resultsTable.querySelectorAll(".results-sort").forEach((button) => {
+    button.addEventListener("click", () => {
+      resultsTable.dataset.sort = button.dataset.sort;
+      loadResults(true);
+    });
+  });
+
+  resultsMore.addEventListener("click", () => loadResults(false));
+
+  // Load the next page as the button scrolls into view
+  new IntersectionObserver((entries) => {
+    if (entries.some((entry) => entry.isIntersecting) && resultsTable.dataset.next) {
+      loadResults(false);
+    }
+  }).observe(resultsMore);
+}